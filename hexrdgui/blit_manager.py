@@ -1,7 +1,8 @@
-from collections.abc import Generator, Sequence, ValuesView
+from collections.abc import Generator, Iterable, Sequence, ValuesView
 from typing import Any
 
 from matplotlib.artist import Artist
+from matplotlib.axes import Axes
 from matplotlib.image import AxesImage
 
 from hexrdgui.utils.matplotlib import remove_artist
@@ -21,6 +22,14 @@ class BlitManager:
         self.canvas = canvas
         self.bg = None
 
+        # The background of each axes, so that the artists of a single
+        # axes may be redrawn without touching the rest of the figure.
+        self.axes_bgs: dict[Axes, Any] = {}
+
+        # The axes whose artists have changed since the last update.
+        # `None` means the whole figure needs to be redrawn.
+        self._dirty_axes: set[Axes] | None = set()
+
         # This dict can contain nested dicts, lists, etc.
         # But all non-container values must be artists.
         # We will find them recursively.
@@ -52,6 +61,8 @@ class BlitManager:
             return
 
         self.bg = cv.copy_from_bbox(cv.figure.bbox)
+        self.axes_bgs = {ax: cv.copy_from_bbox(ax.bbox) for ax in cv.figure.axes}
+        self._dirty_axes = set()
         self.draw_all_artists()
 
     def remove_artists(self, *path: Any) -> None:
@@ -67,6 +78,7 @@ class BlitManager:
             d = d[key]
 
         for artist in _recursive_yield_artists(d):
+            self.mark_dirty(artist)
             remove_artist(artist)
 
         if parent:
@@ -74,10 +86,28 @@ class BlitManager:
         else:
             self.artists.clear()
 
+    def mark_dirty(self, artist: Artist) -> None:
+        """Mark an artist as changed, so `update_dirty()` will redraw it"""
+        if self._dirty_axes is None:
+            # The whole figure is already going to be redrawn
+            return
+
+        ax = artist.axes
+        if ax is None or not artist.get_clip_on() or ax not in self.axes_bgs:
+            # This artist may be drawn outside of its axes.
+            # We have to redraw everything.
+            self._dirty_axes = None
+            return
+
+        self._dirty_axes.add(ax)
+
     def draw_all_artists(self) -> None:
         """Draw all of the animated artists."""
+        self.draw_artists(_recursive_yield_artists(self.artists))
+
+    def draw_artists(self, artists: Iterable[Artist]) -> None:
         fig = self.canvas.figure
-        for artist in _recursive_yield_artists(self.artists):
+        for artist in artists:
             if isinstance(artist, AxesImage):
                 # matplotlib's normal draw skips animated artists for most
                 # types, but NOT images: they are composited separately and
@@ -107,9 +137,42 @@ class BlitManager:
             # update the GUI state
             cv.blit(fig.bbox)
 
+        self._dirty_axes = set()
+
         # let the GUI event loop process anything it has to do
         cv.flush_events()
 
+    def update_dirty(self) -> None:
+        """Update only the axes whose artists were marked as changed.
+
+        Restoring the background of an axes erases all of its artists, so
+        the unchanged artists that share an axes with a changed one are
+        redrawn as well. Other axes are left alone.
+        """
+        if self.bg is None or self._dirty_axes is None:
+            self.update()
+            return
+
+        if not self._dirty_axes:
+            # Nothing changed
+            return
+
+        cv = self.canvas
+        dirty_axes = self._dirty_axes
+        self._dirty_axes = set()
+
+        all_artists = list(_recursive_yield_artists(self.artists))
+        for ax in dirty_axes:
+            if ax not in self.axes_bgs:
+                # The axes was removed from the figure
+                continue
+
+            cv.restore_region(self.axes_bgs[ax])
+            self.draw_artists(x for x in all_artists if x.axes is ax)
+            cv.blit(ax.bbox)
+
+        cv.flush_events()
+
 
 def _recursive_yield_artists(artists: Any) -> Generator[Artist, None, None]:
     if isinstance(artists, dict):
@@ -403,6 +403,7 @@ class CalibrationDialogCallbacks(ABCQObject):
         # This adds in any missing keys. In particular, it is going to
         # add in any "None" detector distortions
         HexrdConfig().set_detector_defaults_if_missing()
+        HexrdConfig().bump_instrument_generation()
 
         self.instrument_updated.emit()
 
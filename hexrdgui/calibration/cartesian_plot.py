@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 import h5py
 import os
 import copy
@@ -20,6 +21,7 @@ from hexrdgui.hexrd_config import HexrdConfig
 from hexrdgui.overlays import update_overlay_data
 from hexrdgui.utils import format_memory_int
 
+from scipy import ndimage
 from skimage import transform as tf
 
 from .display_plane import DisplayPlane
@@ -171,12 +173,35 @@ class InstrumentViewer:
 
     def plot_dplane(self) -> None:
         # Create the warped image for each detector
-        for detector_id in self.images_dict.keys():
-            self.create_warped_image(detector_id)
+        self.create_warped_images(list(self.images_dict))
 
         # Generate the final image
         self.generate_image()
 
+    def create_warped_images(
+        self,
+        detectors: list[str],
+        max_workers: int | None = None,
+    ) -> None:
+        """Warp the images of several detectors concurrently
+
+        The number of worker threads defaults to `HexrdConfig().max_cpus`.
+        """
+        if max_workers is None:
+            max_workers = HexrdConfig().max_cpus
+
+        if len(detectors) < 2 or max_workers == 1:
+            for det in detectors:
+                self.create_warped_image(det)
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as tp:
+            futures = [tp.submit(self.create_warped_image, det) for det in detectors]
+
+        # Re-raise any exceptions that occurred in the workers
+        for f in futures:
+            f.result()
+
     def detector_borders(self, det: str) -> list[tuple[list[Any], list[Any]]]:
         corners = self.detector_corners.get(det, [])
 
@@ -300,13 +325,11 @@ class InstrumentViewer:
 
         tform3 = tf.ProjectiveTransform.from_estimate(src, dst)
 
-        res = tf.warp(
-            img,
-            tform3,
-            output_shape=(self.dpanel.rows, self.dpanel.cols),
-            preserve_range=True,
-            cval=np.nan,
-        )
+        # The coordinate map only depends on the geometry, so it is reused
+        # until the geometry changes (such as when changing frames).
+        output_shape = (self.dpanel.rows, self.dpanel.cols)
+        warp_map = get_warp_map(detector_id, tform3, output_shape, img.shape)
+        res = warp_map(img)
         nan_mask = np.isnan(res)
 
         self.warp_dict[detector_id] = np.ma.masked_array(
@@ -375,8 +398,7 @@ class InstrumentViewer:
             self.plot_dplane()
         else:
             # Update the individual detector images
-            for det in detectors:
-                self.create_warped_image(det)
+            self.create_warped_images(detectors)
 
         # Generate the final image
         self.generate_image()
@@ -405,6 +427,102 @@ class InstrumentViewer:
                     f.create_dataset(key, data=value)
 
 
+class WarpMap:
+    """Coordinate map from the display panel onto a detector image
+
+    The warp is a projective transform from display panel pixels to
+    detector pixels, like `skimage.transform.warp()` uses. The detector
+    pixel coordinates of every display pixel within the detector's
+    footprint are computed once (like `skimage.transform.warp_coords()`),
+    so warping another image only needs to interpolate.
+    """
+
+    def __init__(
+        self,
+        tform: tf.ProjectiveTransform,
+        output_shape: tuple[int, int],
+        image_shape: tuple[int, int],
+    ) -> None:
+        self.output_shape = tuple(output_shape)
+        self.bbox = _warp_footprint(tform, output_shape, image_shape)
+
+        r0, r1, c0, c1 = self.bbox
+        rows, cols = np.mgrid[r0:r1, c0:c1]
+
+        # skimage transforms work on (col, row) coordinates
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mapped = tform(np.column_stack((cols.ravel(), rows.ravel())))
+
+        # Send points that could not be mapped off of the image
+        mapped[~np.isfinite(mapped)] = -2
+        self.coords = mapped[:, ::-1].T.reshape((2, r1 - r0, c1 - c0))
+
+    def __call__(self, img: np.ndarray) -> np.ndarray:
+        res = np.full(self.output_shape, np.nan)
+        r0, r1, c0, c1 = self.bbox
+        res[r0:r1, c0:c1] = ndimage.map_coordinates(
+            img,
+            self.coords,
+            output=float,
+            order=1,
+            mode='constant',
+            cval=np.nan,
+            prefilter=False,
+        )
+        return res
+
+
+# The warp map of each detector, along with the geometry it was computed
+# for. Viewers are re-created when changing frames, so these are kept at
+# the module level.
+_warp_maps: dict[str, tuple[tuple, WarpMap]] = {}
+
+
+def get_warp_map(
+    detector_id: str,
+    tform: tf.ProjectiveTransform,
+    output_shape: tuple[int, int],
+    image_shape: tuple[int, int],
+) -> WarpMap:
+    # The transform fully describes the geometry of the warp
+    key = (tuple(output_shape), tuple(image_shape), tform.params.tobytes())
+
+    cached = _warp_maps.get(detector_id)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    warp_map = WarpMap(tform, output_shape, image_shape)
+    _warp_maps[detector_id] = (key, warp_map)
+    return warp_map
+
+
+def _warp_footprint(
+    tform: tf.ProjectiveTransform,
+    output_shape: tuple[int, int],
+    image_shape: tuple[int, int],
+) -> tuple[int, int, int, int]:
+    # Get the bounding box (r0, r1, c0, c1) of the display pixels that may
+    # land on the image. The corners of the image are mapped back onto the
+    # display panel. If that fails, the whole display panel is used.
+    rows, cols = image_shape
+    corners = np.array(
+        [[0, 0], [cols - 1, 0], [cols - 1, rows - 1], [0, rows - 1]],
+        dtype=float,
+    )
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mapped = tform.inverse(corners)
+
+    out_rows, out_cols = output_shape
+    if not np.isfinite(mapped).all():
+        return (0, out_rows, 0, out_cols)
+
+    c0, r0 = np.floor(mapped.min(axis=0)).astype(int) - 1
+    c1, r1 = np.ceil(mapped.max(axis=0)).astype(int) + 2
+    r0, r1 = np.clip((r0, r1), 0, out_rows)
+    c0, c1 = np.clip((c0, c1), 0, out_cols)
+    return (int(r0), int(r1), int(c0), int(c1))
+
+
 class FakeDistortionObject:
     """A fake distortion object for our fake instrument
 
@@ -292,6 +292,7 @@ class PanelBufferDialog(QObject):
                             config = HexrdConfig().detector(det_key)
                             config['buffer'] = value
 
+        HexrdConfig().bump_instrument_generation()
         return True
 
     def update_gui(self) -> None:
@@ -357,6 +358,7 @@ class PanelBufferDialog(QObject):
     def clear_panel_buffer(self) -> None:
         # Clear the config options on the internal config
         self.detector_config['buffer'] = self.default_buffer
+        HexrdConfig().bump_instrument_generation()
         self.update_enable_states()
         HexrdConfig().rerender_needed.emit()
 
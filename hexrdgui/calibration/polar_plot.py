@@ -4,7 +4,7 @@ from typing import Any
 import h5py
 import numpy as np
 
-from .polarview import PolarView
+from .polarview import PolarView, update_preview
 
 from hexrdgui.calibration.utils.maud_headers import header0, header, block_hdr
 from hexrdgui.constants import PolarXAxisType, ViewType
@@ -25,6 +25,9 @@ class InstrumentViewer:
         self.type = ViewType.polar
         self.instr = create_hedm_instrument()
 
+        # A low resolution polar view shown while detectors are dragged
+        self.preview_pv: PolarView | None = None
+
         self.draw_polar()
 
     @property
@@ -55,10 +58,17 @@ class InstrumentViewer:
 
     @property
     def display_img(self) -> np.ndarray:
-        display_img = self.pv.display_img
+        # Only the displayed image is previewed. Everything else keeps
+        # using the full resolution polar view until it is updated.
+        pv = self.preview_pv if self.preview_pv is not None else self.pv
+        display_img = pv.display_img
         assert display_img is not None
         return display_img
 
+    @property
+    def is_previewing(self) -> bool:
+        return self.preview_pv is not None
+
     @property
     def snip_background(self) -> np.ndarray | None:
         return self.pv.snip_background
@@ -82,6 +92,7 @@ class InstrumentViewer:
 
     def draw_polar(self) -> None:
         """show polar view of rings"""
+        self.preview_pv = None
         self.pv = PolarView(self.instr)
         self.pv.warp_all_images()
 
@@ -98,7 +109,14 @@ class InstrumentViewer:
     def update_overlay_data(self) -> None:
         update_overlay_data(self.instr, self.type)
 
-    def update_detectors(self, detectors: Any) -> None:
+    def update_detectors(self, detectors: Any, preview: bool = False) -> None:
+        if preview:
+            # Update a low resolution preview instead, if one is needed
+            self.preview_pv = update_preview(self.pv, self.preview_pv, detectors)
+            if self.preview_pv is not None:
+                return
+
+        self.preview_pv = None
         self.pv.update_detectors(detectors)
 
     def write_image(self, filename: str | Path = 'polar_image.npz') -> None:
@@ -179,17 +197,17 @@ class InstrumentViewer:
                 continue
 
             if mask.visible:
-                data[f'visible_mask_{name}'] = mask.get_masked_arrays(
-                    self.type,
-                )  # type: ignore[call-arg]
+                prefix = 'visible_mask'
             elif mask.show_border:
-                data[f'border_mask_{name}'] = mask.get_masked_arrays(
-                    self.type,
-                )  # type: ignore[call-arg]
+                prefix = 'border_mask'
             elif mask.highlight:
-                data[f'highlight_mask_{name}'] = mask.get_masked_arrays(
-                    self.type,
-                )  # type: ignore[call-arg]
+                prefix = 'highlight_mask'
+            else:
+                continue
+
+            # The masks are stored sparsely. Write them out densely.
+            mask_arr = mask.get_masked_arrays(self.type)  # type: ignore[call-arg]
+            data[f'{prefix}_{name}'] = mask_arr.dense()
 
         keep_detectors = HexrdConfig().azimuthal_lineout_detectors
         if (
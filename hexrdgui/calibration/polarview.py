@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import hashlib
+import threading
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
@@ -14,16 +19,17 @@ from skimage.morphology import footprint_rectangle
 from skimage.transform import warp
 
 from hexrd.rotations import mapAngle
-from hexrd.utils.decorators import memoize
 from hexrd import constants as ct
 from hexrd.xrdutil import _project_on_detector_plane, _project_on_detector_cylinder
 from hexrd import instrument
 
-from hexrdgui.constants import ViewType
+from hexrdgui.constants import POLAR_PREVIEW_MAX_PIXELS, ViewType
 from hexrdgui.hexrd_config import HexrdConfig
 from hexrdgui.masking.constants import MaskType
 from hexrdgui.masking.mask_manager import MaskManager
+from hexrdgui.masking.sparse_mask import SparseMask
 from hexrdgui.utils import SnipAlgorithmType, run_snip1d, snip_width_pixels
+from hexrdgui.utils.resampling import BilinearResampler
 
 tvec_c = ct.zeros_3
 
@@ -72,13 +78,22 @@ class PolarView:
         self.eta_min = eta_min
         self.eta_max = eta_max
 
+        # Previews use a grid with pixels this many times larger
+        # (see `create_preview()`)
+        self.decimation = 1
+
+        # Frame copies only read their frame-independent inputs
+        # (see `frame_copy()`)
+        self.is_frame_copy = False
+        self._frame_mask_pv_arrays: dict[str, np.ndarray] = {}
+
         if instrument is None:
             # This is a dummy polar view
             self._images_dict: dict[str, np.ndarray] | None = None
         else:
-            # Ensure the memoize cache is large enough for all detectors
+            # Ensure the projection cache is large enough for all detectors
             num_dets = len(instrument.detectors)
-            project_on_detector.set_cache_maxsize(max(16, num_dets * 2))
+            set_project_on_detector_cache_maxsize(max(16, num_dets * 2))
 
             # Use an image dict with the panel buffers applied.
             # This keeps invalid pixels from bleeding out in the polar view
@@ -100,9 +115,21 @@ class PolarView:
 
         # Cache this and invalidate it when needed
         self._corr_field_polar_cached: np.ma.MaskedArray | None = None
+
+        # The warped intensity correction field, along with the corrections
+        # dict and resamplers that were used to create it
+        self._intensity_correction_field_cache: (
+            tuple[dict[str, np.ndarray], list[BilinearResampler], np.ndarray] | None
+        ) = None
         self._pixel_lookup_cache: dict[
             str, tuple[np.ndarray, np.ndarray, np.ndarray]
         ] = {}
+        # Sparse bilinear resampling operators, keyed by detector name.
+        # The projected points they were built from are stored with them.
+        # `project_on_detector()` returns the same array for the same
+        # geometry and polar grid, so an identity check tells us whether
+        # the operator is still valid.
+        self._resampler_cache: dict[str, tuple[np.ndarray, BilinearResampler]] = {}
 
         self.snip_background: np.ndarray | None = None
         self.erosion_mask: np.ndarray | None = None
@@ -145,7 +172,7 @@ class PolarView:
 
     @property
     def tth_pixel_size(self) -> float:
-        return HexrdConfig().polar_pixel_size_tth
+        return HexrdConfig().polar_pixel_size_tth * self.decimation
 
     def tth_to_pixel(self, tth: float) -> float:
         """
@@ -159,7 +186,7 @@ class PolarView:
 
     @property
     def eta_pixel_size(self) -> float:
-        return HexrdConfig().polar_pixel_size_eta
+        return HexrdConfig().polar_pixel_size_eta * self.decimation
 
     def eta_to_pixel(self, eta: float) -> float:
         """
@@ -376,29 +403,41 @@ class PolarView:
         return arg, kwargs
 
     def _compute_xypts(self, det_key: str) -> np.ndarray:
-        panel = self.detectors[det_key]
-        args, kwargs = self.args_project_on_detector(panel)
-        func_projection = self.func_project_on_detector(panel)
-        return project_on_detector(
-            self.angular_grid, self.ntth, self.neta, func_projection, *args, **kwargs
-        )
+        return self._project_panel(self.detectors[det_key])
 
-    def warp_image(self, img: np.ndarray, panel: Detector) -> np.ma.MaskedArray:
-        # The first 3 arguments of this function get converted into
+    def _project_panel(self, panel: Detector) -> np.ndarray:
+        # The first 3 arguments of `project_on_detector` get converted into
         # the first argument of `_project_on_detector_plane`, and then
         # the rest are just passed as *args and **kwargs.
         args, kwargs = self.args_project_on_detector(panel)
         func_projection = self.func_project_on_detector(panel)
-
-        xypts = project_on_detector(
-            self.angular_grid, self.ntth, self.neta, func_projection, *args, **kwargs
+        return project_on_detector(
+            self.angular_grid,
+            self.ntth,
+            self.neta,
+            func_projection,
+            *args,
+            **kwargs,
         )
 
-        wimg = panel.interpolate_bilinear(
-            xypts,
-            img,
-            pad_with_nans=True,
-        ).reshape(self.shape)
+    def _get_resampler(self, panel: Detector) -> BilinearResampler:
+        if self.is_frame_copy:
+            # These were all resolved by `frame_copy()`
+            return self._resampler_cache[panel.name][1]
+
+        xypts = self._project_panel(panel)
+
+        cached = self._resampler_cache.get(panel.name)
+        if cached is not None and cached[0] is xypts:
+            return cached[1]
+
+        resampler = BilinearResampler(panel, xypts)
+        self._resampler_cache[panel.name] = (xypts, resampler)
+        return resampler
+
+    def warp_image(self, img: np.ndarray, panel: Detector) -> np.ma.MaskedArray:
+        resampler = self._get_resampler(panel)
+        wimg = resampler(img, pad_with_nans=True).reshape(self.shape)
         nan_mask = np.isnan(wimg)
         # Store as masked array
         return np.ma.masked_array(data=wimg, mask=nan_mask, fill_value=0.0)
@@ -428,7 +467,11 @@ class PolarView:
 
         return self._pixel_lookup_cache[det_key]
 
-    def warp_binary_mask(self, raw_mask: np.ndarray, det_key: str) -> np.ndarray:
+    def warp_binary_mask(
+        self,
+        raw_mask: np.ndarray | SparseMask,
+        det_key: str,
+    ) -> np.ndarray:
         """Warp a binary mask from raw detector pixel space to polar.
 
         Uses nearest-neighbor sampling via the same coordinate mapping
@@ -451,7 +494,7 @@ class PolarView:
         self,
         raw_data: list[tuple[str, np.ndarray]],
         apply_tth_distortion: bool = True,
-    ) -> np.ndarray:
+    ) -> SparseMask:
         """Create polar mask by rasterizing in raw space and warping.
 
         This avoids the coordinate-singularity bug that occurs when
@@ -466,8 +509,8 @@ class PolarView:
 
         Returns
         -------
-        np.ndarray
-            Boolean array (True=unmasked, False=masked).
+        SparseMask
+            The polar mask. Indexing it gives True=unmasked, False=masked.
         """
         from hexrdgui.masking.create_raw_mask import create_raw_mask
 
@@ -486,7 +529,7 @@ class PolarView:
             distorted = self.apply_tth_distortion(mask_float)
             polar_mask = ~(np.ma.filled(distorted, 0) > 0.5)
 
-        return polar_mask
+        return SparseMask.from_dense(polar_mask)
 
     def invalidate_corr_field_polar_cache(self) -> None:
         self._corr_field_polar_cached = None
@@ -534,9 +577,10 @@ class PolarView:
 
         corr_field_polar = self.create_corr_field_polar()
 
-        # Save these so that the overlay generator may use them
-        HexrdConfig().polar_corr_field_polar = corr_field_polar
-        HexrdConfig().polar_angular_grid = self.angular_grid
+        if self.publishes_distortion_fields:
+            # Save these so that the overlay generator may use them
+            HexrdConfig().polar_corr_field_polar = corr_field_polar
+            HexrdConfig().polar_angular_grid = self.angular_grid
 
         nr, nc = pimg.shape
         row_coords, col_coords = np.meshgrid(
@@ -557,17 +601,22 @@ class PolarView:
     def generate_image(self) -> None:
         self.reset_cached_distortion_fields()
 
+        # Sum the warped images in self.warp_dict. This matches what
+        # `np.ma.sum(np.ma.stack(...), axis=0)` used to produce: masked
+        # pixels count as zero, and a polar pixel is only masked if no
+        # detector has data there. Accumulating in place avoids allocating
+        # an (n_detectors, neta, ntth) stack.
+        data = np.zeros(self.shape, dtype=float)
+        mask = np.ones(self.shape, dtype=bool)
+
         self.panel_has_data.clear()
         for det_key, array in self.warp_dict.items():
-            self.panel_has_data[det_key] = np.asarray(~array.mask)
-
-        # sum masked images in self.warp_dict using np.ma ufuncs
-        #
-        # !!! checked that np.ma.sum is applying logical OR across masks (JVB)
-        # !!! assignment to img fills NaNs with zeros
-        # !!! NOTE: cannot set `data` attribute on masked_array,
-        #           but can manipulate mask
-        self.raw_img = np.ma.sum(np.ma.stack(list(self.warp_dict.values())), axis=0)
+            has_data = ~np.ma.getmaskarray(array)
+            self.panel_has_data[det_key] = has_data
+            np.add(data, array.data, out=data, where=has_data)
+            mask &= ~has_data
+
+        self.raw_img = np.ma.masked_array(data=data, mask=mask)
         self.apply_image_processing()
 
     @property
@@ -602,8 +651,9 @@ class PolarView:
 
     def apply_snip(self, img: np.ndarray) -> np.ndarray:
         # do SNIP if requested
+        # The SNIP widths are in full resolution pixels, so previews skip it.
         img = img.copy()
-        if HexrdConfig().polar_apply_snip1d:
+        if HexrdConfig().polar_apply_snip1d and not self.is_preview:
             # !!! Fast snip1d (ndimage) cannot handle nans
             no_nan_methods = [SnipAlgorithmType.Fast_SNIP_1D]
 
@@ -638,8 +688,34 @@ class PolarView:
             # No corrections
             return img
 
-        # Warp the intensity corrections to polar, mean them, and apply
+        img *= self.intensity_correction_field
+
+        if HexrdConfig().intensity_subtract_minimum:
+            img -= np.nanmin(img)
+
+        return img
+
+    @property
+    def intensity_correction_field(self) -> np.ndarray:
+        # Warp the intensity corrections to polar and mean them.
+        # The result is reused as long as neither the corrections nor the
+        # geometry has changed (such as when changing frames).
+        if self.is_frame_copy:
+            # This was resolved by `frame_copy()`
+            assert self._intensity_correction_field_cache is not None
+            return self._intensity_correction_field_cache[2]
+
         intensity_corrections = HexrdConfig().intensity_corrections_dict
+        resamplers = [self._get_resampler(panel) for panel in self.detectors.values()]
+
+        cached = self._intensity_correction_field_cache
+        if (
+            cached is not None
+            and cached[0] is intensity_corrections
+            and len(cached[1]) == len(resamplers)
+            and all(x is y for x, y in zip(cached[1], resamplers))
+        ):
+            return cached[2]
 
         output = {}
         for det_key, panel in self.detectors.items():
@@ -658,12 +734,12 @@ class PolarView:
         with np.errstate(invalid='ignore', divide='ignore'):
             correction_field = np.nansum(stacked, axis=0) / valid_count
 
-        img *= correction_field
-
-        if HexrdConfig().intensity_subtract_minimum:
-            img -= np.nanmin(img)
-
-        return img
+        self._intensity_correction_field_cache = (
+            intensity_corrections,
+            resamplers,
+            correction_field,
+        )
+        return correction_field
 
     @property
     def all_masks_pv_array(self) -> np.ndarray:
@@ -679,42 +755,78 @@ class PolarView:
         # `create_warp_image()`), which folds it into the warp mask. That is
         # both more correct (it thresholds raw intensities) and avoids the
         # circular dependency on `self.img` that used to exist here.
-        total_mask = np.zeros(self.shape, dtype=bool)
-        for mask in MaskManager().masks.values():
-            if mask.type == MaskType.threshold or not mask.visible:
-                continue
-            mask_arr = mask.get_masked_arrays(  # type: ignore[call-arg]
-                ViewType.polar, self.instr, polar_view=self
-            )
-            total_mask = np.logical_or(total_mask, ~mask_arr)
-
-        return total_mask
+        return self._combined_mask_pv_array('visible')
 
     @property
     def boundary_mask_pv_array(self) -> np.ndarray:
-        total_mask = np.zeros(self.shape, dtype=bool)
-        for mask in MaskManager().masks.values():
-            if mask.type == MaskType.threshold or not mask.show_border:
+        return self._combined_mask_pv_array('boundary')
+
+    @property
+    def mask_grid_key(self) -> tuple:
+        # The polar masks are only valid for this polar grid
+        return (
+            self.shape,
+            self.tth_min,
+            self.tth_max,
+            self.eta_min,
+            self.eta_max,
+        )
+
+    def _combined_mask_pv_array(self, kind: str) -> np.ndarray:
+        if self.is_frame_copy:
+            # This was resolved by `frame_copy()`
+            return self._frame_mask_pv_arrays[kind]
+
+        # The union is cached on the mask manager, and only updated for
+        # the masks that changed. The returned array must not be modified.
+        mask_arrays = {}
+        for name, mask in MaskManager().masks.items():
+            if mask.type == MaskType.threshold:
+                continue
+
+            if kind == 'visible' and not mask.visible:
+                continue
+            elif kind == 'boundary' and not mask.show_border:
                 continue
-            mask_arr = mask.get_masked_arrays(  # type: ignore[call-arg]
+
+            mask_arrays[name] = mask.get_masked_arrays(  # type: ignore[call-arg]
                 ViewType.polar, self.instr, polar_view=self
             )
-            total_mask = np.logical_or(total_mask, ~mask_arr)
-        return total_mask
+
+        return MaskManager().polar_mask_cache.get(
+            kind,
+            self.mask_grid_key,
+            self.shape,
+            mask_arrays,
+        )
 
     def apply_visible_masks(self, img: np.ndarray) -> np.ndarray:
         # Apply user-specified masks if they are present
-        total_mask = np.logical_or(self.warp_mask, self.visible_mask_pv_array)
-        img = img.copy()
-        img[total_mask] = np.nan
-        return img
+        if self.is_preview:
+            return self._apply_mask_pv_array(img, None)
+
+        return self._apply_mask_pv_array(img, self.visible_mask_pv_array)
 
     def apply_boundary_masks(self, img: np.ndarray) -> np.ndarray:
         # Apply user-specified masks if they are present
-        total_mask = np.logical_or(self.warp_mask, self.boundary_mask_pv_array)
-        img = img.copy()
-        img[total_mask] = np.nan
-        return img
+        if self.is_preview:
+            return self._apply_mask_pv_array(img, None)
+
+        return self._apply_mask_pv_array(img, self.boundary_mask_pv_array)
+
+    def _apply_mask_pv_array(
+        self,
+        img: np.ndarray,
+        mask: np.ndarray | None,
+    ) -> np.ndarray:
+        # Write the masked image in one pass rather than copying the image
+        # and then assigning nans through a boolean index.
+        # The user masks are cached at full resolution, so previews only
+        # apply the warp mask.
+        total_mask = self.warp_mask
+        if mask is not None:
+            total_mask = np.logical_or(total_mask, mask)
+        return np.where(total_mask, np.nan, img)
 
     def reapply_masks(self) -> None:
         # This will only re-run the final steps of the processing...
@@ -747,16 +859,135 @@ class PolarView:
     def display_img(self) -> np.ndarray | None:
         return self.display_image
 
-    def warp_all_images(self) -> None:
+    def warp_all_images(self, max_workers: int | None = None) -> None:
         self.reset_cached_distortion_fields()
 
         # Create the warped image for each detector
-        for det in self.detectors:
-            self.create_warp_image(det)
+        self.create_warp_images(list(self.detectors), max_workers)
 
         # Generate the final image
         self.generate_image()
 
+    def create_warp_images(
+        self,
+        detectors: list[str],
+        max_workers: int | None = None,
+    ) -> None:
+        """Warp the images of several detectors concurrently
+
+        The number of worker threads defaults to `HexrdConfig().max_cpus`.
+        The heavy lifting (projection and bilinear interpolation) happens
+        in numpy, which releases the GIL, so threads are sufficient.
+        """
+        if max_workers is None:
+            max_workers = HexrdConfig().max_cpus
+
+        if len(detectors) < 2 or max_workers == 1:
+            for det in detectors:
+                self.create_warp_image(det)
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as tp:
+            futures = [tp.submit(self.create_warp_image, det) for det in detectors]
+
+        # Re-raise any exceptions that occurred in the workers
+        for f in futures:
+            f.result()
+
+    @property
+    def is_preview(self) -> bool:
+        return self.decimation > 1
+
+    @property
+    def publishes_distortion_fields(self) -> bool:
+        # Only the displayed polar view publishes its distortion fields
+        return not self.is_preview and not self.is_frame_copy
+
+    @property
+    def preview_decimation(self) -> int:
+        # How much the grid must be decimated for a preview to have at most
+        # POLAR_PREVIEW_MAX_PIXELS pixels
+        num_pixels = self.ntth * self.neta
+        return max(int(np.ceil(np.sqrt(num_pixels / POLAR_PREVIEW_MAX_PIXELS))), 1)
+
+    def create_preview(self) -> PolarView | None:
+        """Create a copy on a decimated grid for quick, interactive previews
+
+        The copy shares the instrument and images with this polar view, but
+        none of the grid-dependent caches. Previews do not apply SNIP or
+        the user masks, and do not publish their distortion fields for the
+        overlays. No images are warped yet.
+
+        Returns None if this polar view is small enough to not need one.
+        """
+        decimation = self.preview_decimation
+        if decimation < 2:
+            return None
+
+        pv = copy.copy(self)
+        pv.decimation = decimation
+        pv.warp_dict = {}
+        pv.panel_has_data = {}
+        pv.raw_img = None
+        pv.snipped_img = None
+        pv.computation_img = None
+        pv.display_image = None
+        pv.snip_background = None
+        pv.erosion_mask = None
+        pv._corr_field_polar_cached = None
+        pv._intensity_correction_field_cache = None
+        pv._pixel_lookup_cache = {}
+        pv._resampler_cache = {}
+        pv.update_angular_grid()
+        return pv
+
+    def frame_copy(self) -> PolarView:
+        """Create a copy that can warp other frames of the same geometry
+
+        The copy gets its own instrument, and everything that does not
+        depend on the frame is resolved here, on the calling thread: the
+        resampling operators, the intensity correction field, the user
+        masks, and the tth distortion field. Warping a frame with the copy
+        only reads these, so it neither touches the displayed polar view
+        nor the caches on HexrdConfig and MaskManager.
+
+        Copies of a frame copy share its resolved inputs, so several of
+        them may warp different frames concurrently.
+        """
+        pv = copy.copy(self)
+        pv.warp_dict = {}
+        pv.panel_has_data = {}
+        if self.is_frame_copy:
+            return pv
+
+        for panel in self.detectors.values():
+            self._get_resampler(panel)
+
+        pv._resampler_cache = {
+            det_key: self._resampler_cache[det_key] for det_key in self.detectors
+        }
+
+        if HexrdConfig().any_intensity_corrections:
+            field = self.intensity_correction_field
+            pv._intensity_correction_field_cache = (
+                HexrdConfig().intensity_corrections_dict,
+                [x[1] for x in pv._resampler_cache.values()],
+                field,
+            )
+
+        if HexrdConfig().polar_tth_distortion:
+            pv._corr_field_polar_cached = self.create_corr_field_polar()
+
+        # Copy the masks, since the mask manager updates its cache in place
+        pv._frame_mask_pv_arrays = {
+            'visible': self.visible_mask_pv_array.copy(),
+            'boundary': self.boundary_mask_pv_array.copy(),
+        }
+
+        pv.instr = copy.deepcopy(self.instr)
+        pv.is_frame_copy = True
+        return pv
+
     def update_intensity_corrections(self) -> None:
         if HexrdConfig().any_intensity_corrections:
             HexrdConfig().create_intensity_corrections_dict()
@@ -776,8 +1007,8 @@ class PolarView:
             self.detectors[det].tvec = t_conf['translation']
             self.detectors[det].tilt = t_conf['tilt']
 
-            # Update the individual detector image
-            self.create_warp_image(det)
+        # Update the individual detector images
+        self.create_warp_images(detectors)
 
         # Invalidate the masks that match these detectors
         MaskManager().invalidate_detector_masks(detectors)
@@ -786,6 +1017,10 @@ class PolarView:
         self.generate_image()
 
     def reset_cached_distortion_fields(self) -> None:
+        if not self.publishes_distortion_fields:
+            # Previews and frame copies do not publish their distortion fields
+            return
+
         # These are only reset so that other parts of the code
         # will not use them while we are generating new ones.
         # They are actually still cached elsewhere.
@@ -793,10 +1028,58 @@ class PolarView:
         HexrdConfig().polar_angular_grid = None
 
 
+def update_preview(
+    pv: PolarView,
+    preview: PolarView | None,
+    detectors: list[str],
+) -> PolarView | None:
+    """Update the preview of a polar view for modified detectors
+
+    The preview is created if `preview` is None. Returns the preview, or
+    None if `pv` is small enough to not need one.
+    """
+    if preview is None:
+        preview = pv.create_preview()
+        if preview is None:
+            return None
+
+        # A new preview has not warped any images yet
+        detectors = list(pv.detectors)
+
+    preview.update_detectors(detectors)
+    return preview
+
+
 # `_project_on_detector_plane()` is one of the functions that takes the
 # longest when generating the polar view.
-# Memoize this so we can regenerate the polar view faster
-@memoize(maxsize=16)
+# Memoize this so we can regenerate the polar view faster. The warp thread
+# pool calls `project_on_detector()` concurrently, so the lock only guards
+# the cache itself: projections of different panels run in parallel.
+_project_on_detector_cache: OrderedDict[Any, np.ndarray] = OrderedDict()
+_project_on_detector_cache_maxsize = 16
+_project_on_detector_lock = threading.Lock()
+
+
+def set_project_on_detector_cache_maxsize(maxsize: int) -> None:
+    global _project_on_detector_cache_maxsize
+
+    with _project_on_detector_lock:
+        _project_on_detector_cache_maxsize = maxsize
+        while len(_project_on_detector_cache) > maxsize:
+            _project_on_detector_cache.popitem(last=False)
+
+
+def _make_hashable(x: Any) -> Any:
+    if isinstance(x, np.ndarray):
+        x = np.ascontiguousarray(x)
+        return (x.shape, x.dtype.str, hashlib.sha1(x).hexdigest())
+    elif isinstance(x, (list, tuple)):
+        return tuple(_make_hashable(y) for y in x)
+    elif isinstance(x, dict):
+        return tuple((k, _make_hashable(v)) for k, v in sorted(x.items()))
+    return x
+
+
 def project_on_detector(
     angular_grid: tuple[np.ndarray, np.ndarray],
     ntth: int,
@@ -804,6 +1087,37 @@ def project_on_detector(
     func_projection: Callable[..., Any],
     *args: Any,
     **kwargs: Any,
+) -> np.ndarray:
+    key = _make_hashable((angular_grid, ntth, neta, func_projection, args, kwargs))
+
+    with _project_on_detector_lock:
+        xypts = _project_on_detector_cache.get(key)
+        if xypts is not None:
+            _project_on_detector_cache.move_to_end(key)
+            return xypts
+
+    xypts = _project_on_detector(
+        angular_grid, ntth, neta, func_projection, *args, **kwargs
+    )
+
+    with _project_on_detector_lock:
+        # Another thread may have projected the same panel in the meantime.
+        # Keep the first result: the resampler cache compares by identity.
+        xypts = _project_on_detector_cache.setdefault(key, xypts)
+        _project_on_detector_cache.move_to_end(key)
+        while len(_project_on_detector_cache) > _project_on_detector_cache_maxsize:
+            _project_on_detector_cache.popitem(last=False)
+
+    return xypts
+
+
+def _project_on_detector(
+    angular_grid: tuple[np.ndarray, np.ndarray],
+    ntth: int,
+    neta: int,
+    func_projection: Callable[..., Any],
+    *args: Any,
+    **kwargs: Any,
 ) -> np.ndarray:
     # This will take `angular_grid`, `ntth`, and `neta`, and make the
     # `gvec_angs` argument with them. Then, the `gvec_args` will be passed
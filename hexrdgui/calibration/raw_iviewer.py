@@ -133,11 +133,11 @@ class InstrumentViewer:
         if HexrdConfig().stitch_raw_roi_images:
             return self.create_roi_overlay_data(overlay)
 
-        return overlay.data
+        return overlay.last_data
 
     def create_roi_overlay_data(self, overlay: Overlay) -> dict[str, Any]:
         ret: dict[str, Any] = {}
-        for det_key, data in overlay.data.items():
+        for det_key, data in overlay.last_data.items():
             panel = self.instr.detectors[det_key]
             if panel.roi is None:
                 continue
@@ -15,8 +15,12 @@ from hexrdgui.hexrd_config import HexrdConfig
 from hexrdgui.overlays import update_overlay_data
 from hexrdgui.utils.conversions import angles_to_stereo, cart_to_angles
 
-from .polarview import PolarView
-from .stereo_project import stereo_project, stereo_projection_of_polar_view
+from .polarview import PolarView, update_preview
+from .stereo_project import (
+    invalidate_stereo_resamplers,
+    stereo_project,
+    stereo_projection_of_polar_view,
+)
 
 
 def stereo_viewer() -> 'InstrumentViewer':
@@ -33,6 +37,8 @@ class InstrumentViewer:
         # This instrument has a VISAR view and is used to generate the image
         self.instr_pv = create_view_hedm_instrument()
         self.pv: PolarView | None = None
+        # A low resolution polar view used while detectors are dragged
+        self.preview_pv: PolarView | None = None
         self.img: np.ndarray | None = None
         self.unmasked_min: float | None = None
 
@@ -62,6 +68,10 @@ class InstrumentViewer:
     def display_img(self) -> np.ndarray | None:
         return self.img
 
+    @property
+    def is_previewing(self) -> bool:
+        return self.preview_pv is not None
+
     def detector_borders(self, det: str) -> list[np.ndarray]:
         panel = self.instr_pv.detectors[det]
 
@@ -185,10 +195,11 @@ class InstrumentViewer:
             self.draw_polar()
 
         assert self.pv is not None
-        polar_img = self.pv.display_img
+        pv = self.preview_pv if self.preview_pv is not None else self.pv
+        polar_img = pv.display_img
         assert polar_img is not None
 
-        extent = np.degrees(self.pv.extent)
+        extent = np.degrees(pv.extent)
         tth_range = extent[:2]
         eta_range = np.sort(extent[2:])
 
@@ -221,6 +232,7 @@ class InstrumentViewer:
         )
 
     def draw_polar(self) -> None:
+        self.preview_pv = None
         self.pv = PolarView(
             self.instr_pv,
             distortion_instrument=self.instr,
@@ -245,9 +257,27 @@ class InstrumentViewer:
     def update_overlay_data(self) -> None:
         update_overlay_data(self.instr, self.type)
 
-    def update_detectors(self, detectors: list[str]) -> None:
+    def update_detectors(self, detectors: list[str], preview: bool = False) -> None:
         if self.project_from_polar and self.pv is not None:
-            self.pv.update_detectors(detectors)
+            if preview:
+                # Project a low resolution polar view instead, if needed
+                self.preview_pv = update_preview(self.pv, self.preview_pv, detectors)
+            else:
+                self.preview_pv = None
+
+            if self.preview_pv is None:
+                self.pv.update_detectors(detectors)
+        else:
+            # First, convert to the "None" angle convention
+            iconfig = HexrdConfig().instrument_config_none_euler_convention
+
+            for det in detectors:
+                t_conf = iconfig['detectors'][det]['transform']
+                self.instr_pv.detectors[det].tvec = t_conf['translation']
+                self.instr_pv.detectors[det].tilt = t_conf['tilt']
+
+            # The projection maps of these detectors are out of date
+            invalidate_stereo_resamplers(detectors)
 
         self.draw_stereo()
 
@@ -2,10 +2,142 @@ import copy
 from typing import Any
 
 import numpy as np
-from scipy.interpolate import RegularGridInterpolator
+from scipy.sparse import csr_matrix
 
 from hexrd import constants
 from hexrd.rotations import mapAngle
+from hexrd.transforms.xfcapi import angles_to_dvec, make_beam_rmat
+
+from hexrdgui.utils.resampling import BilinearResampler
+
+
+class PolarToStereoResampler:
+    """Sparse operator that resamples a polar view onto the stereo grid
+
+    The stereo view is always centered on the default beam vector, while
+    the polar view is relative to the instrument's beam vector. So the
+    direction of each stereo pixel is converted to the (tth, eta) of the
+    polar view, which only depends on the stereo size and the beam and
+    eta vectors. The bilinear weights into a polar grid are then computed
+    once and stored as a CSR matrix with four entries per stereo pixel.
+    This replaces interpolating the polar view back onto every detector
+    pixel and then projecting the detectors into the stereo grid.
+
+    Like `RegularGridInterpolator`, points outside of the polar grid are
+    padded with nans, and nans in the polar view propagate to every stereo
+    pixel that touches them.
+    """
+
+    def __init__(
+        self,
+        tth_grid: np.ndarray,
+        eta_grid: np.ndarray,
+        stereo_size: int,
+        beam_vector: np.ndarray = constants.beam_vec,
+        eta_vector: np.ndarray = constants.eta_vec,
+    ) -> None:
+        # The grids are in degrees, and the eta grid is in [0, 360)
+        self.tth_grid = np.array(tth_grid, dtype=float)
+        self.eta_grid = np.array(eta_grid, dtype=float)
+        self.stereo_size = stereo_size
+        self.beam_vector = np.array(beam_vector, dtype=float).flatten()
+        self.eta_vector = np.array(eta_vector, dtype=float).flatten()
+
+        tth, eta = np.degrees(
+            stereo_pixel_polar_angles(stereo_size, self.beam_vector, self.eta_vector)
+        )
+        tth = tth.ravel()
+        eta = eta.ravel()
+
+        i_floor, wi_ceil, i_valid = _grid_weights(self.eta_grid, eta)
+        j_floor, wj_ceil, j_valid = _grid_weights(self.tth_grid, tth)
+
+        on_grid = i_valid & j_valid
+        self.on_grid = on_grid
+
+        i_floor = i_floor[on_grid]
+        j_floor = j_floor[on_grid]
+        wi_ceil = wi_ceil[on_grid]
+        wj_ceil = wj_ceil[on_grid]
+        wi_floor = 1 - wi_ceil
+        wj_floor = 1 - wj_ceil
+
+        cols = len(self.tth_grid)
+        indices = np.column_stack(
+            (
+                i_floor * cols + j_floor,
+                i_floor * cols + j_floor + 1,
+                (i_floor + 1) * cols + j_floor,
+                (i_floor + 1) * cols + j_floor + 1,
+            )
+        )
+        weights = np.column_stack(
+            (
+                wi_floor * wj_floor,
+                wi_floor * wj_ceil,
+                wi_ceil * wj_floor,
+                wi_ceil * wj_ceil,
+            )
+        )
+
+        # Zero weights are stored explicitly so that nans still propagate
+        num_valid = len(indices)
+        indptr = np.arange(0, 4 * num_valid + 1, 4)
+        self.matrix = csr_matrix(
+            (weights.ravel(), indices.ravel(), indptr),
+            shape=(num_valid, len(self.eta_grid) * cols),
+        )
+
+    def matches(
+        self,
+        tth_grid: np.ndarray,
+        eta_grid: np.ndarray,
+        stereo_size: int,
+        beam_vector: np.ndarray = constants.beam_vec,
+        eta_vector: np.ndarray = constants.eta_vec,
+    ) -> bool:
+        return (
+            self.stereo_size == stereo_size
+            and np.array_equal(self.tth_grid, tth_grid)
+            and np.array_equal(self.eta_grid, eta_grid)
+            and np.array_equal(self.beam_vector, np.ravel(beam_vector))
+            and np.array_equal(self.eta_vector, np.ravel(eta_vector))
+        )
+
+    def __call__(self, pvarray: np.ndarray) -> np.ndarray:
+        shape = (len(self.eta_grid), len(self.tth_grid))
+        if pvarray.shape != shape:
+            msg = f'Polar image must have shape {shape}'
+            raise ValueError(msg)
+
+        size = self.stereo_size
+        output = np.full(size * size, np.nan, dtype=float)
+        pvarray = np.asarray(pvarray, dtype=float)
+        output[self.on_grid] = self.matrix @ pvarray.ravel()
+        return output.reshape((size, size))
+
+
+# The last resampler that was used. Stereo viewers are re-created when
+# changing frames, so this is kept at the module level.
+_polar_to_stereo_resampler: PolarToStereoResampler | None = None
+
+
+def polar_to_stereo_resampler(
+    tth_grid: np.ndarray,
+    eta_grid: np.ndarray,
+    stereo_size: int,
+    beam_vector: np.ndarray = constants.beam_vec,
+    eta_vector: np.ndarray = constants.eta_vec,
+) -> PolarToStereoResampler:
+    global _polar_to_stereo_resampler
+
+    args = (tth_grid, eta_grid, stereo_size, beam_vector, eta_vector)
+    resampler = _polar_to_stereo_resampler
+    if resampler is None or not resampler.matches(*args):
+        resampler = PolarToStereoResampler(*args)
+        _polar_to_stereo_resampler = resampler
+
+    return resampler
 
 
 def stereo_projection_of_polar_view(
@@ -15,53 +147,25 @@ def stereo_projection_of_polar_view(
     instr: Any,
     stereo_size: int,
 ) -> np.ma.MaskedArray:
+    # The stereo pixels are converted to the frame of the polar view, so
+    # the polar view can be resampled directly without going through the
+    # detectors.
+    resampler = polar_to_stereo_resampler(
+        tth_grid,
+        eta_grid,
+        stereo_size,
+        instr.beam_vector,
+        instr.eta_vector,
+    )
+    stereo = resampler(pvarray)
+    return np.ma.masked_array(stereo, mask=np.isnan(stereo))
 
-    kwargs = {
-        'points': (eta_grid, tth_grid),
-        'values': pvarray,
-        'method': 'linear',
-        'bounds_error': False,
-        'fill_value': np.nan,
-    }
-    interp_obj = RegularGridInterpolator(**kwargs)
-
-    raw_bkgsub = project_intensities_to_raw(instr, interp_obj)
-
-    return stereo_project(instr, raw_bkgsub, stereo_size)
-
-
-def project_intensity_detector(
-    det: Any,
-    interp_obj: RegularGridInterpolator,
-) -> np.ndarray:
-    tth, eta = np.degrees(det.pixel_angles())
-    eta = mapAngle(eta, (0, 360.0), units='degrees')
-    xi = (eta, tth)
-    return interp_obj(xi)
-
-
-def project_intensities_to_raw(
-    instr: Any,
-    interp_obj: RegularGridInterpolator,
-) -> dict[str, np.ndarray]:
-    raw_bkgsub: dict[str, np.ndarray] = {}
-    for d in instr.detectors:
-        det = instr.detectors[d]
-        raw_bkgsub[d] = project_intensity_detector(det, interp_obj)
-
-    return raw_bkgsub
 
+def stereo_pixel_angles(stereo_size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Get the tth and eta (in radians) of each stereo pixel
 
-def stereo_project(
-    instr: Any,
-    raw: dict[str, np.ndarray],
-    stereo_size: int,
-) -> np.ma.MaskedArray:
-    # copy instruments and set viewing direction
-    # to be centered at the VISAR
-    instr_cp = copy.deepcopy(instr)
-    instr_cp.beam_vector = constants.beam_vec
-
+    Pixels outside of the stereographic circle are nan.
+    """
     rad = (stereo_size - 1) / 2
     x = np.linspace(0, stereo_size - 1, stereo_size)
     [X, Y] = np.meshgrid(x, x)
@@ -79,28 +183,175 @@ def stereo_project(
     tth = np.arccos(vz)
     eta = mapAngle(np.arctan2(vy, vx), (0, 2 * np.pi), units='radians')
     # np.mod(np.arctan2(vy, vx), 2 * np.pi)
-    angs = np.vstack((tth.flatten(), eta.flatten())).T
-    mask = ~np.isnan(angs)
-    mask = np.logical_and(mask[:, 0], mask[:, 1])
-
-    stereo = np.zeros((stereo_size, stereo_size))
-    fmask = np.ones_like(stereo, dtype=bool)
-    for d in instr_cp.detectors:
-        intensity = np.empty((angs.shape[0],))
-        det = instr_cp.detectors[d]
-        cart = det.angles_to_cart(angs[mask, :])
-        out = det.interpolate_bilinear(cart, raw[d])
-        intensity[mask] = out
-        im = np.reshape(intensity, (stereo_size, stereo_size))
-        im[~condition] = np.nan
-
-        im = np.ma.masked_array(im, mask=np.isnan(im))
-        stereo += im.filled(0)
-        fmask = np.logical_and(fmask, im.mask)
+    return tth, eta
+
+
+def stereo_pixel_polar_angles(
+    stereo_size: int,
+    beam_vector: np.ndarray = constants.beam_vec,
+    eta_vector: np.ndarray = constants.eta_vec,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Get the tth and eta (in radians) of each stereo pixel in a polar view
+
+    The stereo view is centered on the default beam vector, so its pixel
+    angles are converted to be relative to `beam_vector`, as they are in
+    the polar view. Pixels outside of the stereographic circle are nan.
+    """
+    tth, eta = stereo_pixel_angles(stereo_size)
+
+    beam_vector = np.asarray(beam_vector, dtype=float).flatten()
+    eta_vector = np.asarray(eta_vector, dtype=float).flatten()
+    if np.allclose(beam_vector, constants.beam_vec):
+        # Same frame. Nothing to convert.
+        return tth, eta
+
+    shape = tth.shape
+    tth = tth.flatten()
+    eta = eta.flatten()
+    valid = ~np.isnan(tth)
+
+    # Directions of the stereo pixels in the lab frame
+    angs = np.column_stack((tth[valid], eta[valid], np.zeros(valid.sum())))
+    dvecs = angles_to_dvec(angs, beam_vec=constants.beam_vec, eta_vec=eta_vector)
+
+    # Their angles relative to the beam (see `ij2ang()`)
+    rmat = make_beam_rmat(beam_vector, eta_vector)
+    tth[valid] = np.arccos(np.clip(dvecs @ beam_vector, -1, 1))
+    vx, vy = (dvecs @ rmat[:, :2]).T
+    eta[valid] = np.mod(np.arctan2(vy, vx), 2 * np.pi)
+
+    return tth.reshape(shape), eta.reshape(shape)
+
+
+def _grid_weights(
+    grid: np.ndarray,
+    x: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # For an increasing grid, get the index of the grid point below each
+    # value, the weight of the grid point above it, and whether the value
+    # is on the grid at all.
+    valid = (x >= grid[0]) & (x <= grid[-1])
+    if len(grid) < 2:
+        invalid = np.zeros(x.shape, dtype=bool)
+        return np.zeros(x.shape, dtype=int), np.zeros(x.shape), invalid
+
+    x = np.where(valid, x, grid[0])
+    lower = np.searchsorted(grid, x, side='right') - 1
+    lower = np.clip(lower, 0, len(grid) - 2)
+    weight = (x - grid[lower]) / (grid[lower + 1] - grid[lower])
+    return lower, weight, valid
+
+
+# Resamplers from each detector onto the stereo grid, keyed by detector
+# name. Each is stored with the geometry it was computed for, so it is
+# reused until the stereo size or the detector geometry changes.
+_stereo_resamplers: dict[str, tuple[tuple, BilinearResampler]] = {}
+
+
+def stereo_project(
+    instr: Any,
+    raw: dict[str, np.ndarray],
+    stereo_size: int,
+) -> np.ma.MaskedArray:
+    resamplers = stereo_resamplers(instr, stereo_size)
+
+    shape = (stereo_size, stereo_size)
+    stereo = np.zeros(shape)
+    fmask = np.ones(shape, dtype=bool)
+    for d, resampler in resamplers.items():
+        im = resampler(raw[d], pad_with_nans=True).reshape(shape)
+        has_data = ~np.isnan(im)
+        np.add(stereo, im, out=stereo, where=has_data)
+        fmask &= ~has_data
 
     return np.ma.masked_array(stereo, mask=fmask)
 
 
+def stereo_resamplers(
+    instr: Any,
+    stereo_size: int,
+) -> dict[str, BilinearResampler]:
+    """Get the resamplers from each detector onto the stereo grid
+
+    Only the detectors whose geometry changed since the last call are
+    recomputed.
+    """
+    keys = {
+        name: _stereo_geometry_key(panel, stereo_size)
+        for name, panel in instr.detectors.items()
+    }
+
+    # Forget detectors that are no longer in the instrument
+    for name in list(_stereo_resamplers):
+        if name not in keys:
+            del _stereo_resamplers[name]
+
+    missing = [
+        name
+        for name, key in keys.items()
+        if name not in _stereo_resamplers or _stereo_resamplers[name][0] != key
+    ]
+    if missing:
+        tth, eta = stereo_pixel_angles(stereo_size)
+        angs = np.vstack((tth.flatten(), eta.flatten())).T
+        valid = ~np.isnan(angs).any(axis=1)
+
+        for name in missing:
+            panel = _panel_with_stereo_beam(instr.detectors[name])
+            xys = np.full(angs.shape, np.nan)
+            xys[valid] = panel.angles_to_cart(angs[valid])
+            resampler = BilinearResampler(panel, xys)
+            _stereo_resamplers[name] = (keys[name], resampler)
+
+    return {name: _stereo_resamplers[name][1] for name in keys}
+
+
+def invalidate_stereo_resamplers(detectors: list[str] | None = None) -> None:
+    """Drop the cached stereo resamplers for some (or all) detectors"""
+    if detectors is None:
+        _stereo_resamplers.clear()
+        return
+
+    for name in detectors:
+        _stereo_resamplers.pop(name, None)
+
+
+def _panel_with_stereo_beam(panel: Any) -> Any:
+    # The viewing direction is centered at the VISAR. The stereo view
+    # instrument already uses this beam vector, so usually no copy is
+    # needed.
+    if np.allclose(panel.bvec, constants.beam_vec):
+        return panel
+
+    panel = copy.deepcopy(panel)
+    panel.bvec = constants.beam_vec
+    return panel
+
+
+def _stereo_geometry_key(panel: Any, stereo_size: int) -> tuple:
+    # Everything that affects where the stereo pixels land on the panel.
+    # The beam vector is not included, since it is always the VISAR one.
+    distortion = panel.distortion
+    return (
+        stereo_size,
+        type(panel),
+        panel.rows,
+        panel.cols,
+        panel.pixel_size_row,
+        panel.pixel_size_col,
+        np.asarray(panel.tvec, dtype=float).tobytes(),
+        np.asarray(panel.rmat, dtype=float).tobytes(),
+        np.asarray(panel.evec, dtype=float).tobytes(),
+        getattr(panel, 'radius', None),
+        distortion.maptype if distortion is not None else None,
+        (
+            np.asarray(distortion.params, dtype=float).tobytes()
+            if distortion is not None
+            else None
+        ),
+    )
+
+
 def prep_polar_data(fid: Any) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
     pvarray = np.array(fid['intensities'])
     tth_1dgrid = np.array(fid['tth_coordinates'])[0, :]
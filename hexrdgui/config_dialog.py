@@ -21,10 +21,12 @@ class ConfigDialog:
     def update_gui(self) -> None:
         self.max_cpus_ui = self.max_cpus_config
         self.font_size_ui = self.font_size_config
+        self.max_dark_frames_ui = self.max_dark_frames_config
 
     def update_config(self) -> None:
         self.max_cpus_config = self.max_cpus_ui
         self.font_size_config = self.font_size_ui
+        self.max_dark_frames_config = self.max_dark_frames_ui
 
     def on_accepted(self) -> None:
         self.update_config()
@@ -52,6 +54,14 @@ class ConfigDialog:
     def font_size_ui(self, v: int) -> None:
         self.ui.font_size.setValue(v)
 
+    @property
+    def max_dark_frames_ui(self) -> int:
+        return self.ui.max_dark_frames.value()
+
+    @max_dark_frames_ui.setter
+    def max_dark_frames_ui(self, v: int) -> None:
+        self.ui.max_dark_frames.setValue(v)
+
     @property
     def max_cpus_config(self) -> int | None:
         return HexrdConfig().max_cpus
@@ -60,6 +70,14 @@ class ConfigDialog:
     def max_cpus_config(self, v: int | None) -> None:
         HexrdConfig().max_cpus = v  # type: ignore[assignment]
 
+    @property
+    def max_dark_frames_config(self) -> int:
+        return HexrdConfig().max_dark_frames
+
+    @max_dark_frames_config.setter
+    def max_dark_frames_config(self, v: int) -> None:
+        HexrdConfig().max_dark_frames = v
+
     @property
     def font_size_config(self) -> int:
         return HexrdConfig().font_size
@@ -48,6 +48,7 @@ class OverlayType(Enum):
     laue = 'laue'
     rotation_series = 'rotation_series'
     const_chi = 'const_chi'
+    multi_grain = 'multi_grain'
 
 
 class PolarXAxisType:
@@ -222,3 +223,19 @@ FIDDLE_ICARUS_CORNERS_CMM = np.array(
         [-58.040001, 41.943001, -8.6484022],
     ]
 )
+
+# The memory budget of the frame cache, and how many frames the cache
+# prefetches ahead of and behind the current frame while scrubbing.
+FRAME_CACHE_MAX_BYTES = 1024**3
+FRAME_PREFETCH_AHEAD = 8
+FRAME_PREFETCH_BEHIND = 2
+
+# The number of generated overlay results that are kept, so that switching
+# between views or undoing a change does not have to generate them again.
+OVERLAY_DATA_CACHE_MAX_ENTRIES = 64
+
+# While detector transforms are being dragged, the polar view is previewed
+# on a grid decimated to at most this many pixels. The full resolution view
+# is rendered once no transform has changed for the settle delay.
+POLAR_PREVIEW_MAX_PIXELS = 1_000_000
+POLAR_PREVIEW_SETTLE_DELAY_MS = 300
@@ -1,3 +1,9 @@
+import copy
+import threading
+from typing import Any
+
+import numpy as np
+
 from hexrd import constants as ct
 from hexrd.instrument import HEDMInstrument
 
@@ -5,7 +11,23 @@ from hexrdgui.constants import ViewType
 from hexrdgui.hexrd_config import HexrdConfig
 
 
+# The most recently created instrument, along with the instrument
+# generation (see `HexrdConfig().instrument_generation`) it was created
+# with. This instrument is never handed out directly, only copies of it are.
+_cached_instrument: tuple[int, HEDMInstrument] | None = None
+_cached_instrument_lock = threading.Lock()
+
+
 def create_hedm_instrument() -> HEDMInstrument:
+    """Create an instrument from the current instrument config
+
+    The instrument is only rebuilt when the instrument generation changes.
+    Each caller gets its own copy, since callers such as the image viewers
+    and the calibration runners modify the detector transforms, distortion
+    parameters and beam of the instrument they receive. The copies share
+    the panel buffers with the cached instrument, though, which are made
+    read-only: the panel buffers are replaced, never modified in place.
+    """
     # Ensure that the panel buffer sizes match the pixel sizes.
     # If not, clear the panel buffer and print a warning.
     # It would be nice to avoid this check, but it is sometimes difficult to
@@ -14,6 +36,35 @@ def create_hedm_instrument() -> HEDMInstrument:
     # program. So keep this check here unless we find out a better way.
     HexrdConfig().clean_panel_buffers()
 
+    global _cached_instrument
+
+    generation = HexrdConfig().instrument_generation
+    with _cached_instrument_lock:
+        cached = _cached_instrument
+        if cached is None or cached[0] != generation:
+            cached = (generation, _create_hedm_instrument())
+            _cached_instrument = cached
+
+    instr = cached[1]
+
+    # Share the (possibly large) panel buffers instead of copying them
+    memo: dict[int, Any] = {}
+    for panel in instr.detectors.values():
+        buffer = panel.panel_buffer
+        if isinstance(buffer, np.ndarray):
+            buffer.flags.writeable = False
+            memo[id(buffer)] = buffer
+
+    instr = copy.deepcopy(instr, memo)
+
+    # This is not part of the geometry, so it is not in the generation
+    if HexrdConfig().max_cpus is not None:
+        instr.max_workers = HexrdConfig().max_cpus
+
+    return instr
+
+
+def _create_hedm_instrument() -> HEDMInstrument:
     # HEDMInstrument expects None Euler angle convention for the
     # config. Let's get it as such.
     iconfig = HexrdConfig().instrument_config_none_euler_convention
@@ -34,9 +85,6 @@ def create_hedm_instrument() -> HEDMInstrument:
         'active_beam_name': HexrdConfig().active_beam_name,
     }
 
-    if HexrdConfig().max_cpus is not None:
-        kwargs['max_workers'] = HexrdConfig().max_cpus
-
     return HEDMInstrument(**kwargs)
 
 
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+from typing import Any
+import weakref
+
+import numpy as np
+
+from hexrdgui.constants import (
+    FRAME_CACHE_MAX_BYTES,
+    FRAME_PREFETCH_AHEAD,
+    FRAME_PREFETCH_BEHIND,
+)
+from hexrdgui.singletons import Singleton
+
+
+class FrameCache(metaclass=Singleton):
+    """A memory-budgeted cache of imageseries frames
+
+    Reading a frame goes through the whole processing chain of the
+    imageseries (dark subtraction, flips, rectangle ops...), which can be
+    slow. Frames are kept here after they are read, and `prefetch()` reads
+    the frames around an index on a background thread, so that stepping
+    through an imageseries does not have to wait on the reads.
+
+    Cached frames are read-only. Callers that modify an image must copy it.
+    """
+
+    def __init__(self, max_bytes: int = FRAME_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+
+        # (id(ims), idx) => (weakref to ims, frame)
+        self._frames: OrderedDict[tuple[int, int], tuple[Any, np.ndarray]] = (
+            OrderedDict()
+        )
+        self._num_bytes = 0
+
+        # Frames that are currently being read, so that the same frame
+        # is never read twice at the same time.
+        self._pending: dict[tuple[int, int], Future] = {}
+
+        self._lock = threading.Lock()
+
+        # The imageseries are not necessarily thread-safe. Only one frame
+        # is ever read at a time.
+        self._read_lock = threading.Lock()
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='frame_prefetch'
+        )
+
+        # Prefetch requests from an older generation are dropped
+        self._generation = 0
+        self._last_idx: int | None = None
+
+    @property
+    def num_bytes(self) -> int:
+        return self._num_bytes
+
+    def get(self, ims: Any, idx: int) -> np.ndarray:
+        if idx < 0:
+            idx += len(ims)
+
+        key = (id(ims), idx)
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is not None and entry[0]() is ims:
+                self._frames.move_to_end(key)
+                return entry[1]
+
+            future = self._pending.get(key)
+            reader = future is None
+            if reader:
+                future = Future()
+                self._pending[key] = future
+
+        assert future is not None
+        if not reader:
+            # Another thread is already reading this frame
+            return future.result()
+
+        try:
+            with self._read_lock:
+                frame = np.asarray(ims[idx])
+
+            frame.flags.writeable = False
+            self._insert(key, ims, frame)
+            future.set_result(frame)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._pending[key]
+
+        return frame
+
+    def contains(self, ims: Any, idx: int) -> bool:
+        with self._lock:
+            entry = self._frames.get((id(ims), idx))
+            return entry is not None and entry[0]() is ims
+
+    def prefetch(self, ims_list: list[Any], idx: int) -> None:
+        """Read the frames around `idx` in the background
+
+        More frames are read in the direction that the index last moved.
+        Any prefetching that was requested earlier and has not started
+        yet is dropped. Frames of imageseries that are not in `ims_list`
+        are evicted from the cache.
+        """
+        self.retain(ims_list)
+        if not ims_list:
+            return
+
+        length = len(ims_list[0])
+        if length < 2:
+            return
+
+        step = -1 if self._last_idx is not None and idx < self._last_idx else 1
+        self._last_idx = idx
+
+        # Never prefetch more frames than half of the memory budget allows
+        frame_bytes = self._frame_bytes(ims_list, idx)
+        max_frames = self.max_bytes // max(2 * frame_bytes, 1)
+
+        ahead = [idx + step * i for i in range(1, FRAME_PREFETCH_AHEAD + 1)]
+        behind = [idx - step * i for i in range(1, FRAME_PREFETCH_BEHIND + 1)]
+        indices = [i for i in ahead + behind if 0 <= i < length][:max_frames]
+
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+
+        for i in indices:
+            self._executor.submit(self._prefetch_frame, generation, ims_list, i)
+
+    def retain(self, ims_list: list[Any]) -> None:
+        """Evict the frames of all imageseries that are not in `ims_list`"""
+        keep = {id(ims) for ims in ims_list}
+        with self._lock:
+            for key in list(self._frames):
+                ims = self._frames[key][0]()
+                if ims is None or key[0] not in keep:
+                    self._evict(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._frames.clear()
+            self._num_bytes = 0
+            self._last_idx = None
+
+    def _prefetch_frame(self, generation: int, ims_list: list[Any], idx: int) -> None:
+        for ims in ims_list:
+            if generation != self._generation:
+                # The index changed again. These frames may not be needed.
+                return
+
+            if not self.contains(ims, idx):
+                self.get(ims, idx)
+
+    def _frame_bytes(self, ims_list: list[Any], idx: int) -> int:
+        # The size of the frames at one index, estimated from the cache
+        with self._lock:
+            return sum(
+                entry[1].nbytes
+                for ims in ims_list
+                if (entry := self._frames.get((id(ims), idx))) is not None
+            )
+
+    def _insert(self, key: tuple[int, int], ims: Any, frame: np.ndarray) -> None:
+        if frame.nbytes > self.max_bytes:
+            # It would not fit anyways
+            return
+
+        try:
+            ref = weakref.ref(ims)
+        except TypeError:
+            # We can't tell when this imageseries is replaced. Don't cache.
+            return
+
+        with self._lock:
+            if key in self._frames:
+                self._evict(key)
+
+            self._frames[key] = (ref, frame)
+            self._num_bytes += frame.nbytes
+            while self._num_bytes > self.max_bytes:
+                self._evict(next(iter(self._frames)))
+
+    def _evict(self, key: tuple[int, int]) -> None:
+        # The lock must be held when calling this
+        _, frame = self._frames.pop(key)
+        self._num_bytes -= frame.nbytes
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import copy
+import hashlib
 import io
 import logging
 import os
 from pathlib import Path
+import pickle
 import sys
 from typing import TYPE_CHECKING
 
@@ -35,6 +37,7 @@ from hexrdgui import constants
 from hexrdgui import overlays
 from hexrdgui import resource_loader
 from hexrdgui import utils
+from hexrdgui.frame_cache import FrameCache
 from hexrdgui.masking.constants import MaskType
 from hexrdgui.singletons import QSingleton
 
@@ -348,6 +351,7 @@ class HexrdConfig(QObject, metaclass=QSingleton):
         self.polar_angular_grid = None
         self._recent_images: dict[str, list[str]] = {}
         self.max_cpus = None
+        self._max_dark_frames = 120
         self.azimuthal_overlays: list[Any] = []
         self.azimuthal_offset = 0.0
         self._active_beam_name = None
@@ -366,6 +370,8 @@ class HexrdConfig(QObject, metaclass=QSingleton):
         self._instrument_rigid_body_params: dict[str, Any] = {}
         self._median_filter_correction: dict[str, Any] = {}
         self.intensity_corrections_dict: dict[str, Any] = {}
+        self._intensity_corrections_cache: tuple[str, dict[str, Any]] | None = None
+        self.instrument_generation = 0
         self._azimuthal_lineout_detectors = None
 
         # Make sure that the matplotlib font size matches the application
@@ -430,6 +436,22 @@ class HexrdConfig(QObject, metaclass=QSingleton):
 
         self.detectors_changed.connect(self.on_detectors_changed)
 
+        instrument_modified_signals = [
+            self.detector_transforms_modified,
+            self.instrument_config_loaded,
+            self.detectors_changed,
+            self.detector_shape_changed,
+            self.panel_distortion_modified,
+            self.beam_energy_modified,
+            self.beam_vector_changed,
+            self.active_beam_switched,
+            self.oscillation_stage_changed,
+            self.euler_angle_convention_changed,
+            self.physics_package_modified,
+        ]
+        for signal in instrument_modified_signals:
+            signal.connect(lambda *args: self.bump_instrument_generation())
+
     # Returns a list of tuples contain the names of attributes and their
     # default values that should be persisted as part of the configuration
     # state.
@@ -473,6 +495,7 @@ class HexrdConfig(QObject, metaclass=QSingleton):
             ('apply_median_filter_correction', False),
             ('median_filter_kernel_size', 7),
             ('_azimuthal_lineout_detectors', None),
+            ('max_dark_frames', 120),
         ]
 
     # Provide a mapping from attribute names to the keys used in our state
@@ -579,6 +602,7 @@ class HexrdConfig(QObject, metaclass=QSingleton):
             if isinstance(self.beam_energy, dict):
                 # We loaded a state with the old statuses. Remove them.
                 self.remove_status(self.config['instrument'])
+                self.bump_instrument_generation()
 
         # Never allow WPPF difference curve to be set `True` from state
         disable_wppf_difference = (
@@ -806,6 +830,8 @@ class HexrdConfig(QObject, metaclass=QSingleton):
             # Convert it to whatever convention we are using
             utils.convert_tilt_convention(self.config['instrument'], old_eac, new_eac)
 
+        self.bump_instrument_generation()
+
         # Because it is a time-consuming process, don't emit
         # instrument_config_loaded, which will re-generate Cartesian and
         # polar parameters. We'll just leave them at whatever they were
@@ -933,7 +959,7 @@ class HexrdConfig(QObject, metaclass=QSingleton):
     def image(self, name: str, idx: int) -> np.ndarray:
         ims = self.imageseries(name)
         assert ims is not None
-        return ims[idx]
+        return FrameCache().get(ims, idx)
 
     def imageseries(self, name: str) -> ImageSeries | None:
         return self.imageseries_dict.get(name)
@@ -998,7 +1024,13 @@ class HexrdConfig(QObject, metaclass=QSingleton):
     @property
     def raw_images_dict(self) -> dict[str, np.ndarray]:
         """Get a dict of images with the current index"""
-        idx = self.current_imageseries_idx
+        return self.create_raw_images_dict()
+
+    def create_raw_images_dict(self, idx: int | None = None) -> dict[str, np.ndarray]:
+        """Get a dict of images at an index (defaults to the current one)"""
+        if idx is None:
+            idx = self.current_imageseries_idx
+
         ret = {}
         for key in self.imageseries_dict.keys():
             ret[key] = self.image(key, idx)
@@ -1008,7 +1040,14 @@ class HexrdConfig(QObject, metaclass=QSingleton):
     @property
     def intensity_corrected_images_dict(self) -> dict[str, np.ndarray]:
         """Performs intensity corrections, if any, before returning"""
-        images_dict = self.raw_images_dict
+        return self.create_intensity_corrected_images_dict()
+
+    def create_intensity_corrected_images_dict(
+        self,
+        idx: int | None = None,
+    ) -> dict[str, np.ndarray]:
+        """Same as `intensity_corrected_images_dict`, but at any index"""
+        images_dict = self.create_raw_images_dict(idx)
         if not self.any_intensity_corrections:
             # No intensity corrections. Return.
             return images_dict
@@ -1034,9 +1073,10 @@ class HexrdConfig(QObject, metaclass=QSingleton):
             for name, img in images_dict.items():
                 if not np.issubdtype(img.dtype, np.floating):
                     # It needs to be a float to apply corrections
-                    images_dict[name] = img.astype(float)
+                    img = img.astype(float)
 
-                images_dict[name] *= corrections_dict[name]
+                # The raw images may be read-only, so don't multiply in place
+                images_dict[name] = img * corrections_dict[name]
 
             # In the polar view, minimum will be subtracted later
             if self.intensity_subtract_minimum:
@@ -1046,11 +1086,41 @@ class HexrdConfig(QObject, metaclass=QSingleton):
 
         return images_dict
 
+    def bump_instrument_generation(self) -> None:
+        """Invalidate everything that is cached on the instrument generation
+
+        This is bumped automatically whenever one of the instrument signals
+        is emitted. Code that edits the instrument config directly, without
+        emitting one of those signals, must call this after its edits.
+        """
+        self.instrument_generation += 1
+
+    @property
+    def _intensity_corrections_key(self) -> str:
+        # A hash of everything the intensity correction fields depend on
+        key = (
+            self.instrument_generation,
+            self.config['image']['polarization'],
+            self.apply_pixel_solid_angle_correction,
+            self.apply_polarization_correction,
+            self.apply_lorentz_correction,
+            self.apply_absorption_correction,
+        )
+        return hashlib.sha1(pickle.dumps(key)).hexdigest()
+
     def create_intensity_corrections_dict(self) -> dict:
         # The corrections dict is both stored in `intensity_corrections_dict`
-        # and returned from this function.
-        corrections_dict = self.intensity_corrections_dict
-        corrections_dict.clear()
+        # and returned from this function. A new dict is stored once it is
+        # complete, so readers on other threads never see a partial one.
+        # The correction fields only depend on the instrument and the
+        # correction options, so they are cached until one of those changes.
+        key = self._intensity_corrections_key
+        cached = self._intensity_corrections_cache
+        if cached is not None and cached[0] == key:
+            self.intensity_corrections_dict = cached[1]
+            return cached[1]
+
+        corrections_dict: dict[str, Any] = {}
 
         # Some methods require an instrument. Go ahead and create one.
         from hexrdgui.create_hedm_instrument import create_hedm_instrument
@@ -1062,6 +1132,8 @@ class HexrdConfig(QObject, metaclass=QSingleton):
             corrections_dict[det_key] = np.ones(panel.shape)
 
         if not self.any_intensity_corrections:
+            self.intensity_corrections_dict = corrections_dict
+            self._intensity_corrections_cache = (key, corrections_dict)
             return corrections_dict
 
         if self.apply_pixel_solid_angle_correction:
@@ -1103,6 +1175,8 @@ class HexrdConfig(QObject, metaclass=QSingleton):
                 transmission /= max_transmission
                 corrections_dict[name] /= transmission
 
+        self.intensity_corrections_dict = corrections_dict
+        self._intensity_corrections_cache = (key, corrections_dict)
         return corrections_dict
 
     @property
@@ -1110,6 +1184,10 @@ class HexrdConfig(QObject, metaclass=QSingleton):
         """Default to intensity corrected images dict"""
         return self.intensity_corrected_images_dict
 
+    def create_images_dict(self, idx: int | None = None) -> dict[str, np.ndarray]:
+        """Same as `images_dict`, but at any index"""
+        return self.create_intensity_corrected_images_dict(idx)
+
     @property
     def raw_masks_dict(self) -> dict[str, Any]:
         return self.create_raw_masks_dict(self.images_dict, display=False)
@@ -1120,11 +1198,36 @@ class HexrdConfig(QObject, metaclass=QSingleton):
         display: bool = False,
     ) -> dict[str, Any]:
         """Get a masks dict"""
+        masks_dict = {}
+        combined = self._combined_raw_masks(images_dict, display)
+        for name, (masked, thresh_mask) in combined.items():
+            final_mask = ~masked
+            if thresh_mask is not None:
+                np.logical_and(final_mask, thresh_mask, out=final_mask)
+            masks_dict[name] = final_mask
+
+        return masks_dict
+
+    def _combined_raw_masks(
+        self,
+        images_dict: dict[str, Any],
+        display: bool = False,
+    ) -> dict[str, tuple[np.ndarray, np.ndarray | None]]:
+        """Get the masks to apply to each image
+
+        For each detector, this returns the union of the region masks
+        (True where masked), and the threshold mask for the current frame
+        (False where masked), or None if there isn't one.
+
+        The union of the region masks is kept on the mask manager, and is
+        only updated for masks that changed. It must not be modified.
+        """
         from hexrdgui.masking.mask_manager import MaskManager
 
-        masks_dict = {}
+        results = {}
         for name, img in images_dict.items():
-            final_mask = np.ones(img.shape, dtype=bool)
+            region_masks = {}
+            thresh_mask = None
             for mask in MaskManager().masks.values():
                 if display and not mask.visible:
                     # Only apply visible masks for display
@@ -1138,17 +1241,23 @@ class HexrdConfig(QObject, metaclass=QSingleton):
                     idx = HexrdConfig().current_imageseries_idx
                     thresh_mask = mask.get_masked_arrays()
                     thresh_mask = thresh_mask[name][idx]
-                    final_mask = np.logical_and(final_mask, thresh_mask)
                 else:
                     masks = mask.get_masked_arrays(  # type: ignore[call-arg]
                         constants.ViewType.raw
                     )
                     for det, arr in masks:
                         if det == name:
-                            final_mask = np.logical_and(final_mask, arr)
-            masks_dict[name] = final_mask
+                            region_masks[mask.name] = arr
 
-        return masks_dict
+            masked = MaskManager().raw_mask_cache.get(
+                (name, display),
+                img.shape,
+                img.shape,
+                region_masks,
+            )
+            results[name] = (masked, thresh_mask)
+
+        return results
 
     @property
     def masked_images_dict(self) -> dict[str, Any]:
@@ -1211,27 +1320,33 @@ class HexrdConfig(QObject, metaclass=QSingleton):
             # and no panel buffers.
             fill_value = 0
 
-        raw_masks_dict = self.create_raw_masks_dict(images_dict, display=display)
-        for det, mask in raw_masks_dict.items():
+        combined = self._combined_raw_masks(images_dict, display=display)
+        for det, (masked, thresh_mask) in combined.items():
             img = images_dict[det]
             if has_panel_buffers:
                 panel = instr.detectors[det]
                 utils.convert_panel_buffer_to_2d_array(panel)
 
+            dtype = img.dtype
             if np.issubdtype(type(fill_value), np.floating) and not np.issubdtype(
-                img.dtype, np.floating
+                dtype, np.floating
             ):
-                img = img.astype(float)
-                images_dict[det] = img
+                dtype = np.dtype(float)
+
+            if dtype != img.dtype:
+                img = img.astype(dtype)
             elif not img.flags.writeable:
                 # Need to make a copy
                 img = img.copy()
-                images_dict[det] = img
+            images_dict[det] = img
 
-            img[~mask] = fill_value
+            np.putmask(img, masked, fill_value)
+
+            if thresh_mask is not None:
+                np.putmask(img, ~thresh_mask, fill_value)
 
             if has_panel_buffers:
-                img[~panel.panel_buffer] = fill_value
+                np.putmask(img, ~panel.panel_buffer, fill_value)
 
         return images_dict
 
@@ -1295,6 +1410,8 @@ class HexrdConfig(QObject, metaclass=QSingleton):
         # Remove any 'None' distortion dicts from the detectors
         utils.remove_none_distortions(self.config['instrument'])
 
+        self.bump_instrument_generation()
+
         if not import_raw:
             # Create a backup
             self.backup_instrument_config()
@@ -1603,6 +1720,7 @@ class HexrdConfig(QObject, metaclass=QSingleton):
                     'parameters': ([0.0] * self.num_distortion_parameters(value)),
                 }
 
+            self.bump_instrument_generation()
             self.panel_distortion_modified.emit(path[1])
             # Toggling/switching the distortion also affects the warped image.
             self.rerender_needed.emit()
@@ -1627,6 +1745,9 @@ class HexrdConfig(QObject, metaclass=QSingleton):
             # If we didn't modify anything, just return
             return
 
+        # Not every path below emits one of the instrument signals
+        self.bump_instrument_generation()
+
         # If the beam energy was modified, update the visible materials
         beam_path: list[str | None] = ['beam']
         if self.has_multi_xrs:
@@ -2265,10 +2386,16 @@ class HexrdConfig(QObject, metaclass=QSingleton):
             self.azimuthal_overlays = pruned_overlays
             HexrdConfig().azimuthal_options_modified.emit()
 
-    def append_overlay(self, material_name: str, type: constants.OverlayType) -> None:
+    def append_overlay(
+        self,
+        material_name: str,
+        type: constants.OverlayType,
+        **kwargs: Any,
+    ) -> None:
         overlay = overlays.create_overlay(
             material_name=material_name,
             type=type,
+            **kwargs,
         )
         # Give it a distinct color if other overlays already exist.
         overlays.assign_cycled_style(overlay, self.overlays)
@@ -2829,6 +2956,16 @@ class HexrdConfig(QObject, metaclass=QSingleton):
     def set_tab_images(self, v: bool) -> None:
         self.tab_images = v
 
+    @property
+    def max_dark_frames(self) -> int:
+        """The maximum number of frames to aggregate for a dark image"""
+        return self._max_dark_frames
+
+    @max_dark_frames.setter
+    def max_dark_frames(self, v: int) -> None:
+        # QSettings may give this back to us as a string
+        self._max_dark_frames = int(v)
+
     @property
     def font_size(self) -> int:
         app = QCoreApplication.instance()
@@ -3194,6 +3331,7 @@ class HexrdConfig(QObject, metaclass=QSingleton):
     @config_instrument.setter
     def config_instrument(self, instrument: dict) -> None:
         self.config['instrument'] = instrument
+        self.bump_instrument_generation()
 
     # Property with same name as settings key, used for persistence
     @property
@@ -3275,6 +3413,7 @@ class HexrdConfig(QObject, metaclass=QSingleton):
                     'Clearing panel buffer.'
                 )
                 det_info['buffer'] = [0.0, 0.0]
+                self.bump_instrument_generation()
 
     def add_recent_state_file(self, new_file: str | Path) -> None:
         self.recent_state_files.insert(0, str(new_file))
@@ -3292,6 +3431,7 @@ class HexrdConfig(QObject, metaclass=QSingleton):
     def apply_absorption_correction(self, v: bool) -> None:
         if v != self.apply_absorption_correction:
             self._apply_absorption_correction = v
+            self.bump_instrument_generation()
             self.deep_rerender_needed.emit()
 
     @property
@@ -3409,6 +3549,8 @@ class HexrdConfig(QObject, metaclass=QSingleton):
         else:
             filter.deserialize(**kwargs)
 
+        self.bump_instrument_generation()
+
     def detector_coating(self, det_name: str) -> Coating | None:
         self._detector_coatings.setdefault(det_name, {})
         return self._detector_coatings[det_name].get('coating', None)
@@ -3424,6 +3566,8 @@ class HexrdConfig(QObject, metaclass=QSingleton):
         else:
             coating.deserialize(**kwargs)
 
+        self.bump_instrument_generation()
+
     def detector_phosphor(self, det_name: str) -> Phosphor | None:
         self._detector_coatings.setdefault(det_name, {})
         return self._detector_coatings[det_name].get('phosphor', None)
@@ -3439,6 +3583,8 @@ class HexrdConfig(QObject, metaclass=QSingleton):
         else:
             phosphor.deserialize(**kwargs)
 
+        self.bump_instrument_generation()
+
     @property
     def apply_median_filter_correction(self) -> bool:
         return self._median_filter_correction.get('apply', False)
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 import copy
 import math
 import logging
+import os
 import sys
+import threading
 from typing import TYPE_CHECKING
+import weakref
 
 from PySide6.QtCore import QThreadPool, QTimer, Signal, Qt
 from PySide6.QtWidgets import QFileDialog, QMessageBox, QProgressDialog, QWidget
 
 from matplotlib.axes import Axes
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
 from matplotlib.lines import Line2D
 from matplotlib.colors import to_rgba
@@ -34,12 +39,19 @@ from hexrdgui.calibration.cartesian_plot import cartesian_viewer
 from hexrdgui.calibration.polar_plot import polar_viewer
 from hexrdgui.calibration.raw_iviewer import raw_iviewer
 from hexrdgui.calibration.stereo_plot import stereo_viewer
-from hexrdgui.constants import OverlayType, PolarXAxisType, ViewType
+from hexrdgui.constants import (
+    OverlayType,
+    POLAR_PREVIEW_SETTLE_DELAY_MS,
+    PolarXAxisType,
+    ViewType,
+)
 from hexrdgui.create_hedm_instrument import create_view_hedm_instrument
 from hexrdgui.hexrd_config import HexrdConfig
 from hexrdgui.masking.constants import MaskType
 from hexrdgui.masking.create_polar_mask import create_polar_line_data_from_raw
 from hexrdgui.masking.mask_manager import MaskManager
+from hexrdgui.overlays.generator import OverlayGenerator
+from hexrdgui.overlays.rotation_series_overlay import omega_range_slice
 from hexrdgui.scaling import create_scaling_function
 from hexrdgui.snip_viewer_dialog import SnipViewerDialog
 from hexrdgui.utils.array import split_array
@@ -126,6 +138,40 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
         self.raw_view_images_dict: dict[str, np.ndarray] = {}
         self._mask_boundary_artists: list[Any] = []
         self._latest_compute_view_worker: AsyncWorker | None = None
+
+        # Detector transform modifications are coalesced, so that a burst
+        # of them (such as from dragging a slider) only updates the view
+        # once, with the latest transforms. A zero-interval timer times out
+        # once all of the events in the queue have been processed.
+        self._pending_transform_detectors: dict[str, None] = {}
+        self._detector_transforms_timer = QTimer(self)
+        self._detector_transforms_timer.setSingleShot(True)
+        self._detector_transforms_timer.timeout.connect(
+            self.apply_pending_detector_transforms
+        )
+
+        # While transforms keep changing, the polar and stereo views are
+        # previewed at low resolution. This timer times out once they have
+        # settled, and the detectors that were previewed are then updated
+        # at full resolution.
+        self._previewed_detectors: dict[str, None] = {}
+        self._transforms_settle_timer = QTimer(self)
+        self._transforms_settle_timer.setSingleShot(True)
+        self._transforms_settle_timer.timeout.connect(
+            self.finish_detector_transforms_preview
+        )
+        self._overlay_artist_styles: weakref.WeakKeyDictionary = (
+            weakref.WeakKeyDictionary()
+        )
+        # The data that each overlay artist was last drawn with
+        self._overlay_artist_data: weakref.WeakKeyDictionary = (
+            weakref.WeakKeyDictionary()
+        )
+        # The state that each overlay was last drawn in. See
+        # `_overlay_draw_state()`.
+        self._overlay_drawn_states: weakref.WeakKeyDictionary = (
+            weakref.WeakKeyDictionary()
+        )
         self._create_waterfall_progress: QProgressDialog | None = None
         self._waterfall_plot_dialog: WaterfallPlotDialog | None = None
 
@@ -146,6 +192,10 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
 
     def setup_connections(self) -> None:
         HexrdConfig().overlay_config_changed.connect(self.update_overlays)
+        OverlayGenerator().overlay_generated.connect(self._on_overlay_generated)
+        OverlayGenerator().generation_failed.connect(
+            self._on_overlay_generation_failed
+        )
         HexrdConfig().show_saturation_level_changed.connect(self.show_saturation)
         HexrdConfig().show_stereo_border_changed.connect(self.draw_stereo_border)
         HexrdConfig().detector_transforms_modified.connect(
@@ -503,8 +553,9 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
             self.overlay_artists.pop(old_name)
 
     def overlay_axes_data(self, overlay: Overlay) -> list:
-        # Return the axes and data for drawing the overlay
-        if not overlay.data:
+        # Return the axes and data for drawing the overlay. While new data
+        # is being generated in the background, the last data is drawn.
+        if not overlay.last_data:
             return []
 
         if self.mode == ViewType.raw:
@@ -522,7 +573,7 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
 
         # If it is anything else, there is only one axis
         # Use the same axis for all of the data
-        return [(self.axis, k, v) for k, v in overlay.data.items()]
+        return [(self.axis, k, v) for k, v in overlay.last_data.items()]
 
     def overlay_draw_func(self, type: OverlayType) -> Callable:
         overlay_funcs = {
@@ -530,6 +581,8 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
             OverlayType.laue: self.draw_laue_overlay,
             OverlayType.rotation_series: self.draw_rotation_series_overlay,
             OverlayType.const_chi: self.draw_const_chi_overlay,
+            # The spots of all grains are drawn together
+            OverlayType.multi_grain: self.draw_rotation_series_overlay,
         }
 
         if type not in overlay_funcs:
@@ -537,18 +590,48 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
 
         return overlay_funcs[type]
 
+    def _overlay_draw_state(self, overlay: Overlay) -> tuple:
+        # Everything that the drawing of an overlay depends on, other than
+        # its data, which is compared by identity.
+        return (
+            overlay.name,
+            self.mode,
+            tuple(self.figure.axes),
+            copy.deepcopy(overlay.style),
+            copy.deepcopy(overlay.highlight_style),
+            [(x[0], x[2]) for x in overlay.highlights],
+            HexrdConfig().stitch_raw_roi_images,
+            HexrdConfig().active_beam_name,
+        )
+
     def draw_overlay(self, overlay: Overlay) -> None:
+        # The existing artists of the overlay are updated in place
         if not overlay.visible:
+            self._overlay_drawn_states.pop(overlay, None)
+            self.remove_overlay_artists(overlay.name)
             return
 
-        if overlay.name in self.overlay_artists:
-            # It's already present. Skip it.
+        # Skip the overlay if neither its data nor anything else that it
+        # is drawn with changed since it was last drawn.
+        data = overlay.last_data
+        hkl_means = getattr(overlay, 'hkl_means', None)
+        state = self._overlay_draw_state(overlay)
+        drawn = self._overlay_drawn_states.get(overlay)
+        if (
+            drawn is not None
+            and overlay.name in self.overlay_artists
+            and drawn[0] is data
+            and drawn[1] is hkl_means
+            and drawn[2] == state
+        ):
             return
 
         type = overlay.type
         style = overlay.style
         highlight_style = overlay.highlight_style
+        det_keys = []
         for axis, det_key, data in self.overlay_axes_data(overlay):
+            det_keys.append(det_key)
             highlights = [x[2] for x in overlay.highlights if x[0] == det_key]
             kwargs = {
                 'artist_key': overlay.name,
@@ -562,8 +645,141 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
             self.overlay_draw_func(type)(**kwargs)
 
         if self.mode == ViewType.polar and overlay.type == OverlayType.powder:
+            det_keys.append('__lineout')
             self.draw_azimuthal_powder_lines(cast('PowderOverlay', overlay))
 
+        # Remove the artists of anything that is no longer drawn
+        for det_key in list(self.overlay_artists.get(overlay.name, {})):
+            if det_key not in det_keys:
+                self.blit_manager.remove_artists('overlays', overlay.name, det_key)
+
+        self._overlay_drawn_states[overlay] = (data, hkl_means, state)
+
+    def set_overlay_lines(
+        self,
+        artists: dict,
+        key: str,
+        axis: Axes,
+        segments: list,
+        style: dict,
+        **kwargs: Any,
+    ) -> None:
+        # Update the line collection at `artists[key]` in place, creating
+        # it if needed. It is removed if there are no segments.
+        if len(segments) == 0:
+            self.remove_overlay_artist(artists, key)
+            return
+
+        kwargs = {**collection_style(style), **kwargs}
+        artist = artists.get(key)
+        if not isinstance(artist, LineCollection) or artist.axes is not axis:
+            self.remove_overlay_artist(artists, key)
+            artist = LineCollection(segments, animated=True, **kwargs)
+            axis.add_collection(artist, autolim=False)
+            artists[key] = artist
+            self._overlay_artist_styles[artist] = copy.deepcopy(style)
+        else:
+            # Only mark the artist as changed if it actually did
+            same_style = self._overlay_artist_styles.get(artist) == style
+            if same_style and _segments_equal(
+                self._overlay_artist_data.get(artist), segments
+            ):
+                return
+
+            artist.set_segments(segments)
+            if not same_style:
+                artist.set(**kwargs)
+                self._overlay_artist_styles[artist] = copy.deepcopy(style)
+
+        self._overlay_artist_data[artist] = segments
+        self.blit_manager.mark_dirty(artist)
+
+    def set_overlay_points(
+        self,
+        artists: dict,
+        key: str,
+        axis: Axes,
+        points: Any,
+        style: dict,
+    ) -> None:
+        # Update the scatter plot at `artists[key]` in place, creating it
+        # if needed. It is removed if there are no points.
+        if len(points) == 0:
+            self.remove_overlay_artist(artists, key)
+            return
+
+        points = np.asarray(points)
+        artist = artists.get(key)
+        if (
+            artist is None
+            or artist.axes is not axis
+            or self._overlay_artist_styles.get(artist) != style
+        ):
+            # The marker and sizes of a scatter plot can't be updated
+            # in place. Make a new one.
+            self.remove_overlay_artist(artists, key)
+            artist = axis.scatter(*points.T, animated=True, **style)
+            artists[key] = artist
+            self._overlay_artist_styles[artist] = copy.deepcopy(style)
+        else:
+            offsets = np.asarray(artist.get_offsets())
+            if offsets.shape == points.shape and np.array_equal(
+                offsets, points, equal_nan=True
+            ):
+                # Nothing changed
+                return
+
+            artist.set_offsets(points)
+
+        self.blit_manager.mark_dirty(artist)
+
+    def set_overlay_labels(
+        self,
+        artists: dict,
+        key: str,
+        axis: Axes,
+        labels: list,
+        positions: list,
+        offsets: Any,
+        style: dict,
+    ) -> None:
+        # Update the text artists in `artists[key]` in place, adding or
+        # removing them as needed.
+        texts = artists.setdefault(key, [])
+        num_labels = min(len(labels), len(positions))
+        while len(texts) > num_labels or (texts and texts[0].axes is not axis):
+            text = texts.pop()
+            self.blit_manager.mark_dirty(text)
+            remove_artist(text)
+
+        for i, (label, (x, y)) in enumerate(zip(labels, positions)):
+            kwargs = {
+                'x': x + offsets[0],
+                'y': y + offsets[1],
+                'text': label,
+                **style,
+            }
+            if i < len(texts):
+                if self._overlay_artist_styles.get(texts[i]) == kwargs:
+                    # Nothing changed
+                    continue
+
+                texts[i].set(**kwargs)
+            else:
+                texts.append(axis.text(clip_on=True, animated=True, **kwargs))
+
+            self._overlay_artist_styles[texts[i]] = copy.deepcopy(kwargs)
+            self.blit_manager.mark_dirty(texts[i])
+
+        if not texts:
+            artists.pop(key)
+
+    def remove_overlay_artist(self, artists: dict, key: str) -> None:
+        artist = artists.pop(key, None)
+        if artist is not None:
+            self.blit_manager.mark_dirty(artist)
+            remove_artist(artist)
+
     def draw_powder_overlay(
         self,
         artist_key: str,
@@ -622,8 +838,7 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
 
         def plot(data: list, key: str, kwargs: dict) -> None:
             # This logic was repeated
-            if len(data) != 0:
-                (artists[key],) = axis.plot(*np.vstack(data).T, animated=True, **kwargs)
+            self.set_overlay_lines(artists, key, axis, data, kwargs)
 
         plot(rings, 'rings', data_style)
         plot(h_rings, 'h_rings', highlight_style['data'])
@@ -641,11 +856,13 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
         ):
             # This overlay's x-ray source does not match the active one.
             # Skip it.
+            self.blit_manager.remove_artists('overlays', overlay.name, '__lineout')
             return
 
         az_axis = self.azimuthal_integral_axis
         if az_axis is None or not overlay.hkl_means:
             # Can't draw
+            self.blit_manager.remove_artists('overlays', overlay.name, '__lineout')
             return
 
         style = overlay.style
@@ -673,16 +890,14 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
                     ranges.extend(joined)
 
         def az_plot(data: list, key: str, kwargs: dict) -> None:
-            if len(data) == 0:
-                return
-
-            xmeans = np.asarray(data)
-
-            x = np.repeat(xmeans, 3)
-            y = np.tile([0, 1, np.nan], len(xmeans))
-
-            (artists[key],) = az_axis.plot(
-                x, y, transform=trans, animated=True, **kwargs
+            # One vertical segment for each of the x values
+            xmeans = np.asarray(data, dtype=float)
+            segments = np.empty((len(xmeans), 2, 2))
+            segments[:, :, 0] = xmeans[:, np.newaxis]
+            segments[:, :, 1] = [0, 1]
+
+            self.set_overlay_lines(
+                artists, key, az_axis, list(segments), kwargs, transform=trans
             )
 
         az_plot(rings, 'rings', data_style)
@@ -723,15 +938,11 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
 
         def scatter(data: list, key: str, kwargs: dict) -> None:
             # This logic was repeated
-            if len(data) != 0:
-                artists[key] = axis.scatter(
-                    *np.asarray(data).T, animated=True, **kwargs
-                )
+            self.set_overlay_points(artists, key, axis, data, kwargs)
 
         def plot(data: list, key: str, kwargs: dict) -> None:
             # This logic was repeated
-            if len(data) != 0:
-                (artists[key],) = axis.plot(*np.vstack(data).T, animated=True, **kwargs)
+            self.set_overlay_lines(artists, key, axis, data, kwargs)
 
         # Draw spots and highlighted spots
         scatter(spots, 'spots', data_style)
@@ -742,32 +953,20 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
         plot(h_ranges, 'h_ranges', highlight_style['ranges'])
 
         # Draw labels and highlighted labels
-        if len(labels) or len(h_labels):
-
-            def plot_label(
-                x: float, y: float, label: str, style: dict
-            ) -> mpl.text.Text:
-                kwargs = {
-                    'x': x + label_offsets[0],
-                    'y': y + label_offsets[1],
-                    's': label,
-                    'clip_on': True,
-                    **style,
-                }
-                return axis.text(**kwargs)
-
-            # I don't know of a way to use a single artist for all labels.
-            # FIXME: figure out how to make this faster, if needed.
-            artists.setdefault('labels', [])
-            for label, (x, y) in zip(labels, spots):
-                artists['labels'].append(plot_label(x, y, label, label_style))
-
-            # I don't know of a way to use a single artist for all labels.
-            # FIXME: figure out how to make this faster, if needed.
-            artists.setdefault('h_labels', [])
-            style = highlight_style['labels']
-            for label, (x, y) in zip(h_labels, h_spots):
-                artists['h_labels'].append(plot_label(x, y, label, style))
+        # I don't know of a way to use a single artist for all labels.
+        # FIXME: figure out how to make this faster, if needed.
+        self.set_overlay_labels(
+            artists, 'labels', axis, labels, spots, label_offsets, label_style
+        )
+        self.set_overlay_labels(
+            artists,
+            'h_labels',
+            axis,
+            h_labels,
+            h_spots,
+            label_offsets,
+            highlight_style['labels'],
+        )
 
     def draw_rotation_series_overlay(
         self,
@@ -786,7 +985,7 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
         # Compute the indices that are in range for the current omega value
         ome_points = data['omegas']
 
-        slicer: Any
+        slicer: slice
         if aggregated:
             # This means we will keep all
             slicer = slice(None)
@@ -797,8 +996,8 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
             ome_min = ome_mean - ome_width / 2
             ome_max = ome_mean + ome_width / 2
 
-            in_range = np.logical_and(ome_min <= ome_points, ome_points <= ome_max)
-            slicer = np.where(in_range)
+            # The spots are sorted by omega
+            slicer = omega_range_slice(ome_points, ome_min, ome_max)
 
         data_points = data['data']
         ranges = data['ranges']
@@ -806,24 +1005,19 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
         data_style = style['data']
         ranges_style = style['ranges']
 
-        if len(data_points) == 0:
-            return
-
-        sliced_data = data_points[slicer]
-        if len(sliced_data) == 0:
-            return
-
         overlay_artists = self.overlay_artists.setdefault(artist_key, {})
         artists = overlay_artists.setdefault(det_key, {})
 
-        artists['data'] = axis.scatter(*sliced_data.T, animated=True, **data_style)
+        if len(data_points) == 0 or len(data_points[slicer]) == 0:
+            # Nothing to draw for the current omega value
+            self.remove_overlay_artist(artists, 'data')
+            self.remove_overlay_artist(artists, 'ranges')
+            return
 
-        sliced_ranges = np.asarray(ranges)[slicer]
-        (artists['ranges'],) = axis.plot(
-            *np.vstack(list(sliced_ranges)).T,
-            animated=True,
-            **ranges_style,
-        )
+        sliced_data = data_points[slicer]
+        self.set_overlay_points(artists, 'data', axis, sliced_data, data_style)
+
+        self.set_overlay_lines(artists, 'ranges', axis, ranges[slicer], ranges_style)
 
     def draw_const_chi_overlay(
         self,
@@ -851,18 +1045,15 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
 
         def plot(data: list, key: str, kwargs: dict) -> None:
             # This logic was repeated
-            if len(data) != 0:
-                (artists[key],) = axis.plot(*np.vstack(data).T, animated=True, **kwargs)
+            self.set_overlay_lines(artists, key, axis, data, kwargs)
 
         plot(points, 'points', data_style)
         plot(h_points, 'h_points', highlight_style['data'])
 
     def redraw_overlay(self, overlay: Overlay) -> None:
-        # Remove the artists for this overlay
-        self.remove_overlay_artists(overlay.name)
-
-        # Redraw the overlay
+        # Update the artists of this overlay in place
         self.draw_overlay(overlay)
+        self.blit_manager.update_dirty()
 
     def update_overlays(self, *, skip_data_update: bool = False) -> None:
         if HexrdConfig().loading_state:
@@ -873,7 +1064,6 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
         if not self.iviewer:
             return
 
-        self.remove_all_overlay_artists()
         if not HexrdConfig().show_overlays or not HexrdConfig().overlays:
             # Avoid proceeding if possible, as updating the blit manager
             # can be time consuming.
@@ -881,22 +1071,48 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
             self.draw_idle()
             return
 
-        # Remove any artists that:
-        # 1. Are no longer in the list of overlays
-        # 2. Are not visible
-        # 3. Need updating
+        # Remove any artists that are no longer in the list of overlays
         self.prune_overlay_artists()
-        for overlay in HexrdConfig().overlays:
-            if overlay.update_needed or not overlay.visible:
-                self.remove_overlay_artists(overlay.name)
 
         if not skip_data_update:
             self.iviewer.update_overlay_data()
 
+        # Generating overlay data can be slow. Overlays that need it are
+        # generated in the background and redrawn as they finish. Until
+        # then, their previous artists are left in place.
+        pending = [x for x in HexrdConfig().overlays if x.visible and x.update_needed]
         for overlay in HexrdConfig().overlays:
-            self.draw_overlay(overlay)
+            if overlay not in pending:
+                self.draw_overlay(overlay)
+
+        self.blit_manager.update_dirty()
 
-        self.blit_manager.update()
+        if pending:
+            OverlayGenerator().request(pending)
+
+    def _on_overlay_generated(self, overlay: Overlay) -> None:
+        if overlay.update_needed or overlay not in HexrdConfig().overlays:
+            # It changed again, or it was removed. Any newer update will
+            # redraw it.
+            return
+
+        if not self.iviewer or not HexrdConfig().show_overlays:
+            return
+
+        self.draw_overlay(overlay)
+        self.blit_manager.update_dirty()
+
+    def _on_overlay_generation_failed(self, overlays: list[Overlay]) -> None:
+        # Generate them here instead, so the error is raised as usual
+        if not self.iviewer or not HexrdConfig().show_overlays:
+            return
+
+        for overlay in overlays:
+            if overlay in HexrdConfig().overlays:
+                overlay.data
+                self.draw_overlay(overlay)
+
+        self.blit_manager.update_dirty()
 
     def clear_detector_borders(self) -> None:
         while self.cached_detector_borders:
@@ -1819,7 +2035,11 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
         pimg = self._invalidate_skipped_detectors(pimg)
         return self._compute_azimuthal_integral_sum(pimg)
 
-    def _invalidate_skipped_detectors(self, pimg: np.ndarray) -> np.ndarray:
+    def _invalidate_skipped_detectors(
+        self,
+        pimg: np.ndarray,
+        panel_has_data: dict[str, np.ndarray] | None = None,
+    ) -> np.ndarray:
         # If the user has selected a subset of detectors to use for the
         # azimuthal lineout, invalidate any polar view pixels that were
         # affected by unselected detectors by setting them to nan
@@ -1833,9 +2053,10 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
             return pimg
 
         pimg = pimg.copy()
-        polar_iviewer = cast('PolarViewer', self.iviewer)
-        assert polar_iviewer.pv is not None
-        panel_has_data = polar_iviewer.pv.panel_has_data
+        if panel_has_data is None:
+            polar_iviewer = cast('PolarViewer', self.iviewer)
+            assert polar_iviewer.pv is not None
+            panel_has_data = polar_iviewer.pv.panel_has_data
 
         for det_key in self.iviewer.instr.detectors:
             if det_key not in keep_detectors:
@@ -2112,9 +2333,69 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
         if self.mode is None:
             return
 
-        assert self.iviewer is not None
+        # Don't update the view right away. Record which detectors were
+        # modified, and update them all at once after the pending events
+        # (such as more slider ticks) have been processed. The view is
+        # updated from the config, so the latest transforms are always
+        # used, and at most one update is ever pending.
+        self._pending_transform_detectors.update(dict.fromkeys(detectors))
+        if not self._detector_transforms_timer.isActive():
+            self._detector_transforms_timer.start(0)
+
+    def apply_pending_detector_transforms(self) -> None:
+        detectors = list(self._pending_transform_detectors)
+        self._pending_transform_detectors.clear()
+        if not detectors or HexrdConfig().loading_state:
+            return
+
+        if self.mode is None or self.iviewer is None:
+            # The view was cleared in the meantime
+            return
+
+        # If the transforms were modified recently (such as while a slider
+        # is dragged), preview the polar/stereo view at low resolution.
+        preview = self._transforms_settle_timer.isActive() and (
+            self.mode == ViewType.polar or self.is_stereo_from_polar
+        )
+        iviewer = cast('PolarViewer | StereoViewer', self.iviewer)
+        if preview:
+            self._previewed_detectors.update(dict.fromkeys(detectors))
+            iviewer.update_detectors(detectors, preview=True)
+            if iviewer.is_previewing:
+                self.axes_images[0].set_data(self.scaled_display_images[0])
+                # This will call self.draw_idle()
+                self.draw_detector_borders()
+                self._transforms_settle_timer.start(POLAR_PREVIEW_SETTLE_DELAY_MS)
+                return
+
+            # The view is small enough that it was updated at full resolution
+            self._previewed_detectors.clear()
+        else:
+            self.iviewer.update_detectors(detectors)  # type: ignore[union-attr]
+
+        self._transforms_settle_timer.start(POLAR_PREVIEW_SETTLE_DELAY_MS)
+        self.redraw_updated_detectors()
+
+    def finish_detector_transforms_preview(self) -> None:
+        # The transforms have settled. Replace the preview with the full
+        # resolution view.
+        detectors = list(self._previewed_detectors)
+        self._previewed_detectors.clear()
+        if not detectors or self.mode is None or self.iviewer is None:
+            return
+
+        if not getattr(self.iviewer, 'is_previewing', False):
+            # The view was regenerated in the meantime
+            return
+
         self.iviewer.update_detectors(detectors)  # type: ignore[union-attr]
+        self.redraw_updated_detectors()
 
+    def redraw_updated_detectors(self) -> None:
+        # Redraw everything that depends on the detector transforms, after
+        # the iviewer has updated its detectors.
+        # Updating the overlays supersedes any overlay generation still
+        # running for the previous transforms (see `update_overlays()`).
         if self.mode == ViewType.raw:
             # Only overlays need to be updated
             HexrdConfig().flag_overlay_updates_for_all_materials()
@@ -2241,45 +2522,68 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
         current_idx = HexrdConfig().current_imageseries_idx
         lineouts[current_idx] = self.compute_azimuthal_integral_sum()
 
-        # Make a deep copy of the iviewer, since we will modify it
-        iviewer = cast('PolarViewer', copy.deepcopy(self.iviewer))
-        assert iviewer.pv is not None
-
-        # Now generate the lineouts for the other frames
-        for i in range(num_lineouts):
-            if i == current_idx:
-                # We already generated this one
-                continue
+        polar_iviewer = cast('PolarViewer', self.iviewer)
+        assert polar_iviewer.pv is not None
+        pv = polar_iviewer.pv
 
-            # Create the new imageseries dict
-            HexrdConfig().current_imageseries_idx = i
-            try:
-                new_images_dict = HexrdConfig().images_dict
-            finally:
-                # Always restore the previous index
-                HexrdConfig().current_imageseries_idx = current_idx
+        # Split the other frames into contiguous chunks, and process the
+        # chunks in parallel. Everything that does not depend on the frame
+        # (the geometry, resampling operators, corrections and masks) is
+        # resolved once, here, in a frame copy of the polar view. Every
+        # chunk then warps its frames with its own copy of that one, which
+        # only reads the shared state. Only the lineouts are kept, so
+        # memory does not grow with the number of frames.
+        frame_pv = pv.frame_copy()
+        frames = [i for i in range(num_lineouts) if i != current_idx]
+        max_workers = HexrdConfig().max_cpus or os.cpu_count() or 1
+        chunk_size = max(1, math.ceil(len(frames) / (4 * max_workers)))
+        chunks = [
+            frames[i : i + chunk_size] for i in range(0, len(frames), chunk_size)
+        ]
 
-            # Now force the image dict to change
-            iviewer.pv.images_dict = new_images_dict
+        # Reading frames from the imageseries is not thread-safe, and
+        # neither are the memoized median filter and the instrument used
+        # to apply the panel buffers. So the frames are read one at a time.
+        read_lock = threading.Lock()
+
+        def compute_chunk(chunk: list[int]) -> list[tuple[int, np.ndarray]]:
+            chunk_pv = frame_pv.frame_copy()
+            results = []
+            for i in chunk:
+                with read_lock:
+                    # Setting the images dict applies the panel buffer
+                    chunk_pv.images_dict = HexrdConfig().create_images_dict(i)
+
+                # The detectors are already warped in parallel across
+                # chunks, so do not warp them in parallel here too.
+                chunk_pv.warp_all_images(max_workers=1)
+
+                polar_img = chunk_pv.img
+                assert polar_img is not None
+                if HexrdConfig().polar_apply_scaling_to_lineout:
+                    # Apply the transform
+                    polar_img = self.transform(polar_img)
+
+                # Invalidate any skipped detectors
+                polar_img = self._invalidate_skipped_detectors(
+                    polar_img, chunk_pv.panel_has_data
+                )
 
-            # Generate the new image
-            iviewer.pv.warp_all_images()
+                # Compute the integration
+                results.append((i, self._compute_azimuthal_integral_sum(polar_img)))
 
-            # Grab the new image
-            polar_img = iviewer.img
-            if HexrdConfig().polar_apply_scaling_to_lineout:
-                # Apply the transform
-                polar_img = self.transform(polar_img)
+                # The progress must be updated in the GUI thread. Otherwise,
+                # it will crash on Mac.
+                self._update_waterfall_plot_progress.emit()
 
-            # Invalidate any skipped detectors
-            polar_img = self._invalidate_skipped_detectors(polar_img)
+            return results
 
-            # Compute the integration
-            lineouts[i] = self._compute_azimuthal_integral_sum(polar_img)
+        with ThreadPoolExecutor(max_workers=max_workers) as tp:
+            futures = [tp.submit(compute_chunk, chunk) for chunk in chunks]
 
-            # The progress must be updated in the GUI thread. Otherwise,
-            # it will crash on Mac.
-            self._update_waterfall_plot_progress.emit()
+        for f in futures:
+            for i, lineout in f.result():
+                lineouts[i] = lineout
 
         return lineouts
 
@@ -2438,7 +2742,7 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
                             mask.data,
                             apply_tth_distortion=apply_tth_distortion,
                         )
-                        contours = measure.find_contours(~polar_mask)
+                        contours = measure.find_contours(~polar_mask.dense())
                         verts = []
                         for contour in contours:
                             rows, cols = contour[:, 0], contour[:, 1]
@@ -2556,7 +2860,7 @@ class ImageCanvas(InteractiveCanvasMixin, FigureCanvas):
                 mask.data,
                 apply_tth_distortion=apply_tth_distortion,
             )
-            combined_mask &= polar_mask
+            polar_mask.apply_to(combined_mask)
 
         masked_pixels = ~combined_mask
         if not masked_pixels.any():
@@ -2703,6 +3007,29 @@ class PolarXAxisFormatter(FuncFormatter):
         super().set_locs(locs)  # type: ignore[arg-type]
 
 
+def collection_style(style: dict) -> dict:
+    # Convert a Line2D style, such as {'c': 'r', 'ls': 'dotted'}, into
+    # one that may be used for a LineCollection.
+    return {'color' if k == 'c' else k: v for k, v in style.items()}
+
+
+def _segments_equal(a: list | None, b: list) -> bool:
+    # Whether two lists of line segments are the same
+    if a is None or len(a) != len(b):
+        return False
+
+    for x, y in zip(a, b):
+        if x is y:
+            continue
+
+        x = np.asarray(x)
+        y = np.asarray(y)
+        if x.shape != y.shape or not np.array_equal(x, y, equal_nan=True):
+            return False
+
+    return True
+
+
 def transform_from_plain_cartesian_func(mode: str) -> Callable:
     # Get a function to transform from plain cartesian coordinates
     # to whatever type of view we are in.
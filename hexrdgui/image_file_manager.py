@@ -12,6 +12,11 @@ from hexrdgui import constants
 from hexrdgui.hexrd_config import HexrdConfig
 from hexrdgui.load_hdf5_dialog import LoadHDF5Dialog
 from hexrdgui.singletons import Singleton
+from hexrdgui.utils.imageseries import (
+    memmap_hdf5_dataset,
+    open_array_view_imageseries,
+    open_hdf5_imageseries,
+)
 
 
 class ImageFileManager(metaclass=Singleton):
@@ -169,12 +174,18 @@ class ImageFileManager(metaclass=Singleton):
                     ndim = dset.ndim
                     if ndim < 3:
                         # Handle raw two dimesional data
-                        ims = imageseries.open(None, 'array', data=dset[()])
+                        array = memmap_hdf5_dataset(dset)
+                        if array is None:
+                            array = dset[()]
+                        ims = open_array_view_imageseries(array)
 
             if regular_hdf5 and ndim >= 3:
-                ims = imageseries.open(
-                    f, 'hdf5', path=self.path[0], dataname=self.path[1]
+                ims = open_hdf5_imageseries(
+                    f, path=self.path[0], dataname=self.path[1]
                 )
+        elif ext == '.npy':
+            # Memory-map the array so frames are only read when needed
+            ims = open_array_view_imageseries(np.load(f, mmap_mode='r'))
         elif ext == '.npz':
             ims = imageseries.open(f, 'frame-cache', style='npz')
         elif ext == '.fch5':
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import functools
+import math
 import os
+import threading
 import time
 import glob
 from concurrent.futures import ThreadPoolExecutor, Future
@@ -41,6 +43,11 @@ from hexrdgui.constants import (
 )
 from hexrdgui.singletons import QSingleton
 
+# Upper limit on the memory of the frames read at once when computing
+# medians, shared by all of the imageseries whose medians are computed
+# together. Larger imageseries are read in several passes over their rows.
+MEDIAN_PASS_MAX_BYTES = 1024**3
+
 
 class NoEmptyFramesException(Exception):
     pass
@@ -275,8 +282,8 @@ class ImageLoadManager(QObject, metaclass=QSingleton):
 
     def get_dark_aggr_op(self, ims: Any, idx: int) -> tuple:
         """
-        Returns a tuple of the form (function, frames), where func is the
-        function to be applied and frames is the number of frames to aggregate.
+        Returns a tuple of the form (op, frames, ims), where op is the
+        aggregation to perform and frames is the number of frames to aggregate.
         """
 
         i = self.data['idx'] if 'idx' in self.data else idx
@@ -286,27 +293,28 @@ class ImageLoadManager(QObject, metaclass=QSingleton):
 
         # Create or load the dark image if selected
         frames = len(ims)
-        if dark_idx != UI_DARK_INDEX_FILE and frames > 120:
-            frames = 120
+        max_frames = HexrdConfig().max_dark_frames
+        if dark_idx != UI_DARK_INDEX_FILE and frames > max_frames:
+            frames = max_frames
 
         if dark_idx == UI_DARK_INDEX_MEDIAN:
-            f = imageseries.stats.median_iter
+            op = 'median'
         elif dark_idx == UI_DARK_INDEX_EMPTY_FRAMES:
-            f = imageseries.stats.average_iter
+            op = 'average'
             frames = self.empty_frames
         elif dark_idx == UI_DARK_INDEX_AVERAGE:
-            f = imageseries.stats.average_iter
+            op = 'average'
         elif dark_idx == UI_DARK_INDEX_MAXIMUM:
-            f = imageseries.stats.max_iter
+            op = 'max'
         else:
-            f = imageseries.stats.median_iter
+            op = 'median'
 
-        return (f, frames, ims)
+        return (op, frames, ims)
 
     def get_dark_aggr_ops(self, ims_dict: dict) -> dict:
         """
-        Returns a dict of tuples of the form (function, frames), where func is the
-        function to be applied and frames is the number of frames to aggregate.
+        Returns a dict of tuples of the form (op, frames, ims), where op is the
+        aggregation to perform and frames is the number of frames to aggregate.
         The key is the detector name.
         """
         ops = {}
@@ -339,7 +347,7 @@ class ImageLoadManager(QObject, metaclass=QSingleton):
         dark_images = {}
         if dark_aggr_ops:
             self.update_progress_text('Aggregating dark images...')
-            dark_images = self.aggregate_dark_multithread(dark_aggr_ops)
+            dark_images = self.aggregate_multithread(dark_aggr_ops)
 
         # Apply the operations to the imageseries
         for idx, key in enumerate(ims_dict.keys()):
@@ -370,6 +378,8 @@ class ImageLoadManager(QObject, metaclass=QSingleton):
             det_conf['pixels']['columns'] = ims_dict[key].shape[1]
             det_conf['pixels']['rows'] = ims_dict[key].shape[0]
 
+        HexrdConfig().bump_instrument_generation()
+
         self.images_transformed.emit()
 
     def display_aggregation(self, ims_dict: dict) -> None:
@@ -381,17 +391,14 @@ class ImageLoadManager(QObject, metaclass=QSingleton):
         HexrdConfig().current_imageseries_idx = 0
 
         if self.state['agg'] == UI_AGG_INDEX_MAXIMUM:
-            agg_func = imageseries.stats.max_iter
+            op = 'max'
         elif self.state['agg'] == UI_AGG_INDEX_MEDIAN:
-            agg_func = imageseries.stats.median_iter
+            op = 'median'
         else:
-            agg_func = imageseries.stats.average_iter
-
-        f = functools.partial(self.aggregate_images, agg_func=agg_func)
+            op = 'average'
 
-        for key, aggr_img in zip(
-            ims_dict.keys(), self.aggregate_images_multithread(f, ims_dict)
-        ):
+        aggr_op_dict = {key: (op, 0, ims) for key, ims in ims_dict.items()}
+        for key, aggr_img in self.aggregate_multithread(aggr_op_dict).items():
             ims_dict[key] = ImageFileManager().open_file(aggr_img)
 
     def add_omega_metadata(self, ims_dict: dict, data: Any = None) -> None:
@@ -486,38 +493,6 @@ class ImageLoadManager(QObject, metaclass=QSingleton):
     def update_progress_text(self, text: str) -> None:
         self.progress_text.emit(text)
 
-    def calculate_nchunk(self, num_ims: int, frames: int) -> int:
-        """
-        Calculate the number of chunks
-
-         :param num_ims: The number of image series.
-         :param frames: The number of frames being processed.
-        """
-        step = int(frames * num_ims / 100)
-        step = step if step > 2 else 2
-        nchunk = int(frames / step)
-        if nchunk > frames or nchunk < 1:
-            # One last sanity check
-            nchunk = frames
-
-        return nchunk
-
-    def aggregate_images(
-        self,
-        key: str,
-        ims: Any,
-        agg_func: Callable[..., np.ndarray],
-        progress_dict: dict,
-    ) -> list:
-        frames = len(ims)
-        num_ims = len(progress_dict)
-        nchunk = self.calculate_nchunk(num_ims, frames)
-
-        for i, img in enumerate(agg_func(ims, nchunk)):
-            progress_dict[key] = (i + 1) / nchunk
-
-        return [img]
-
     def wait_with_progress(self, futures: list[Future], progress_dict: dict) -> None:
         """
         Wait for futures to be resolved and update progress using the progress
@@ -531,76 +506,200 @@ class ImageLoadManager(QObject, metaclass=QSingleton):
             self.update_progress(orig_progress + progress)
             time.sleep(0.1)
 
-    def aggregate_images_multithread(
-        self,
-        f: Callable[..., Any],
-        ims_dict: dict,
-    ) -> list:
-        """
-        Use ThreadPoolExecutor to aggregate images
-
-        :param f: The aggregation function
-        :param ims_dict: The imageseries to aggregate
+    def aggregate_multithread(self, aggr_op_dict: dict) -> dict:
         """
-        max_workers = HexrdConfig().max_cpus
-
-        futures = []
-        progress_dict = {key: 0.0 for key in ims_dict.keys()}
-        with ThreadPoolExecutor(max_workers=max_workers) as tp:
-            for key, ims in ims_dict.items():
-                futures.append(tp.submit(f, key, ims, progress_dict=progress_dict))
+        Use ThreadPoolExecutor to aggregate frames. Returns a dict mapping
+        the detector name to the aggregated image.
 
-            self.wait_with_progress(futures, progress_dict)
-
-        return [f.result() for f in futures]
-
-    def aggregate_dark(
-        self,
-        key: str,
-        func: Callable[..., np.ndarray],
-        ims: Any,
-        frames: int,
-        progress_dict: dict,
-    ) -> tuple:
-        """
-        Generate aggregated dark image.
-
-        :param key: The detector
-        :param func: The aggregation function
-        :param ims: The imageseries
-        :param frames: The number of frames to use
-        :param progress_dict: Dict for progress reporting
-        """
-        nchunk = self.calculate_nchunk(len(HexrdConfig().imageseries_dict), frames)
-
-        for i, darkimg in enumerate(func(ims, nchunk, nframes=frames)):
-            progress_dict[key] = (i + 1) / nchunk
-
-        return (key, darkimg)
-
-    def aggregate_dark_multithread(self, aggr_op_dict: dict) -> dict:
-        """
-        Use ThreadPoolExecutor to dark aggregation. Returns a dict mapping the
-        detector name to dark image.
+        See `aggregate_imageseries()` for the details.
 
         :param aggr_op_dict: A dict mapping the detector name to a
-                            tuple of the form (func, frames, ims),
-                            where func is the function to use to do
-                            the aggregation, frames is number of
-                            images to aggregate, and ims is the
-                            image series to perform the aggregation
-                            on.
+                            tuple of the form (op, frames, ims),
+                            where op is the aggregation to perform
+                            ('max', 'average', or 'median'), frames is
+                            the number of images to aggregate (0 for all
+                            of them), and ims is the image series to
+                            perform the aggregation on.
         """
-        max_workers = HexrdConfig().max_cpus
-
-        futures = []
-        progress_dict = {key: 0.0 for key in aggr_op_dict.keys()}
-        with ThreadPoolExecutor(max_workers=max_workers) as tp:
-            for key, (op, frames, ims) in aggr_op_dict.items():
-                futures.append(
-                    tp.submit(self.aggregate_dark, key, op, ims, frames, progress_dict)
-                )
-
-            self.wait_with_progress(futures, progress_dict)
-
-        return {f.result()[0]: f.result()[1] for f in futures}
+        max_workers = HexrdConfig().max_cpus or os.cpu_count() or 1
+        return aggregate_imageseries(aggr_op_dict, max_workers, self.wait_with_progress)
+
+
+def aggregate_imageseries(
+    aggr_op_dict: dict,
+    max_workers: int,
+    wait_with_progress: Callable[[list[Future], dict], None] | None = None,
+) -> dict:
+    """
+    Aggregate the frames of several imageseries. Returns a dict mapping
+    the keys of `aggr_op_dict` to the aggregated images.
+
+    The work is split within each imageseries as well as across them.
+    Maximum and average are computed over chunks of frames and then
+    combined. For the median, each frame is read once (see
+    `_median_of_frames()`), and the median is computed over blocks of rows
+    in parallel. Both are exact.
+
+    The imageseries are not necessarily thread-safe, so the frames of each
+    one are read one at a time. The memory used for the medians is limited
+    by MEDIAN_PASS_MAX_BYTES in total, not per imageseries.
+
+    If provided, `wait_with_progress(futures, progress_dict)` is called to
+    wait for the work to finish. The progress dict maps each key to the
+    fraction of its frames that have actually been read.
+    """
+    progress_dict = {key: 0.0 for key in aggr_op_dict.keys()}
+    progress_lock = threading.Lock()
+
+    def make_progress_callback(key: str, total: int) -> Callable[[int], None]:
+        def callback(n: int) -> None:
+            with progress_lock:
+                progress_dict[key] += n / total
+
+        return callback
+
+    # One read lock per imageseries
+    read_locks: dict[int, threading.Lock] = {}
+    for _, _, ims in aggr_op_dict.values():
+        read_locks.setdefault(id(ims), threading.Lock())
+
+    # The median budget is shared by all of the medians, which may be
+    # computed at the same time.
+    num_medians = sum(op == 'median' for op, _, _ in aggr_op_dict.values())
+    median_max_bytes = MEDIAN_PASS_MAX_BYTES // max(num_medians, 1)
+
+    tasks = {}
+    # The medians are computed in their own pool, so that the tasks
+    # reading the frames never wait on work queued behind them.
+    with (
+        ThreadPoolExecutor(max_workers=max_workers) as tp,
+        ThreadPoolExecutor(max_workers=max_workers) as median_tp,
+    ):
+        for key, (op, frames, ims) in aggr_op_dict.items():
+            read_lock = read_locks[id(ims)]
+            nframes = len(ims) if frames <= 0 else min(frames, len(ims))
+            if op == 'median':
+                passes = _median_row_passes(ims, nframes, median_max_bytes)
+                callback = make_progress_callback(key, nframes * len(passes))
+                futures = [
+                    tp.submit(
+                        _median_of_frames,
+                        ims,
+                        read_lock,
+                        nframes,
+                        passes,
+                        median_tp,
+                        max_workers,
+                        callback,
+                    )
+                ]
+            else:
+                callback = make_progress_callback(key, nframes)
+                futures = [
+                    tp.submit(_reduce_frames, ims, read_lock, op, frames, callback)
+                    for frames in _frame_chunks(nframes, max_workers)
+                ]
+            tasks[key] = (op, nframes, futures)
+
+        all_futures = [f for _, _, futures in tasks.values() for f in futures]
+        if wait_with_progress is not None:
+            wait_with_progress(all_futures, progress_dict)
+
+    results = {}
+    for key, (op, nframes, futures) in tasks.items():
+        partials = [f.result() for f in futures]
+        if op == 'median':
+            results[key] = partials[0]
+        elif op == 'max':
+            results[key] = functools.reduce(np.maximum, partials)
+        else:
+            results[key] = functools.reduce(np.add, partials) / nframes
+
+    return results
+
+
+def _frame_chunks(nframes: int, max_workers: int) -> list[range]:
+    # A few chunks per worker so the work stays balanced
+    chunk_size = max(1, math.ceil(nframes / (4 * max_workers)))
+    return [
+        range(i, min(i + chunk_size, nframes)) for i in range(0, nframes, chunk_size)
+    ]
+
+
+def _reduce_frames(
+    ims: Any,
+    read_lock: threading.Lock,
+    op: str,
+    frames: range,
+    progress_callback: Callable[[int], None],
+) -> np.ndarray:
+    # Compute the maximum, or the sum for an average, of some frames.
+    # Only the reads are serialized.
+    result = None
+    for i in frames:
+        with read_lock:
+            img = ims[i]
+
+        if result is None:
+            result = img.astype(float) if op == 'average' else img.copy()
+        elif op == 'max':
+            np.maximum(result, img, out=result)
+        else:
+            result += img
+
+        progress_callback(1)
+
+    assert result is not None
+    return result
+
+
+def _row_blocks(rows: slice, nblocks: int) -> list[slice]:
+    # Split a range of rows into at most `nblocks` contiguous blocks
+    nblocks = max(1, min(nblocks, rows.stop - rows.start))
+    bounds = np.linspace(rows.start, rows.stop, nblocks + 1).astype(int)
+    return [slice(bounds[i], bounds[i + 1]) for i in range(nblocks)]
+
+
+def _median_row_passes(ims: Any, nframes: int, max_bytes: int) -> list[slice]:
+    # Read all of the rows in one pass, unless that exceeds the memory limit.
+    # `np.median()` works on a copy of the frames, so count them twice.
+    nrows, ncols = ims.shape
+    itemsize = np.dtype(ims.dtype).itemsize
+    total_bytes = 2 * nframes * nrows * ncols * itemsize
+    npasses = math.ceil(total_bytes / max_bytes)
+    return _row_blocks(slice(0, nrows), npasses)
+
+
+def _median_of_frames(
+    ims: Any,
+    read_lock: threading.Lock,
+    nframes: int,
+    passes: list[slice],
+    median_tp: ThreadPoolExecutor,
+    max_workers: int,
+    progress_callback: Callable[[int], None],
+) -> np.ndarray:
+    # Compute the median of the frames. Each frame is read and decoded
+    # once per pass, and there is only one pass unless the frames do not
+    # fit within the memory budget. The rows read in a pass are split
+    # into blocks, whose medians are computed in parallel.
+    nrows, ncols = ims.shape
+    result = np.empty((nrows, ncols), dtype=float)
+    for rows in passes:
+        block = np.empty((nframes, rows.stop - rows.start, ncols), ims.dtype)
+        for i in range(nframes):
+            with read_lock:
+                block[i] = ims[i][rows]
+
+            progress_callback(1)
+
+        # The blocks are relative to the rows of this pass
+        out = result[rows]
+        futures = [
+            median_tp.submit(np.median, block[:, sub], axis=0, out=out[sub])
+            for sub in _row_blocks(slice(0, len(out)), max_workers)
+        ]
+        for f in futures:
+            f.result()
+
+    return result
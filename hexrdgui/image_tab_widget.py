@@ -8,6 +8,7 @@ from PySide6.QtWidgets import QMessageBox, QTabWidget, QHBoxLayout, QWidget
 import numpy as np
 
 from hexrdgui.constants import PAN, ViewType, ZOOM
+from hexrdgui.frame_cache import FrameCache
 from hexrdgui.hexrd_config import HexrdConfig
 from hexrdgui.image_canvas import ImageCanvas
 from hexrdgui.image_series_toolbar import (
@@ -202,6 +203,10 @@ class ImageTabWidget(QTabWidget):
         else:
             self.update_needed.emit()
 
+        # Read the neighboring frames in the background, so that the next
+        # steps through the imageseries do not have to wait for them.
+        FrameCache().prefetch(list(HexrdConfig().imageseries_dict.values()), pos)
+
         is_aggregated = HexrdConfig().is_aggregated
         has_omegas = HexrdConfig().has_omegas
         if is_aggregated or not has_omegas:
@@ -212,7 +217,9 @@ class ImageTabWidget(QTabWidget):
         # so that on an image series index change, the data does not have to
         # be re-generated, only the overlay needs to be redrawn.
         for overlay in HexrdConfig().overlays:
-            redraw = overlay.is_rotation_series and overlay.aggregated is False
+            redraw = (
+                overlay.is_rotation_series or overlay.is_multi_grain
+            ) and overlay.aggregated is False
             if redraw:
                 for canvas in self.active_canvases:
                     canvas.redraw_overlay(overlay)
@@ -602,13 +609,11 @@ class ImageTabWidget(QTabWidget):
 
                 mask_arr = mask.get_masked_arrays(mode, instr)  # type: ignore[call-arg]
                 if mode == ViewType.raw:
-                    mask_arr = [x[1] for x in mask_arr if x[0] == det_key]
-                    if mask_arr:
-                        mask_arr = np.logical_and.reduce(mask_arr)
-                    else:
-                        mask_arr = None
+                    mask_arrs = [x[1] for x in mask_arr if x[0] == det_key]
+                else:
+                    mask_arrs = [mask_arr]
 
-                if mask_arr is not None and not mask_arr[i, j]:
+                if any(not x[i, j] for x in mask_arrs):
                     if mask.name is not None:
                         hovered_masks.append(mask.name)
 
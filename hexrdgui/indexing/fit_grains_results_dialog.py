@@ -368,6 +368,7 @@ class FitGrainsResultsDialog(QObject):
         )
         self.ui.export_workflow.clicked.connect(self.on_export_workflow_clicked)
         self.ui.spot_diagnostics.clicked.connect(self.show_spot_diagnostics)
+        self.ui.add_grains_overlay.clicked.connect(self.add_grains_overlay)
 
         for name in ('x', 'y', 'z'):
             action = getattr(self, f'set_view_{name}')
@@ -750,6 +751,19 @@ class FitGrainsResultsDialog(QObject):
         )
         self._spot_diagnostics_dialog.show()
 
+    def add_grains_overlay(self) -> None:
+        if self.material is None:
+            msg = 'A material is required to add a grains overlay'
+            QMessageBox.critical(self.ui, 'HEXRD', msg)
+            return
+
+        HexrdConfig().append_overlay(
+            self.material.name,
+            constants.OverlayType.multi_grain,
+            grains_table=self.data_model.full_grains_table,
+        )
+        HexrdConfig().update_overlay_manager.emit()
+
     def on_grains_table_modified(self) -> None:
         # Update our grains table
         self.data = self.data_model.full_grains_table
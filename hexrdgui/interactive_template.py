@@ -270,6 +270,9 @@ class InteractiveTemplate:
             r = r[~np.isnan(r)]
             mask = ~polygon_to_mask(np.vstack([c, r]).T, self.img.shape)
             master_mask = np.logical_xor(master_mask, mask)
+        if not self.img.flags.writeable:
+            # Need to make a copy
+            self.img = self.img.copy()
         self.img[~master_mask] = 0
         return master_mask
 
@@ -1229,6 +1229,8 @@ class LLNLImportToolDialog(QObject):
             det_config = HexrdConfig().config['instrument']['detectors'][det]
             det_config['buffer'] = self.edited_images[det]['panel_buffer']
 
+        HexrdConfig().bump_instrument_generation()
+
         HexrdConfig().recent_images = list(self.loaded_images.values())
 
         self.close_widget()
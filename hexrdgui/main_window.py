@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from functools import partial
+import gc
 import os
 from pathlib import Path
 import shutil
@@ -35,6 +36,7 @@ from hexrdgui.create_hedm_instrument import create_hedm_instrument
 from hexrdgui.color_map_editor import ColorMapEditor
 from hexrdgui.config_dialog import ConfigDialog
 from hexrdgui.edit_colormap_list_dialog import EditColormapListDialog
+from hexrdgui.frame_cache import FrameCache
 from hexrdgui.masking.constants import MaskType
 from hexrdgui.masking.mask_manager import MaskManager
 from hexrdgui.median_filter_dialog import MedianFilterDialog
@@ -1578,8 +1580,18 @@ class MainWindow(QObject):
             state.save(h5_file)
 
         if overwriting_last_loaded:
-            # Clear the imageseries dict so that the files get closed
+            # Drop every imageseries so that the files get closed.
+            # Cached frames may be memory-mapped from the files as well.
+            # Frames read from a memory map are copies, so the images
+            # shown on the canvas do not keep the files open.
             HexrdConfig().imageseries_dict.clear()
+            HexrdConfig().unaggregated_images = None
+            FrameCache().clear()
+
+            # Release the memory maps before moving over the file. They
+            # may be in reference cycles, and Windows refuses to replace
+            # a file that is still mapped.
+            gc.collect()
 
             # Move the save file to the selected file
             shutil.move(save_file, selected_file)
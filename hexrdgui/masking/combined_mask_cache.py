@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import numpy as np
+
+from hexrdgui.masking.sparse_mask import SparseMask
+
+
+class CombinedMaskCache:
+    """Cache the union of several masks, for each of several kinds
+
+    A kind is any key, such as 'visible' or 'boundary' for the polar view,
+    or a detector name for the raw view. The union of each kind is stored
+    along with its grid key, which says what the masks were made for (for
+    example, the polar grid), and with the sparse masks it was built from.
+
+    Each mask caches its own sparse mask, and replaces it when the mask is
+    invalidated, so comparing the sparse masks by identity tells us which
+    masks were added, removed, toggled, or modified since the union was
+    last built. Additions are ORed into the union. Removals rebuild the
+    union from the remaining masks' cached sparse masks. Nothing is
+    re-rasterized, so changing frames reuses the union as-is.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[Any, dict[str, Any]] = {}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get(
+        self,
+        kind: Any,
+        grid_key: Any,
+        shape: tuple[int, int],
+        mask_arrays: dict[str, SparseMask],
+    ) -> np.ndarray:
+        """Get the union of the masked regions of `mask_arrays`
+
+        `mask_arrays` maps mask names to sparse masks. The returned
+        dense array is True where any of them is masked. It is shared, and
+        must not be modified.
+        """
+        with self._lock:
+            entry = self._entries.get(kind)
+            if entry is None or entry['grid_key'] != grid_key:
+                entry = {
+                    'grid_key': grid_key,
+                    'members': {},
+                    'total': np.zeros(shape, dtype=bool),
+                }
+                self._entries[kind] = entry
+
+            members = entry['members']
+            removed = [
+                k for k, v in members.items() if mask_arrays.get(k) is not v
+            ]
+            added = {
+                k: v for k, v in mask_arrays.items() if members.get(k) is not v
+            }
+            if not removed and not added:
+                return entry['total']
+
+            if removed:
+                # An OR cannot be undone, so rebuild from the cached arrays
+                # of the masks that are left.
+                for k in removed:
+                    del members[k]
+                added.update(members)
+                members.clear()
+                total = np.zeros(shape, dtype=bool)
+            else:
+                total = entry['total'].copy()
+
+            for k, v in added.items():
+                v.burn_into(total)
+                members[k] = v
+
+            total.flags.writeable = False
+            entry['total'] = total
+            return total
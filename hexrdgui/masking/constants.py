@@ -9,6 +9,9 @@ class MaskType:
 
 CURRENT_MASK_VERSION = 2
 
+# Number of per-frame threshold masks kept in memory for each detector
+THRESHOLD_MASK_CACHE_SIZE = 16
+
 
 class MaskStatus:
     none = 0
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+import threading
 from typing import Any
 
 import numpy as np
@@ -7,34 +9,97 @@ import numpy as np
 from skimage import measure
 
 from hexrdgui.create_hedm_instrument import create_hedm_instrument
+from hexrdgui.frame_cache import FrameCache
 from hexrdgui.hexrd_config import HexrdConfig
+from hexrdgui.masking.constants import THRESHOLD_MASK_CACHE_SIZE
 from hexrdgui.utils import (
     add_sample_points,
     remove_duplicate_neighbors,
 )
 from hexrdgui.utils.conversions import angles_to_pixels
-from hexrdgui.utils.polygon import polygon_to_mask
+from hexrdgui.masking.sparse_mask import SparseMask
+from hexrdgui.utils.polygon import polygons_bbox, polygons_to_bitmap
 from hexrdgui.utils.tth_distortion import apply_tth_distortion_if_needed
 
 
+class ThresholdMaskSeries:
+    """The threshold masks of a detector's imageseries, one per frame
+
+    Masks are only computed when a frame is requested, and the most
+    recently requested frames are kept in a bounded cache. Indexing
+    works like the list of masks that used to be created eagerly.
+
+    If `values` is None, every frame's mask is all True. These masks are
+    read-only, and shared between frames.
+    """
+
+    def __init__(
+        self,
+        det: str,
+        values: list[float] | None,
+        cache_size: int = THRESHOLD_MASK_CACHE_SIZE,
+    ) -> None:
+        self.det = det
+        self.values = values
+        self.cache_size = cache_size
+        self._cache: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._cache_ims: Any = None
+        self._all_true: np.ndarray | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def ims(self) -> Any:
+        ims = HexrdConfig().imageseries(self.det)
+        assert ims is not None
+        return ims
+
+    def __len__(self) -> int:
+        return len(self.ims)
+
+    def __getitem__(self, idx: int) -> np.ndarray:
+        ims = self.ims
+        if idx < 0:
+            idx += len(ims)
+
+        if self.values is None:
+            return self._all_true_mask(ims.shape)
+
+        with self._lock:
+            if ims is not self._cache_ims:
+                # The images were replaced. Throw away the old masks.
+                self._cache.clear()
+                self._cache_ims = ims
+
+            if idx in self._cache:
+                self._cache.move_to_end(idx)
+                return self._cache[idx]
+
+        mask = create_threshold_mask(FrameCache().get(ims, idx), self.values)
+
+        with self._lock:
+            self._cache[idx] = mask
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return mask
+
+    def _all_true_mask(self, shape: tuple[int, ...]) -> np.ndarray:
+        with self._lock:
+            if self._all_true is None or self._all_true.shape != shape:
+                self._all_true = np.ones(shape, dtype=np.bool_)
+                self._all_true.flags.writeable = False
+
+            return self._all_true
+
+
 def recompute_raw_threshold_mask() -> dict:
     from hexrdgui.masking.mask_manager import MaskManager
 
     results = {}
     if tm := MaskManager().threshold_mask:
         for det in HexrdConfig().detector_names:
-            ims = HexrdConfig().imageseries(det)
-            assert ims is not None
-            if tm.visible:
-                mask_list: list[np.ndarray | None] = [None for i in range(len(ims))]
-                for idx in range(len(ims)):
-                    img = HexrdConfig().image(det, idx)
-                    mask = create_threshold_mask(img, tm.data)
-                    mask_list[idx] = mask
-                masks: Any = mask_list
-            else:
-                masks = np.ones(ims.shape, dtype=np.bool_)
-            results[det] = masks
+            values = tm.data if tm.visible else None
+            results[det] = ThresholdMaskSeries(det, values)
     return results
 
 
@@ -91,9 +156,20 @@ def convert_polar_to_raw(line_data: Any, reverse_tth_distortion: bool = True) ->
             # We will create a higher resolution shape so that we
             # can keep resolution from the mask coordinates
             res = 2
-            mask_shape = np.array(panel.shape) * res
+            mask_shape = tuple(np.array(panel.shape) * res)
+            polygon = raw * res
+
+            # Only rasterize (and find contours in) the region around the
+            # polygon. It is grown by a pixel so that the contours match
+            # those of the full mask.
+            r0, r1, c0, c1 = polygons_bbox([polygon], mask_shape)
+            if r0 >= r1 or c0 >= c1:
+                # The mask did not affect this panel.
+                continue
 
-            mask = ~polygon_to_mask(raw * res, tuple(mask_shape))
+            r0, c0 = max(r0 - 1, 0), max(c0 - 1, 0)
+            r1, c1 = min(r1 + 1, mask_shape[0]), min(c1 + 1, mask_shape[1])
+            mask = polygons_to_bitmap([polygon], (r0, r1, c0, c1))
             if not mask.any():
                 # The mask did not affect this panel.
                 continue
@@ -101,6 +177,9 @@ def convert_polar_to_raw(line_data: Any, reverse_tth_distortion: bool = True) ->
             # Add borders so that border coordinates are kept.
             contours = measure.find_contours(np.pad(mask, 1))
             for contour in contours:
+                # Move the contour from the region back into the full mask
+                contour = contour + (r0, c0)
+
                 # Add 0.5 so all coordinates will be positive before rescaling,
                 # then remove that 0.5 again afterward.
                 contour = ((contour[:, [1, 0]] - 1) + 0.5) / res - 0.5
@@ -118,17 +197,16 @@ def convert_polar_to_raw(line_data: Any, reverse_tth_distortion: bool = True) ->
     return raw_line_data
 
 
-def create_raw_mask(line_data: Any) -> list:
+def create_raw_mask(line_data: Any) -> list[tuple[str, SparseMask]]:
     masks = []
     for det in HexrdConfig().detector_names:
         det_lines = [line for line in line_data if det == line[0]]
         img = HexrdConfig().image(det, 0)
         assert img is not None
-        final_mask = np.ones(img.shape, dtype=bool)
-        for _, data in det_lines:
-            mask = polygon_to_mask(data, img.shape)
-            final_mask = np.logical_and(final_mask, mask)
-        masks.append((det, final_mask))
+        # Rasterize all of the polygons on this detector at once. Only the
+        # bounding box of the polygons is kept.
+        polygons = [data for _, data in det_lines]
+        masks.append((det, SparseMask.from_polygons(polygons, img.shape)))
     return masks
 
 
@@ -20,6 +20,8 @@ from hexrdgui.masking.create_raw_mask import (
 )
 from hexrdgui.hexrd_config import HexrdConfig
 from hexrdgui.masking.mask_compatibility import load_masks
+from hexrdgui.masking.combined_mask_cache import CombinedMaskCache
+from hexrdgui.masking.sparse_mask import SparseMask
 from hexrdgui.singletons import QSingleton
 from hexrdgui.utils import unique_name
 
@@ -181,11 +183,12 @@ class RegionMask(Mask):
         else:
             # Do not apply tth distortion for pinhole mask types
             apply_tth_distortion = self.type != MaskType.pinhole
-            self.masked_arrays = create_polar_mask_from_raw(
+            polar_mask = create_polar_mask_from_raw(
                 self._raw,
                 instr,
                 apply_tth_distortion=apply_tth_distortion,
             )
+            self.masked_arrays = SparseMask.from_dense(polar_mask)
 
     def get_masked_arrays(
         self,
@@ -335,6 +338,10 @@ class MaskManager(QObject, metaclass=QSingleton):
         self.highlight_opacity = 0.5
         self.boundary_style = 'dashed'
         self.boundary_width = 1
+        # The union of the visible and boundary masks in polar space
+        self.polar_mask_cache = CombinedMaskCache()
+        # The union of the region masks applied to each detector
+        self.raw_mask_cache = CombinedMaskCache()
         self.setup_connections()
 
     @property
@@ -519,6 +526,8 @@ class MaskManager(QObject, metaclass=QSingleton):
 
     def load_state(self, h5py_group: h5py.Group) -> None:
         self.masks = {}
+        self.polar_mask_cache.clear()
+        self.raw_mask_cache.clear()
         if 'masks' in h5py_group:
             self.load_masks(h5py_group['masks'])
         if self.view_mode is None:
@@ -581,10 +590,13 @@ class MaskManager(QObject, metaclass=QSingleton):
                     mask = np.logical_or(mask, buffer_value)
             detector_config['buffer'] = mask
 
+        HexrdConfig().bump_instrument_generation()
         HexrdConfig().rerender_needed.emit()
 
     def clear_all(self) -> None:
         self.masks.clear()
+        self.polar_mask_cache.clear()
+        self.raw_mask_cache.clear()
 
     def apply_masks_to_panel_buffers(self, instr: HEDMInstrument) -> None:
         # Apply raw masks to the panel buffers on the passed instrument
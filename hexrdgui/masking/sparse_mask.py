@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+from hexrdgui.utils.polygon import polygons_bbox, polygons_to_bitmap
+
+
+class SparseMask:
+    """A mask stored as a bounding box and a bitmap of the region inside it
+
+    Masks are usually small compared to the image they apply to, so only
+    the bounding box of the masked pixels is stored. `bitmap` is True where
+    pixels are masked.
+
+    To match the dense masks used elsewhere, indexing returns True where
+    pixels are *not* masked, and `dense()` returns an array that is False
+    where pixels are masked. Densifying should be left to the point where
+    the mask is applied to an image.
+    """
+
+    def __init__(
+        self,
+        shape: tuple[int, int],
+        bbox: tuple[int, int, int, int] = (0, 0, 0, 0),
+        bitmap: np.ndarray | None = None,
+    ) -> None:
+        r0, r1, c0, c1 = bbox
+        if bitmap is None:
+            bitmap = np.zeros((r1 - r0, c1 - c0), dtype=bool)
+
+        self.shape = tuple(shape)
+        self.bbox = tuple(bbox)
+        self.bitmap = bitmap
+
+    @classmethod
+    def from_dense(cls, unmasked: np.ndarray) -> SparseMask:
+        """Create from a dense array that is False where pixels are masked"""
+        masked = ~np.asarray(unmasked, dtype=bool)
+        rows = np.flatnonzero(masked.any(axis=1))
+        if rows.size == 0:
+            return cls(masked.shape)
+
+        cols = np.flatnonzero(masked.any(axis=0))
+        bbox = (rows[0], rows[-1] + 1, cols[0], cols[-1] + 1)
+        bbox = tuple(int(x) for x in bbox)
+        bitmap = masked[bbox[0] : bbox[1], bbox[2] : bbox[3]].copy()
+        return cls(masked.shape, bbox, bitmap)
+
+    @classmethod
+    def from_polygons(
+        cls,
+        polygons: list[np.ndarray],
+        shape: tuple[int, int],
+    ) -> SparseMask:
+        """Rasterize polygons ((x, y) pixel coordinates) into a mask"""
+        bbox = polygons_bbox(polygons, shape)
+        return cls(shape, bbox, polygons_to_bitmap(polygons, bbox))
+
+    @property
+    def nbytes(self) -> int:
+        return self.bitmap.nbytes
+
+    def any(self) -> bool:
+        """Whether any pixels are masked"""
+        return bool(self.bitmap.any())
+
+    def all(self) -> bool:
+        """Whether no pixels are masked (like `dense().all()`)"""
+        return not self.any()
+
+    def dense(self) -> np.ndarray:
+        """Get a dense array that is False where pixels are masked"""
+        return self.apply_to(np.ones(self.shape, dtype=bool))
+
+    def apply_to(self, unmasked: np.ndarray) -> np.ndarray:
+        """Mask pixels in a dense array (False is masked) in place
+
+        The array is returned for convenience.
+        """
+        r0, r1, c0, c1 = self.bbox
+        region = unmasked[r0:r1, c0:c1]
+        np.logical_and(region, ~self.bitmap, out=region)
+        return unmasked
+
+    def burn_into(self, masked: np.ndarray) -> np.ndarray:
+        """Mark pixels in a dense array (True is masked) in place
+
+        The array is returned for convenience.
+        """
+        r0, r1, c0, c1 = self.bbox
+        region = masked[r0:r1, c0:c1]
+        np.logical_or(region, self.bitmap, out=region)
+        return masked
+
+    def __getitem__(self, key: Any) -> Any:
+        # Only (row, col) indexing with integers or integer arrays is
+        # supported. Like the dense masks, this is True where pixels are
+        # not masked.
+        rows, cols = (np.asarray(x) for x in key)
+        rows, cols = np.broadcast_arrays(rows, cols)
+        r0, r1, c0, c1 = self.bbox
+        inside = (rows >= r0) & (rows < r1) & (cols >= c0) & (cols < c1)
+
+        result = np.ones(rows.shape, dtype=bool)
+        result[inside] = ~self.bitmap[rows[inside] - r0, cols[inside] - c0]
+        return result[()]
+
+    def union(self, other: SparseMask) -> SparseMask:
+        """A mask with the pixels masked by either mask"""
+        bbox = _merge_bboxes(self.bbox, other.bbox, max)
+        if bbox is None:
+            return SparseMask(self.shape)
+
+        result = SparseMask(self.shape, bbox)
+        for mask in (self, other):
+            mask._combine_into(result, np.logical_or)
+
+        return result
+
+    def intersection(self, other: SparseMask) -> SparseMask:
+        """A mask with the pixels masked by both masks"""
+        bbox = _merge_bboxes(self.bbox, other.bbox, min)
+        if bbox is None:
+            return SparseMask(self.shape)
+
+        result = SparseMask(self.shape, bbox)
+        result.bitmap[:] = True
+        for mask in (self, other):
+            mask._combine_into(result, np.logical_and)
+
+        return result
+
+    def _combine_into(self, result: SparseMask, op: np.ufunc) -> None:
+        # Combine the bitmap of this mask (where it overlaps the result's
+        # bounding box) into the result's bitmap with `op`.
+        r0, r1, c0, c1 = result.bbox
+        region = self[np.arange(r0, r1)[:, None], np.arange(c0, c1)[None, :]]
+        op(result.bitmap, ~region, out=result.bitmap)
+
+
+def _merge_bboxes(
+    a: tuple[int, ...],
+    b: tuple[int, ...],
+    outer: Any,
+) -> tuple[int, int, int, int] | None:
+    # `outer` is `max` to get the box enclosing both boxes, and `min` for
+    # the overlap of both boxes. Empty boxes are ignored for the enclosing
+    # box. Returns None if the result is empty.
+    inner = min if outer is max else max
+    empty = [x[0] >= x[1] or x[2] >= x[3] for x in (a, b)]
+    if outer is max:
+        if all(empty):
+            return None
+        elif empty[0]:
+            return tuple(b)  # type: ignore[return-value]
+        elif empty[1]:
+            return tuple(a)  # type: ignore[return-value]
+    elif any(empty):
+        return None
+
+    bbox = (
+        inner(a[0], b[0]),
+        outer(a[1], b[1]),
+        inner(a[2], b[2]),
+        outer(a[3], b[3]),
+    )
+    if bbox[0] >= bbox[1] or bbox[2] >= bbox[3]:
+        return None
+
+    return bbox
@@ -60,7 +60,7 @@ class OverlayEditor:
             w = getattr(self.ui, 'blank_tab')
         else:
             # Take advantage of the naming scheme...
-            w = getattr(self.ui, self.type.value + '_tab')
+            w = getattr(self.ui, self.editor_type.value + '_tab')
 
         self.ui.tab_widget.setCurrentWidget(w)
 
@@ -68,6 +68,14 @@ class OverlayEditor:
             self.active_widget.overlay = self.overlay
             self.ui.setMinimumSize(self.active_widget.ui.minimumSize())
 
+    @property
+    def editor_type(self) -> OverlayType | None:
+        if self.type == OverlayType.multi_grain:
+            # Multi-grain overlays use the rotation series editor
+            return OverlayType.rotation_series
+
+        return self.type
+
     @property
     def active_widget(self) -> Any:
         widgets = {
@@ -77,10 +85,11 @@ class OverlayEditor:
             'const_chi': self.const_chi_overlay_editor,
         }
 
-        if self.type is None or self.type.value not in widgets:
+        editor_type = self.editor_type
+        if editor_type is None or editor_type.value not in widgets:
             return None
 
-        return widgets[self.type.value]
+        return widgets[editor_type.value]
 
     def update_active_widget_gui(self) -> None:
         w = self.active_widget
@@ -76,6 +76,7 @@ class OverlayManager(HexrdConfigDisconnectMixin):
             OverlayType.powder: 'Powder',
             OverlayType.laue: 'Laue',
             OverlayType.rotation_series: 'Rotation Series',
+            OverlayType.multi_grain: 'Multi-Grain Rotation Series',
         }
 
         if type not in types:
@@ -187,6 +187,7 @@ class OverlayStylePicker(QObject):
                 OverlayType.laue: self.laue_keys,
                 OverlayType.rotation_series: self.rotation_series_keys,
                 OverlayType.const_chi: self.const_chi_keys,
+                OverlayType.multi_grain: self.rotation_series_keys,
             }
 
         type = self.overlay.type
@@ -241,6 +242,7 @@ class OverlayStylePicker(QObject):
                 OverlayType.laue: self.laue_labels,
                 OverlayType.rotation_series: self.rotation_series_labels,
                 OverlayType.const_chi: self.const_chi_labels,
+                OverlayType.multi_grain: self.rotation_series_labels,
             }
 
         type = self.overlay.type
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Any, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+import os
+from typing import Any, Callable, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from hexrd.instrument import HEDMInstrument
@@ -10,6 +12,7 @@ from hexrdgui.constants import OverlayType
 from . import compatibility
 from .const_chi_overlay import ConstChiOverlay
 from .laue_overlay import LaueOverlay
+from .multi_grain_overlay import MultiGrainOverlay
 from .overlay import Overlay
 from .powder_overlay import PowderOverlay
 from .rotation_series_overlay import RotationSeriesOverlay
@@ -17,6 +20,7 @@ from .rotation_series_overlay import RotationSeriesOverlay
 type_dict = {
     OverlayType.const_chi: ConstChiOverlay,
     OverlayType.laue: LaueOverlay,
+    OverlayType.multi_grain: MultiGrainOverlay,
     OverlayType.powder: PowderOverlay,
     OverlayType.rotation_series: RotationSeriesOverlay,
 }
@@ -113,9 +117,12 @@ def update_overlay_data(instr: HEDMInstrument, display_mode: Any) -> None:
     from hexrdgui.hexrd_config import HexrdConfig
 
     def flag_update(overlay: Any) -> None:
+        # Setting these flags the overlay for an update. If its data was
+        # already generated for this state (for example, when switching
+        # back to a previous view), the cached data is used instead.
         overlay.instrument = instr
         overlay.display_mode = display_mode
-        overlay.update_needed = True
+        overlay.load_cached_data()
 
     # First, if there is a polar tth distortion overlay, make sure
     # that is flagged for updating.
@@ -137,9 +144,61 @@ def update_overlay_data(instr: HEDMInstrument, display_mode: Any) -> None:
         flag_update(overlay)
 
 
+def generate_overlays(
+    overlays: list[Overlay],
+    on_generated: Callable[[int], None] | None = None,
+    max_workers: int | None = None,
+) -> None:
+    """Generate the data of all overlays that need it, concurrently
+
+    `on_generated(i)` is called (from a worker thread) with the index of
+    each overlay in `overlays` whose data was generated. Use
+    `OverlayGenerator` to do this in the background.
+
+    Overlays that modify shared state while generating (those at a custom
+    energy, or with a different x-ray source than the active one) do so on
+    private copies of it (see `Overlay.private_state()`), so
+    all overlays may be generated at the same time.
+    """
+    from hexrdgui.hexrd_config import HexrdConfig
+
+    def generate(i: int) -> None:
+        overlay = overlays[i]
+        if not overlay.update_needed:
+            return
+
+        overlay.data
+        if on_generated is not None:
+            on_generated(i)
+
+    # The polar distortion overlay may be needed to generate the others
+    distortion_overlay = HexrdConfig().polar_tth_distortion_overlay
+    first = [i for i, x in enumerate(overlays) if x is distortion_overlay]
+    for i in first:
+        generate(i)
+
+    rest = [i for i in range(len(overlays)) if i not in first]
+
+    if max_workers is None:
+        max_workers = HexrdConfig().max_cpus or os.cpu_count() or 1
+
+    max_workers = min(max_workers, len(rest))
+    if max_workers < 2:
+        for i in rest:
+            generate(i)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(generate, i) for i in rest]
+        for future in futures:
+            # Raise any exceptions
+            future.result()
+
+
 __all__ = [
     'ConstChiOverlay',
     'LaueOverlay',
+    'MultiGrainOverlay',
     'Overlay',
     'PowderOverlay',
     'RotationSeriesOverlay',
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from enum import Enum
+import threading
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from hexrdgui.constants import OVERLAY_DATA_CACHE_MAX_ENTRIES
+from hexrdgui.singletons import Singleton
+
+if TYPE_CHECKING:
+    from hexrd.instrument import HEDMInstrument
+
+
+class OverlayDataCache(metaclass=Singleton):
+    """A bounded LRU cache of generated overlay data
+
+    The keys are created by the overlays (see `Overlay.data_cache_key`),
+    and identify everything that the data was generated from: the overlay
+    parameters, the instrument geometry, the display mode, and the view
+    settings such as the polar grid and the tth distortion.
+    """
+
+    def __init__(self, max_entries: int = OVERLAY_DATA_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return None
+
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def insert(self, key: tuple, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def freeze(value: Any) -> Any:
+    """Convert a value into a hashable one that compares by contents"""
+    if isinstance(value, dict):
+        return tuple((k, freeze(v)) for k, v in sorted(value.items(), key=repr))
+    elif isinstance(value, (list, tuple)):
+        return tuple(freeze(x) for x in value)
+    elif isinstance(value, np.ndarray):
+        return (value.dtype.str, value.shape, value.tobytes())
+    elif isinstance(value, np.generic):
+        return value.item()
+    elif value is None or isinstance(value, (bool, int, float, str, Enum)):
+        return value
+
+    return repr(value)
+
+
+def instrument_geometry_key(instr: HEDMInstrument) -> tuple:
+    """Create a key from the geometry of an instrument"""
+    instr_attrs = (
+        'active_beam_name',
+        'beam_dict',
+        'beam_energy',
+        'beam_vector',
+        'chi',
+        'tvec',
+        'source_distance',
+    )
+    panel_attrs = (
+        'rows',
+        'cols',
+        'pixel_size_row',
+        'pixel_size_col',
+        'tvec',
+        'tilt',
+        'bvec',
+        'xrs_dist',
+        'roi',
+        'radius',
+    )
+
+    def attrs_key(obj: Any, names: tuple[str, ...]) -> tuple:
+        return tuple(freeze(getattr(obj, x, None)) for x in names)
+
+    panels = []
+    for det_key, panel in instr.detectors.items():
+        distortion = panel.distortion
+        if distortion is not None:
+            distortion = (
+                type(distortion).__name__,
+                freeze(np.asarray(distortion.params)),
+            )
+
+        panels.append(
+            (
+                det_key,
+                type(panel).__name__,
+                attrs_key(panel, panel_attrs),
+                distortion,
+            )
+        )
+
+    return (attrs_key(instr, instr_attrs), tuple(panels))
+
+
+def view_state_key() -> tuple:
+    """Create a key from the view settings that overlay data depends on"""
+    from hexrdgui.hexrd_config import HexrdConfig
+    from hexrdgui.overlays.overlay import Overlay
+
+    config = HexrdConfig()
+
+    distortion = config.polar_tth_distortion_object
+    if isinstance(distortion, Overlay):
+        distortion_key = ('overlay', distortion.cache_id, distortion.revision)
+    elif distortion is not None:
+        # Key it on its parameters, so that equal distortion objects share
+        # cached data. Their ids may be reused after they are deleted.
+        distortion_key = (
+            type(distortion).__name__,
+            distortion.pinhole_distortion_type,
+            freeze(distortion.pinhole_distortion_kwargs),
+        )
+    else:
+        distortion_key = None
+
+    polar_grid = (
+        config.polar_res_tth_min,
+        config.polar_res_tth_max,
+        config.polar_res_eta_min,
+        config.polar_res_eta_max,
+        config.polar_pixel_size_tth,
+        config.polar_pixel_size_eta,
+    )
+
+    return (
+        polar_grid,
+        distortion_key,
+        config.stereo_size,
+        config.active_beam_name,
+        freeze(np.asarray(config.sample_tilt)),
+        config.is_aggregated,
+    )
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import functools
+import threading
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QObject, QThreadPool, Signal
+
+from hexrdgui.async_worker import AsyncWorker
+from hexrdgui.singletons import QSingleton
+
+from . import generate_overlays
+
+if TYPE_CHECKING:
+    from .overlay import Overlay
+
+
+class OverlayGenerator(QObject, metaclass=QSingleton):
+    """Generate the data of overlays in the background
+
+    There is a single background job for the whole application. Overlays
+    that are requested while it is running are added to its queue, so
+    several canvases requesting the same overlays (such as in tabbed mode)
+    only generate them once.
+
+    The signals are emitted from the worker thread, so they are delivered
+    to the GUI thread through queued connections.
+    """
+
+    # Emitted with each overlay whose data was generated
+    overlay_generated = Signal(object)
+
+    # Emitted with the overlays that were being generated when an
+    # exception occurred
+    generation_failed = Signal(list)
+
+    def __init__(self) -> None:
+        super().__init__(None)
+
+        # Dicts are used as ordered sets
+        self._queue: dict[Overlay, None] = {}
+        self._running: dict[Overlay, None] = {}
+        self._is_running = False
+        self._lock = threading.Lock()
+
+    def request(self, overlays: list[Overlay]) -> None:
+        """Generate the data of these overlays in the background"""
+        with self._lock:
+            self._queue |= dict.fromkeys(overlays)
+            if self._is_running:
+                # The running job will get to them
+                return
+
+            self._is_running = True
+
+        worker = AsyncWorker(self._run)
+        QThreadPool.globalInstance().start(worker)
+
+    def is_pending(self, overlay: Overlay) -> bool:
+        """Whether this overlay is queued or being generated"""
+        with self._lock:
+            return overlay in self._queue or overlay in self._running
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                overlays = list(self._queue)
+                self._queue.clear()
+                self._running = dict.fromkeys(overlays)
+                if not overlays:
+                    self._is_running = False
+                    return
+
+            try:
+                generate_overlays(
+                    overlays,
+                    on_generated=functools.partial(self._emit_generated, overlays),
+                )
+            except Exception:
+                # The receivers generate these again on the GUI thread,
+                # so the error is raised there as usual.
+                self.generation_failed.emit(overlays)
+            finally:
+                with self._lock:
+                    self._running.clear()
+
+    def _emit_generated(self, overlays: list[Overlay], i: int) -> None:
+        self.overlay_generated.emit(overlays[i])
@@ -102,6 +102,10 @@ class LaueOverlay(Overlay):
         widths = ['tth_width', 'eta_width']
         return all(getattr(self, x) is not None for x in widths)
 
+    @property
+    def modifies_instrument(self) -> bool:
+        return self.switches_xray_source
+
     @property
     def plane_data_no_exclusions(self) -> Any:  # hexrd PlaneData
         plane_data = copy.deepcopy(self.plane_data)
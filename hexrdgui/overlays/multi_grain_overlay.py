@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+from hexrdgui.constants import OverlayType
+from hexrdgui.overlays.rotation_series_overlay import RotationSeriesOverlay
+
+
+class MultiGrainOverlay(RotationSeriesOverlay):
+    """A rotation series overlay of every grain in a grains table
+
+    All of the grains are simulated in a single call, and the spots of
+    all grains are drawn together, so the whole table is shown with a
+    single artist per detector rather than one overlay per grain.
+    """
+
+    type = OverlayType.multi_grain
+
+    def __init__(
+        self,
+        material_name: str,
+        grains_table: np.ndarray | list | None = None,
+        **overlay_kwargs: Any,
+    ) -> None:
+        if grains_table is None:
+            grains_table = np.empty((0, 21))
+
+        self.grains_table = grains_table
+        super().__init__(material_name, **overlay_kwargs)
+
+    @property
+    def child_attributes_to_save(self) -> list[str]:
+        # These names must be identical here, as attributes, and as
+        # arguments to the __init__ method.
+        return super().child_attributes_to_save + ['grains_table']
+
+    @property
+    def grains_table(self) -> np.ndarray:
+        return self._grains_table
+
+    @grains_table.setter
+    def grains_table(self, v: np.ndarray | list) -> None:
+        v = np.asarray(v, dtype=float)
+        if v.size == 0:
+            v = v.reshape(0, 21)
+
+        assert v.ndim == 2 and v.shape[1] in (12, 21), (
+            'The grains table must have the 21 columns of a fit grains '
+            'result, or the 12 columns of the grain parameters'
+        )
+        self._grains_table = v
+
+    @property
+    def num_grains(self) -> int:
+        return len(self.grains_table)
+
+    @property
+    def grain_params(self) -> list[np.ndarray]:
+        table = self.grains_table
+        if table.shape[1] == 21:
+            # A fit grains result. The grain parameters are columns 3-14.
+            table = table[:, 3:15]
+
+        return list(table)
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 import copy
-from typing import TYPE_CHECKING, Any
+import itertools
+import threading
+from typing import TYPE_CHECKING, Any, Generator
 
 import numpy as np
 
 from hexrdgui.constants import OverlayType, ViewType
+from hexrdgui.overlays.data_cache import (
+    OverlayDataCache,
+    freeze,
+    instrument_geometry_key,
+    view_state_key,
+)
 from hexrdgui.utils import array_index_in_list
 
 if TYPE_CHECKING:
@@ -85,6 +94,21 @@ class Overlay(ABC):
     ranges_key = None  # type: ignore[assignment]  # noqa: F811
     ranges_indices_key: str | None = None
 
+    # Attributes that are computed along with the data. These are saved
+    # in the data cache with the data, and restored with it.
+    cached_data_attributes: tuple[str, ...] = ()
+
+    # Saved attributes that do not affect the data
+    _non_data_attributes = (
+        'name',
+        'calibration_picks',
+        'style',
+        'highlight_style',
+        'visible',
+    )
+
+    _cache_ids = itertools.count()
+
     def __init__(
         self,
         material_name: str,
@@ -97,6 +121,24 @@ class Overlay(ABC):
         visible: bool = True,
     ) -> None:
 
+        # The data may be generated on worker threads. See `data`.
+        # The data lock only guards swapping in new data, and the generate
+        # lock keeps two threads from generating the same data.
+        self._data_lock = threading.Lock()
+        self._generate_lock = threading.Lock()
+
+        # Private copies of shared state that a thread uses in place of
+        # the originals. See `private_state()`.
+        self._private_state = threading.local()
+
+        # Identifies this overlay in the data cache. The revision is
+        # incremented whenever an update is flagged for a reason other
+        # than a change of instrument or display mode, so data that
+        # was cached before then is not used.
+        self._cache_id = next(self._cache_ids)
+        self._revision = 0
+        self._update_generation = 0
+
         self._material_name = material_name
 
         if name is None:
@@ -224,6 +266,10 @@ class Overlay(ABC):
 
     @property
     def plane_data(self) -> PlaneData:
+        plane_data = getattr(self._private_state, 'plane_data', None)
+        if plane_data is not None:
+            return plane_data
+
         return self.material.planeData
 
     @property
@@ -272,16 +318,20 @@ class Overlay(ABC):
             return
 
         self._display_mode = v
-        self.update_needed = True
+        self._flag_update()
 
     @property
     def instrument(self) -> Any:
+        instrument = getattr(self._private_state, 'instrument', None)
+        if instrument is not None:
+            return instrument
+
         return self._instrument
 
     @instrument.setter
     def instrument(self, v: Any) -> None:
         self._instrument = v
-        self.update_needed = True
+        self._flag_update()
 
     @property
     def refinements(self) -> np.ndarray:
@@ -305,24 +355,190 @@ class Overlay(ABC):
             for key, val in self.data.items()
         }
 
+    @property
+    def update_needed(self) -> bool:
+        return self._update_needed
+
+    @update_needed.setter
+    def update_needed(self, b: bool) -> None:
+        if b:
+            self._revision += 1
+            self._flag_update()
+        else:
+            with self._data_lock:
+                self._update_needed = False
+
+    def _flag_update(self) -> None:
+        with self._data_lock:
+            self._update_needed = True
+            # Data that is being generated right now is already outdated
+            self._update_generation += 1
+
+    @property
+    def cache_id(self) -> int:
+        return self._cache_id
+
+    @property
+    def revision(self) -> int:
+        return self._revision
+
+    @property
+    def data_cache_key(self) -> tuple:
+        params = {
+            k: getattr(self, k)
+            for k in self.attributes_to_save
+            if k not in self._non_data_attributes
+        }
+        return (
+            self.cache_id,
+            self.revision,
+            freeze(params),
+            self.display_mode,
+            instrument_geometry_key(self.instrument),
+            view_state_key(),
+        )
+
+    def load_cached_data(self) -> bool:
+        """Use cached data if there is some for the current state
+
+        Returns whether cached data was used.
+        """
+        if not self.update_needed:
+            return True
+
+        if self.instrument is None or self.display_mode is None:
+            return False
+
+        generation = self._update_generation
+        cached = OverlayDataCache().get(self.data_cache_key)
+        if cached is None:
+            return False
+
+        data, attributes = cached
+        self._swap_data(generation, dict(data), attributes)
+        return not self.update_needed
+
     @property
     def data(self) -> dict[str, Any]:
-        if self.update_needed:
-            if self.instrument is None or self.display_mode is None:
-                # Cannot generate data. Raise an exception.
-                msg = (
-                    'Instrument and display mode must be set before generating new data'
-                )
-                raise Exception(msg)
-
-            # We are identifying this dict by its id() in the image_canvas.
-            # Because of this, make sure we use the same dict so that we
-            # do not change ids.
-            self._data.clear()
-            self._data |= self.generate_overlay()
-            self.update_needed = False
+        """The data of the overlay, which is generated first if needed
+
+        If the data is being generated on another thread, this waits for
+        it. Drawing code should use `last_data` instead.
+        """
+        if self.update_needed and not self.load_cached_data():
+            with self._generate_lock:
+                # It may have been generated while we were waiting
+                if self.update_needed and not self.load_cached_data():
+                    return self._generate_data()
+
         return self._data
 
+    @property
+    def last_data(self) -> dict[str, Any]:
+        """The data of the overlay, without waiting for any new data
+
+        While new data is being generated in the background (see
+        `OverlayGenerator`), this is the data from before the update.
+        """
+        from hexrdgui.overlays.generator import OverlayGenerator
+
+        if self.update_needed and OverlayGenerator().is_pending(self):
+            return self._data
+
+        return self.data
+
+    def _generate_data(self) -> dict[str, Any]:
+        if self.instrument is None or self.display_mode is None:
+            # Cannot generate data. Raise an exception.
+            msg = 'Instrument and display mode must be set before generating new data'
+            raise Exception(msg)
+
+        generation = self._update_generation
+        cache_key = self.data_cache_key
+
+        with self.private_state():
+            data = self.generate_overlay()
+
+        attributes = {
+            k: copy.copy(getattr(self, k)) for k in self.cached_data_attributes
+        }
+        if self._swap_data(generation, data, attributes):
+            OverlayDataCache().insert(cache_key, (dict(data), attributes))
+
+        return data
+
+    @property
+    def switches_xray_source(self) -> bool:
+        """Whether this overlay uses a different x-ray source than the
+        instrument's active one"""
+        if self.xray_source is None or self._instrument is None:
+            return False
+
+        return self.xray_source != self._instrument.active_beam_name
+
+    @property
+    def modifies_instrument(self) -> bool:
+        """Whether generating the data temporarily modifies the instrument"""
+        return False
+
+    @property
+    def modifies_plane_data(self) -> bool:
+        """Whether generating the data temporarily modifies the plane data"""
+        return False
+
+    @contextmanager
+    def private_state(self) -> Generator[None, None, None]:
+        """Use private copies of any shared state that this overlay modifies
+
+        The instrument and the plane data are shared with the GUI thread
+        and with other overlays, which may be using them at the same time
+        (for instance, while overlays are generated in the background).
+        Within this context, `instrument` and `plane_data` return copies
+        of them on the current thread if this overlay modifies them.
+        Nested contexts use the same copies.
+        """
+        private = self._private_state
+        if getattr(private, 'active', False):
+            yield
+            return
+
+        private.active = True
+        try:
+            if self.modifies_instrument:
+                private.instrument = copy.deepcopy(self._instrument)
+            if self.modifies_plane_data:
+                private.plane_data = copy.deepcopy(self.material.planeData)
+
+            yield
+        finally:
+            private.active = False
+            private.instrument = None
+            private.plane_data = None
+
+    def _swap_data(
+        self,
+        generation: int,
+        data: dict[str, Any],
+        attributes: dict[str, Any],
+    ) -> bool:
+        """Swap in new data, unless it was outdated while it was created
+
+        The data dict is replaced rather than modified, so readers on other
+        threads always see a complete one. Returns whether it was swapped in.
+        """
+        with self._data_lock:
+            if generation != self._update_generation:
+                # An update was flagged while we were generating, and
+                # this data must be generated again.
+                return False
+
+            self._data = data
+            for k, v in attributes.items():
+                setattr(self, k, copy.copy(v))
+
+            self._update_needed = False
+            return True
+
     @property
     def highlights(self) -> list[Any]:
         return self._highlights
@@ -369,6 +585,10 @@ class Overlay(ABC):
     def is_const_chi(self) -> bool:
         return self.type == OverlayType.const_chi
 
+    @property
+    def is_multi_grain(self) -> bool:
+        return self.type == OverlayType.multi_grain
+
     def on_new_images_loaded(self) -> None:
         # Do nothing by default. Subclasses can re-implement.
         pass
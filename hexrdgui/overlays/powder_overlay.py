@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 import copy
+import os
 from typing import Any, Generator, TYPE_CHECKING
 
 import numpy as np
@@ -30,6 +32,7 @@ class PowderOverlay(Overlay, PolarDistortionObject):
     data_key = 'rings'
     ranges_key = 'rbnds'
     ranges_indices_key = 'rbnd_indices'
+    cached_data_attributes = ('hkl_means',)
 
     def __init__(
         self,
@@ -128,6 +131,14 @@ class PowderOverlay(Overlay, PolarDistortionObject):
     def has_custom_energy(self) -> bool:
         return self.custom_energy is not None
 
+    @property
+    def modifies_instrument(self) -> bool:
+        return self.switches_xray_source
+
+    @property
+    def modifies_plane_data(self) -> bool:
+        return self.has_custom_energy
+
     @contextmanager
     def custom_energy_override(self) -> Generator[None, None, None]:
         """Temporarily set the material wavelength to this overlay's custom
@@ -293,8 +304,7 @@ class PowderOverlay(Overlay, PolarDistortionObject):
         return HexrdConfig().active_beam_name
 
     def generate_overlay(self) -> dict:
-        # Ensure hkl means is cleared
-        self.hkl_means.clear()
+        from hexrdgui.hexrd_config import HexrdConfig
 
         instr = self.instrument
         plane_data = self.plane_data
@@ -309,67 +319,103 @@ class PowderOverlay(Overlay, PolarDistortionObject):
 
             if tths.size == 0:
                 # No overlays
+                self.hkl_means = {}
                 return {}
 
+            ranges_data = None
             if plane_data.tThWidth is not None:
                 # Need to get width data as well
                 indices, ranges = plane_data.getMergedRanges()
                 r_lower = [r[0] for r in ranges]
                 r_upper = [r[1] for r in ranges]
+                ranges_data = (indices, r_lower, r_upper)
 
-        point_groups: dict[str, Any] = {}
-        for det_key, panel in instr.detectors.items():
-            keys = ['rings', 'rbnds', 'rbnd_indices', 'hkls']
-            point_groups[det_key] = {key: [] for key in keys}
-            ring_pts, skipped_tth = self.generate_ring_points(
-                instr, tths, etas, panel, display_mode
+        def generate(panel: Any) -> dict[str, Any]:
+            return self._generate_panel_point_group(
+                instr, panel, tths, hkls, etas, ranges_data, display_mode
             )
 
-            det_hkls = [x for i, x in enumerate(hkls) if i not in skipped_tth]
+        # Switching to a different x-ray source modifies the instrument,
+        # so the detectors can only be done concurrently if we don't.
+        det_keys = list(instr.detectors)
+        panels = list(instr.detectors.values())
+        concurrent = len(panels) > 1 and self.xray_source in (
+            None,
+            instr.active_beam_name,
+        )
+        if concurrent:
+            max_workers = HexrdConfig().max_cpus or os.cpu_count() or 1
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(generate, panels))
+        else:
+            results = [generate(panel) for panel in panels]
 
-            point_groups[det_key]['rings'] = ring_pts
-            point_groups[det_key]['hkls'] = det_hkls
+        point_groups = dict(zip(det_keys, results))
 
-            # Map of ring index to original two theta index
-            counter = 0
-            ring_idx_map = {}
-            for i in range(len(tths)):
-                if i in skipped_tth:
-                    counter += 1
-                    continue
+        # The hkl means are replaced rather than cleared up front, since the
+        # canvas may draw the previous ones while these are generated.
+        if display_mode == ViewType.polar:
+            self.generate_hkl_means(point_groups)
+        else:
+            self.hkl_means = {}
 
-                ring_idx_map[i - counter] = i
+        return point_groups
 
-            point_groups[det_key]['ring_idx_map'] = ring_idx_map
+    def _generate_panel_point_group(
+        self,
+        instr: HEDMInstrument,
+        panel: Any,
+        tths: np.ndarray,
+        hkls: np.ndarray,
+        etas: np.ndarray,
+        ranges_data: tuple | None,
+        display_mode: Any,
+    ) -> dict[str, Any]:
+        keys = ['rings', 'rbnds', 'rbnd_indices', 'hkls']
+        point_group: dict[str, Any] = {key: [] for key in keys}
+        ring_pts, skipped_tth = self.generate_ring_points(
+            instr, tths, etas, panel, display_mode
+        )
 
-            if plane_data.tThWidth is not None:
-                # Generate the ranges too
-                lower_pts, lower_skipped = self.generate_ring_points(
-                    instr, r_lower, etas, panel, display_mode
-                )
-                upper_pts, upper_skipped = self.generate_ring_points(
-                    instr, r_upper, etas, panel, display_mode
-                )
+        det_hkls = [x for i, x in enumerate(hkls) if i not in skipped_tth]
 
-                # The indexing here is to the original HKL list, *not*
-                # the truncated HKL list.
-                lower_indices = [
-                    x for i, x in enumerate(indices) if i not in lower_skipped
-                ]
-                upper_indices = [
-                    x for i, x in enumerate(indices) if i not in upper_skipped
-                ]
+        point_group['rings'] = ring_pts
+        point_group['hkls'] = det_hkls
 
-                point_groups[det_key]['rbnds'] += lower_pts
-                point_groups[det_key]['rbnd_indices'] += lower_indices
+        # Map of ring index to original two theta index
+        counter = 0
+        ring_idx_map = {}
+        for i in range(len(tths)):
+            if i in skipped_tth:
+                counter += 1
+                continue
 
-                point_groups[det_key]['rbnds'] += upper_pts
-                point_groups[det_key]['rbnd_indices'] += upper_indices
+            ring_idx_map[i - counter] = i
 
-        if display_mode == ViewType.polar:
-            self.generate_hkl_means(point_groups)
+        point_group['ring_idx_map'] = ring_idx_map
 
-        return point_groups
+        if ranges_data is not None:
+            # Generate the ranges too
+            indices, r_lower, r_upper = ranges_data
+            lower_pts, lower_skipped = self.generate_ring_points(
+                instr, r_lower, etas, panel, display_mode
+            )
+            upper_pts, upper_skipped = self.generate_ring_points(
+                instr, r_upper, etas, panel, display_mode
+            )
+
+            # The indexing here is to the original HKL list, *not*
+            # the truncated HKL list.
+            lower_indices = [x for i, x in enumerate(indices) if i not in lower_skipped]
+            upper_indices = [x for i, x in enumerate(indices) if i not in upper_skipped]
+
+            point_group['rbnds'] += lower_pts
+            point_group['rbnd_indices'] += lower_indices
+
+            point_group['rbnds'] += upper_pts
+            point_group['rbnd_indices'] += upper_indices
+
+        return point_group
 
     def generate_hkl_means(self, point_groups: dict) -> None:
         # Concatenate all hkl rings and rbnds together for the polar
@@ -498,218 +544,217 @@ class PowderOverlay(Overlay, PolarDistortionObject):
             first_eta_col = eta_centers[:, 0]
             first_tth_row = tth_centers[0]
 
-        for i, tth in enumerate(tths):
-            # construct ideal angular coords
-            ang_crds_full = np.vstack([np.tile(tth, len(etas)), etas]).T
-
-            # Convert nominal powder angle coords to cartesian
-            # !!! Tricky business; here we must consider _both_ the SAMPLE
-            #     CS origin and anything specified for the XRD COM for the
-            #     overlay.  This is so they get properly mapped back to the
-            #     the proper cartesian coords.
-            with switch_xray_source(self.instrument, self.xray_source):
-                xys_full = panel.angles_to_cart(
-                    ang_crds_full, tvec_s=instr.tvec, tvec_c=self.tvec
-                )
+        tths = np.asarray(tths, dtype=float)
+        num_rings = len(tths)
+        if len(etas) == 0:
+            return ring_pts, list(range(num_rings))
 
-                # !!! distortion
-                if panel.distortion is not None:
-                    xys_full = panel.distortion.apply_inverse(xys_full)
+        # All rings are evaluated at once. Each point keeps track of the
+        # ring it belongs to, and the points are split into rings at the end.
+        ring_ids = np.repeat(np.arange(num_rings), len(etas))
+        point_etas = np.tile(etas, num_rings)
 
-            # skip if ring not on panel
-            if len(xys_full) == 0:
-                skipped_tth.append(i)
-                continue
+        # construct ideal angular coords
+        ang_crds_full = np.column_stack([tths[ring_ids], point_etas])
 
-            # clip to detector panel
-            xys, on_panel = panel.clip_to_panel(
-                xys_full, buffer_edges=self.clip_with_panel_buffer
+        # Convert nominal powder angle coords to cartesian
+        # !!! Tricky business; here we must consider _both_ the SAMPLE
+        #     CS origin and anything specified for the XRD COM for the
+        #     overlay.  This is so they get properly mapped back to the
+        #     the proper cartesian coords.
+        with switch_xray_source(self.instrument, self.xray_source):
+            xys_full = panel.angles_to_cart(
+                ang_crds_full, tvec_s=instr.tvec, tvec_c=self.tvec
             )
 
-            has_pinhole_distortion = (
-                self.pinhole_distortion_type is not None
-                and display_mode in (ViewType.polar, ViewType.stereo)
+            # !!! distortion
+            if panel.distortion is not None:
+                xys_full = panel.distortion.apply_inverse(xys_full)
+
+        # clip to detector panel
+        xys, on_panel = panel.clip_to_panel(
+            xys_full, buffer_edges=self.clip_with_panel_buffer
+        )
+        ring_ids = ring_ids[on_panel]
+        point_etas = point_etas[on_panel]
+
+        has_pinhole_distortion = (
+            self.pinhole_distortion_type is not None
+            and display_mode in (ViewType.polar, ViewType.stereo)
+        )
+
+        if has_pinhole_distortion or (
+            (polar_distortion_with_self or offset_distortion)
+            and distortion_object
+            and hasattr(distortion_object, 'pinhole_distortion_type')
+            and distortion_object.pinhole_distortion_type == 'LayerDistortion'
+        ):
+            # If this overlay has a pinhole distortion of any kind, or
+            # if a layer distortion is being applied to the polar
+            # view, we need to cut off all values past critical beta.
+            # Their correction will be very incorrect.
+            if has_pinhole_distortion:
+                kwargs = self.pinhole_distortion_kwargs
+            else:
+                assert distortion_object is not None
+                assert hasattr(distortion_object, 'pinhole_distortion_kwargs')
+                kwargs = distortion_object.pinhole_distortion_kwargs
+
+            pinhole_thickness = kwargs['pinhole_thickness']
+            pinhole_radius = kwargs['pinhole_radius']
+            invalidate_past_critical_beta(panel, xys, pinhole_thickness, pinhole_radius)
+            # Remove any invalidated values
+            valid = ~np.any(np.isnan(xys), axis=1)
+            xys = xys[valid]
+            ring_ids = ring_ids[valid]
+            point_etas = point_etas[valid]
+
+        if apply_distortion:
+            # Apply distortion correction
+            assert sd is not None
+            ang_crds = sd.apply(xys)
+        elif offset_distortion:
+            # Compute ang_crds in the regular way
+            ang_crds, _ = panel.cart_to_angles(
+                xys,
+                tvec_s=instr.tvec,
             )
 
-            if has_pinhole_distortion or (
-                (polar_distortion_with_self or offset_distortion)
-                and distortion_object
-                and hasattr(distortion_object, 'pinhole_distortion_type')
-                and distortion_object.pinhole_distortion_type == 'LayerDistortion'
-            ):
-                # If this overlay has a pinhole distortion of any kind, or
-                # if a layer distortion is being applied to the polar
-                # view, we need to cut off all values past critical beta.
-                # Their correction will be very incorrect.
-                if has_pinhole_distortion:
-                    kwargs = self.pinhole_distortion_kwargs
-                else:
-                    assert distortion_object is not None
-                    assert hasattr(distortion_object, 'pinhole_distortion_kwargs')
-                    kwargs = distortion_object.pinhole_distortion_kwargs
-
-                pinhole_thickness = kwargs['pinhole_thickness']
-                pinhole_radius = kwargs['pinhole_radius']
-                invalidate_past_critical_beta(
-                    panel, xys, pinhole_thickness, pinhole_radius
+        if offset_distortion:
+            # Since this correction is based upon field position, we must
+            # use raw coordinates for the most accurate correction.
+            if apply_distortion:
+                # Use coordinates where distortion correction was not applied
+                raw_ang_crds, _ = panel.cart_to_angles(
+                    xys,
+                    tvec_s=instr.tvec,
                 )
-                # Remove any invalidated values
-                xys = xys[~np.any(np.isnan(xys), axis=1)]
+            else:
+                # Distortion correction was not applied
+                raw_ang_crds = ang_crds
 
-            if apply_distortion:
-                # Apply distortion correction
-                assert sd is not None
-                ang_crds = sd.apply(xys)
-            elif offset_distortion:
-                # Compute ang_crds in the regular way
+            # Need to ensure the angles are mapped
+            raw_ang_crds[:, 1] = mapAngle(
+                raw_ang_crds[:, 1], np.radians(self.eta_period), units='radians'
+            )
+
+            # Compute and apply offset
+            ii = _nearest_indices(first_tth_row, raw_ang_crds[:, 0])
+            jj = _nearest_indices(first_eta_col, raw_ang_crds[:, 1])
+            ang_crds[:, 0] += polar_field[jj, ii]
+
+        if apply_distortion or offset_distortion:
+            if display_mode in (ViewType.raw, ViewType.cartesian):
+                # These need the updated xys
+                xys = panel.angles_to_cart(ang_crds)
+
+        # The start and stop of the points of each ring
+        bounds = np.searchsorted(ring_ids, np.arange(num_rings + 1))
+
+        if display_mode in [ViewType.polar, ViewType.stereo]:
+            if not apply_distortion and not offset_distortion:
+                # The ang_crds have not yet been computed. Do so now.
+                # In the polar view, the nominal angles refer to the SAMPLE
+                # CS origin, so we omit the addition of any offset to the
+                # diffraction COM in the sample frame!
                 ang_crds, _ = panel.cart_to_angles(
                     xys,
                     tvec_s=instr.tvec,
                 )
 
-            if offset_distortion:
-                # Since this correction is based upon field position, we must
-                # use raw coordinates for the most accurate correction.
-                if apply_distortion:
-                    # Use coordinates where distortion correction was not applied
-                    raw_ang_crds, _ = panel.cart_to_angles(
-                        xys,
-                        tvec_s=instr.tvec,
-                    )
-                else:
-                    # Distortion correction was not applied
-                    raw_ang_crds = ang_crds
+            # Convert to degrees
+            ang_crds = np.degrees(ang_crds)
 
-                # Need to ensure the angles are mapped
-                raw_ang_crds[:, 1] = mapAngle(
-                    raw_ang_crds[:, 1], np.radians(self.eta_period), units='radians'
-                )
+            # fix eta period
+            ang_crds[:, 1] = mapAngle(ang_crds[:, 1], self.eta_period, units='degrees')
 
-                # Compute and apply offset
-                for ic, ang_crd in enumerate(raw_ang_crds):
-                    ii = np.argmin(np.abs(ang_crd[0] - first_tth_row))
-                    jj = np.argmin(np.abs(ang_crd[1] - first_eta_col))
-                    ang_crds[ic, 0] += polar_field[jj, ii]
-
-            if apply_distortion or offset_distortion:
-                if display_mode in (ViewType.raw, ViewType.cartesian):
-                    # These need the updated xys
-                    xys = panel.angles_to_cart(ang_crds)
-
-            if display_mode in [ViewType.polar, ViewType.stereo]:
-                if not apply_distortion and not offset_distortion:
-                    # The ang_crds have not yet been computed. Do so now.
-                    # In the polar view, the nominal angles refer to the SAMPLE
-                    # CS origin, so we omit the addition of any offset to the
-                    # diffraction COM in the sample frame!
-                    ang_crds, _ = panel.cart_to_angles(
+            if display_mode == ViewType.stereo and len(xys) > 0:
+                with switch_xray_source(self.instrument, self.xray_source):
+                    # The ang_crds need to be recomputed for the
+                    # current x-ray source for stereo.
+                    # FIXME: is there a better way to do this?
+                    stereo_ang_crds, _ = panel.cart_to_angles(
                         xys,
                         tvec_s=instr.tvec,
                     )
+                    stereo_ij = angles_to_stereo(
+                        stereo_ang_crds,
+                        instr,
+                        HexrdConfig().stereo_size,
+                    )
 
-                if len(ang_crds) == 0:
-                    skipped_tth.append(i)
-                    continue
+                stereo_eta = np.degrees(stereo_ang_crds[:, 1])
+                stereo_eta = mapAngle(stereo_eta, self.eta_period, units='degrees')
 
-                # Convert to degrees
-                ang_crds = np.degrees(ang_crds)
+            # Figure out whether we are in polar mode with a different
+            # XRS.
+            polar_with_different_xrs = (
+                display_mode == ViewType.polar
+                and self.xray_source is not None
+                and self.xray_source != self.active_beam_name
+            )
 
-                # fix eta period
-                ang_crds[:, 1] = mapAngle(
-                    ang_crds[:, 1], self.eta_period, units='degrees'
-                )
+            for i in range(num_rings):
+                ring_slice = slice(bounds[i], bounds[i + 1])
+                ring_ang_crds = ang_crds[ring_slice]
+                if len(ring_ang_crds) == 0:
+                    skipped_tth.append(i)
+                    continue
 
-                # Figure out whether we are in polar mode with a different
-                # XRS.
-                polar_with_different_xrs = (
-                    display_mode == ViewType.polar
-                    and self.xray_source is not None
-                    and self.xray_source != self.active_beam_name
-                )
                 if not polar_with_different_xrs:
                     # sort points for monotonic eta
                     # This really messes up the overlays generated for
                     # a polar view with a different XRS, so only do that
                     # if that is true.
-                    eidx = np.argsort(ang_crds[:, 1])
-                    ang_crds = ang_crds[eidx, :]
+                    eidx = np.argsort(ring_ang_crds[:, 1])
+                    ring_ang_crds = ring_ang_crds[eidx, :]
 
-                diff = np.diff(ang_crds[:, 1])
+                diff = np.diff(ring_ang_crds[:, 1])
                 if len(diff) == 0:
                     skipped_tth.append(i)
                     continue
 
-                # Some detectors, such as cylindrical, can easily end up
-                # with points that are connected far apart, and run across
-                # other detectors. Thus, we should insert nans at any gaps.
-                # FIXME: is this a reasonable tolerance?
-                delta_eta_est = np.nanmedian(np.abs(diff))
-                tolerance = delta_eta_est * 2
-                (gaps,) = np.nonzero(np.abs(diff) > tolerance)
-                ang_crds = np.insert(ang_crds, gaps + 1, np.nan, axis=0)
-
                 if display_mode == ViewType.polar:
+                    # Some detectors, such as cylindrical, can easily end up
+                    # with points that are connected far apart, and run across
+                    # other detectors. Thus, we should insert nans at any gaps.
+                    ring_ang_crds = _insert_nans_at_gaps(ring_ang_crds, diff)
+
                     # append to list with nan padding
-                    ring_pts.append(np.vstack([ang_crds, nans_row]))
+                    ring_pts.append(np.vstack([ring_ang_crds, nans_row]))
                 elif display_mode == ViewType.stereo:
-                    with switch_xray_source(self.instrument, self.xray_source):
-                        # The ang_crds need to be recomputed for the
-                        # current x-ray source for stereo.
-                        # FIXME: is there a better way to do this?
-                        stereo_ang_crds, _ = panel.cart_to_angles(
-                            xys,
-                            tvec_s=instr.tvec,
-                        )
-                        stereo_ij = angles_to_stereo(
-                            stereo_ang_crds,
-                            instr,
-                            HexrdConfig().stereo_size,
-                        )
-
                     # Sort by eta from the correct x-ray source
                     # context and detect gaps independently (the
-                    # polar gap detection above uses a different
+                    # polar gap detection uses a different
                     # coordinate system that may not apply here).
-                    stereo_eta = np.degrees(stereo_ang_crds[:, 1])
-                    stereo_eta = mapAngle(stereo_eta, self.eta_period, units='degrees')
-                    stereo_eidx = np.argsort(stereo_eta)
-                    stereo_ij = stereo_ij[stereo_eidx]
-                    stereo_eta = stereo_eta[stereo_eidx]
-
-                    stereo_diff = np.diff(stereo_eta)
-                    stereo_delta_eta = np.nanmedian(np.abs(stereo_diff))
-                    stereo_tol = stereo_delta_eta * 2
-                    (stereo_gaps,) = np.nonzero(np.abs(stereo_diff) > stereo_tol)
-                    stereo_ij = np.insert(stereo_ij, stereo_gaps + 1, np.nan, axis=0)
+                    ring_stereo_eta = stereo_eta[ring_slice]
+                    stereo_eidx = np.argsort(ring_stereo_eta)
+                    ring_stereo_ij = stereo_ij[ring_slice][stereo_eidx]
+                    ring_stereo_eta = ring_stereo_eta[stereo_eidx]
+
+                    stereo_diff = np.diff(ring_stereo_eta)
+                    ring_stereo_ij = _insert_nans_at_gaps(ring_stereo_ij, stereo_diff)
 
                     # append to list with nan padding
-                    ring_pts.append(np.vstack([stereo_ij, nans_row]))
+                    ring_pts.append(np.vstack([ring_stereo_ij, nans_row]))
+
+        elif display_mode in [ViewType.raw, ViewType.cartesian]:
+            if display_mode == ViewType.raw:
+                # Convert to pixel coordinates and swap columns
+                xys = panel.cartToPixel(xys)[:, [1, 0]]
 
-            elif display_mode in [ViewType.raw, ViewType.cartesian]:
-                if display_mode == ViewType.raw:
-                    # Convert to pixel coordinates and swap columns
-                    xys = panel.cartToPixel(xys)[:, [1, 0]]
+            diff_tol = np.radians(self.delta_eta) + 1e-4
+            for i in range(num_rings):
+                ring_slice = slice(bounds[i], bounds[i + 1])
+                ring_xys = xys[ring_slice]
 
-                diff_tol = np.radians(self.delta_eta) + 1e-4
+                # Separate the segments of the ring with nans
                 ring_breaks = (
-                    np.where(np.abs(np.diff(etas[on_panel])) > diff_tol)[0] + 1
+                    np.where(np.abs(np.diff(point_etas[ring_slice])) > diff_tol)[0]
+                    + 1
                 )
-                n_segments = len(ring_breaks) + 1
-
-                if n_segments == 1:
-                    ring_pts.append(np.vstack([xys, nans_row]))
-                else:
-                    src_len: int = sum(on_panel)  # type: ignore[assignment]
-                    dst_len = src_len + len(ring_breaks)
-                    nxys = np.nan * np.ones((dst_len, 2))
-                    ii = 0  # type: ignore[assignment]
-                    for i in range(n_segments - 1):
-                        jj = int(ring_breaks[i])  # type: ignore[assignment]
-                        nxys[ii + i : jj + i, :] = xys[ii:jj, :]
-                        ii = jj
-                    i = n_segments - 1
-                    nxys[ii + i :, :] = xys[ii:, :]
-                    ring_pts.append(np.vstack([nxys, nans_row]))
+                ring_xys = np.insert(ring_xys, ring_breaks, np.nan, axis=0)
+                ring_pts.append(np.vstack([ring_xys, nans_row]))
 
         return ring_pts, skipped_tth
 
@@ -723,7 +768,9 @@ class PowderOverlay(Overlay, PolarDistortionObject):
         if self.instrument is None:
             return None
 
-        with switch_xray_source(self.instrument, self.xray_source):
+        with self.private_state(), switch_xray_source(
+            self.instrument, self.xray_source
+        ):
             return self.pinhole_distortion_dict(self.instrument)
 
     @property
@@ -732,13 +779,17 @@ class PowderOverlay(Overlay, PolarDistortionObject):
 
     @property
     def tth_displacement_field(self) -> Any:
-        with switch_xray_source(self.instrument, self.xray_source):
+        with self.private_state(), switch_xray_source(
+            self.instrument, self.xray_source
+        ):
             return self.pinhole_displacement_field(self.instrument)
 
     def create_polar_tth_displacement_field(
         self, tth: np.ndarray, eta: np.ndarray
     ) -> Any:
-        with switch_xray_source(self.instrument, self.xray_source):
+        with self.private_state(), switch_xray_source(
+            self.instrument, self.xray_source
+        ):
             return self.create_polar_pinhole_displacement_field(
                 self.instrument, tth, eta
             )
@@ -784,3 +835,30 @@ class PowderOverlay(Overlay, PolarDistortionObject):
 
 # Constants
 nans_row = np.nan * np.ones((1, 2))
+
+
+def _insert_nans_at_gaps(points: np.ndarray, diff: np.ndarray) -> np.ndarray:
+    # Insert a row of nans wherever the gap in `diff` (the differences of
+    # the sorted eta values of `points`) is much larger than usual.
+    # FIXME: is this a reasonable tolerance?
+    delta_eta_est = np.nanmedian(np.abs(diff))
+    tolerance = delta_eta_est * 2
+    (gaps,) = np.nonzero(np.abs(diff) > tolerance)
+    return np.insert(points, gaps + 1, np.nan, axis=0)
+
+
+def _nearest_indices(grid: np.ndarray, values: np.ndarray) -> np.ndarray:
+    # For each value, the index of the closest grid point. This matches
+    # `np.argmin(np.abs(value - grid))`, including returning 0 for nans.
+    if len(grid) < 2:
+        return np.zeros(len(values), dtype=int)
+
+    order = np.argsort(grid)
+    sorted_grid = grid[order]
+    idx = np.clip(np.searchsorted(sorted_grid, values), 1, len(grid) - 1)
+    closer_to_left = values - sorted_grid[idx - 1] <= sorted_grid[idx] - values
+    idx[closer_to_left] -= 1
+
+    result = order[idx]
+    result[np.isnan(values)] = 0
+    return result
@@ -13,6 +13,7 @@ from hexrdgui.overlays.constants import (
     default_crystal_params,
     default_crystal_refinements,
 )
+from hexrdgui.overlays.data_cache import freeze, instrument_geometry_key
 from hexrdgui.overlays.overlay import Overlay
 from hexrdgui.utils.conversions import angles_to_stereo
 
@@ -39,6 +40,10 @@ class RotationSeriesOverlay(Overlay):
     ) -> None:
         super().__init__(material_name, **overlay_kwargs)
 
+        # The last simulation, along with the key it was simulated for.
+        # See `simulate()`.
+        self._simulation: tuple[tuple, dict] | None = None
+
         if crystal_params is None:
             crystal_params = default_crystal_params()
 
@@ -219,24 +224,14 @@ class RotationSeriesOverlay(Overlay):
 
         instr = self.instrument
         display_mode = self.display_mode
-        sim_data = instr.simulate_rotation_series(
-            self.plane_data,
-            [
-                self.crystal_params,
-            ],
-            eta_ranges=self.eta_ranges,
-            ome_ranges=self.ome_ranges,
-            ome_period=self.ome_period,
-        )
         point_groups = {}
-        for det_key, psim in sim_data.items():
+        for det_key, sim in self.simulate().items():
             panel = instr.detectors[det_key]
-            valid_ids, valid_hkls, valid_angs, valid_xys, ang_pixel_size = psim
-            omegas = valid_angs[0][:, 2]
-
-            angles, _ = panel.cart_to_angles(valid_xys[0], tvec_c=self.tvec_c)
+            omegas = sim['omegas']
+            xys = sim['xys']
 
-            # Fix eta period
+            # Fix eta period. Don't modify the simulation, since it is reused.
+            angles = sim['angles'].copy()
             angles[:, 1] = mapAngle(
                 angles[:, 1], np.radians(self.eta_period), units='radians'
             )
@@ -249,14 +244,13 @@ class RotationSeriesOverlay(Overlay):
                     instr,
                     HexrdConfig().stereo_size,
                 )
-            elif display_mode in [ViewType.raw, ViewType.cartesian]:
-                data = valid_xys[0]
-                if display_mode == ViewType.raw:
-                    # If raw, convert to pixels
-                    data[:] = panel.cartToPixel(data)
-                    data[:, [0, 1]] = data[:, [1, 0]]
-
-            ranges = self.range_data(angles, display_mode, panel)
+            elif display_mode == ViewType.raw:
+                # If raw, convert to pixels
+                data = panel.cartToPixel(xys)[:, [1, 0]]
+            elif display_mode == ViewType.cartesian:
+                data = xys.copy()
+
+            ranges = self.range_data(angles, display_mode, panel, sim['grain_ids'])
             point_groups[det_key] = {
                 'data': data,
                 'aggregated': self.aggregated,
@@ -267,31 +261,122 @@ class RotationSeriesOverlay(Overlay):
 
         return point_groups
 
+    def simulate(self) -> dict[str, dict[str, np.ndarray]]:
+        """Simulate the rotation series for each detector
+
+        The spots of each detector are sorted by omega, so that the spots
+        for a range of omegas may be found with a binary search (see
+        `omega_range_slice()`).
+
+        The simulation does not depend on the display mode, and it is
+        reused until the instrument geometry or the overlay changes. So
+        switching views or changing frames does not simulate it again.
+        """
+        instr = self.instrument
+        grain_params = self.grain_params
+        key = (
+            self.revision,
+            freeze(
+                [
+                    grain_params,
+                    self.eta_ranges,
+                    self.ome_ranges,
+                    self.ome_period,
+                ]
+            ),
+            instrument_geometry_key(instr),
+        )
+        if self._simulation is not None and self._simulation[0] == key:
+            return self._simulation[1]
+
+        if len(grain_params) == 0:
+            sim_data = {}
+        else:
+            # All of the grains are simulated in a single call
+            sim_data = instr.simulate_rotation_series(
+                self.plane_data,
+                grain_params,
+                eta_ranges=self.eta_ranges,
+                ome_ranges=self.ome_ranges,
+                ome_period=self.ome_period,
+            )
+
+        results = {}
+        for det_key in instr.detectors:
+            results[det_key] = {
+                'omegas': np.empty((0,)),
+                'xys': np.empty((0, 2)),
+                'angles': np.empty((0, 2)),
+                'grain_ids': np.empty((0,), dtype=int),
+            }
+
+        for det_key, psim in sim_data.items():
+            panel = instr.detectors[det_key]
+            valid_ids, valid_hkls, valid_angs, valid_xys, ang_pixel_size = psim
+
+            omegas = [results[det_key]['omegas']]
+            xys = [results[det_key]['xys']]
+            angles = [results[det_key]['angles']]
+            grain_ids = [results[det_key]['grain_ids']]
+            for i in range(len(grain_params)):
+                if len(valid_xys[i]) == 0:
+                    continue
+
+                grain_angles, _ = panel.cart_to_angles(
+                    valid_xys[i], tvec_c=self.grain_tvec_c(i)
+                )
+                omegas.append(valid_angs[i][:, 2])
+                xys.append(valid_xys[i])
+                angles.append(grain_angles[:, :2])
+                grain_ids.append(np.full(len(valid_xys[i]), i))
+
+            all_omegas = np.concatenate(omegas)
+            order = np.argsort(all_omegas, kind='stable')
+            results[det_key] = {
+                'omegas': all_omegas[order],
+                'xys': np.concatenate(xys)[order],
+                'angles': np.concatenate(angles)[order],
+                'grain_ids': np.concatenate(grain_ids)[order],
+            }
+
+        self._simulation = (key, results)
+        return results
+
+    @property
+    def grain_params(self) -> list[np.ndarray]:
+        # The parameters of each grain that is simulated
+        return [self.crystal_params]
+
+    def grain_tvec_c(self, grain_id: int) -> np.ndarray:
+        return np.asarray(self.grain_params[grain_id][3:6]).reshape(3, 1)
+
     @property
     def tvec_c(self) -> np.ndarray | None:
         if self.crystal_params is None:
             return None
         return self.crystal_params[3:6].reshape(3, 1)
 
-    def range_corners(self, spots: np.ndarray) -> list:
+    def range_corners(self, spots: np.ndarray) -> np.ndarray:
         # spots should be in degrees
         if not self.has_widths:
-            return []
+            return np.empty((0, 5, 2))
 
-        widths = (self.tth_width, self.eta_width)
+        widths = np.array((self.tth_width, self.eta_width))
         # Put the first point at the end to complete the square
         tol_box = np.array(
             [[0.5, 0.5], [0.5, -0.5], [-0.5, -0.5], [-0.5, 0.5], [0.5, 0.5]]
         )
-        ranges = []
-        for spot in spots:
-            corners = np.tile(spot, (5, 1)) + tol_box * np.tile(widths, (5, 1))
-            ranges.append(corners)
-
-        return ranges
+        spots = np.asarray(spots).reshape(-1, 2)
+        return spots[:, np.newaxis, :] + tol_box * widths
 
-    def range_data(self, spots: np.ndarray, display_mode: str, panel: Any) -> list:
-        data = self.rectangular_range_data(spots, display_mode, panel)
+    def range_data(
+        self,
+        spots: np.ndarray,
+        display_mode: str,
+        panel: Any,
+        grain_ids: np.ndarray | None = None,
+    ) -> list:
+        data = self.rectangular_range_data(spots, display_mode, panel, grain_ids)
 
         # Add a nans row at the end of each range
         # This makes it easier to vstack them for plotting
@@ -304,41 +389,53 @@ class RotationSeriesOverlay(Overlay):
         spots: np.ndarray,
         display_mode: str,
         panel: Any,
+        grain_ids: np.ndarray | None = None,
     ) -> list | np.ndarray:
         from hexrdgui.hexrd_config import HexrdConfig
 
         range_corners = self.range_corners(spots)
+        num_ranges, num_corners, _ = range_corners.shape
+        if num_ranges == 0:
+            return []
+
         if display_mode == ViewType.polar:
             # All done...
             return np.degrees(range_corners)
         elif display_mode == ViewType.stereo:
-            # Convert the angles to stereo ij
-            return [
-                angles_to_stereo(
-                    angles,
-                    self.instrument,
-                    HexrdConfig().stereo_size,
-                )
-                for angles in range_corners
-            ]
+            # Convert the angles of all of the ranges to stereo ij at once
+            stereo = angles_to_stereo(
+                range_corners.reshape(-1, 2),
+                self.instrument,
+                HexrdConfig().stereo_size,
+            )
+            return list(np.asarray(stereo).reshape(num_ranges, num_corners, 2))
 
         # The range data is curved for raw and cartesian.
-        # Get more intermediate points so the data reflects this.
-        results = []
-        for corners in range_corners:
-            data_list: list[Any] = []
-            for i in range(len(corners) - 1):
-                tmp = np.linspace(corners[i], corners[i + 1])
-                data_list.extend(panel.angles_to_cart(tmp, tvec_c=self.tvec_c))
-
-            data_arr = np.array(data_list)
-            if display_mode == ViewType.raw:
-                data_arr = panel.cartToPixel(data_arr)
-                data_arr[:, [0, 1]] = data_arr[:, [1, 0]]
+        # Get more intermediate points along each edge so the data
+        # reflects this.
+        t = np.linspace(0, 1)[:, np.newaxis]
+        starts = range_corners[:, :-1, np.newaxis, :]
+        ends = range_corners[:, 1:, np.newaxis, :]
+        points = (starts + (ends - starts) * t).reshape(num_ranges, -1, 2)
+
+        if grain_ids is None:
+            grain_ids = np.zeros(num_ranges, dtype=int)
+
+        # The points of each grain are converted in a single call
+        results = np.empty_like(points)
+        for grain_id in np.unique(grain_ids):
+            mask = grain_ids == grain_id
+            cart = panel.angles_to_cart(
+                points[mask].reshape(-1, 2),
+                tvec_c=self.grain_tvec_c(grain_id),
+            )
+            results[mask] = np.asarray(cart).reshape(-1, points.shape[1], 2)
 
-            results.append(data_arr)
+        if display_mode == ViewType.raw:
+            pixels = panel.cartToPixel(results.reshape(-1, 2))[:, [1, 0]]
+            results = pixels.reshape(results.shape)
 
-        return results
+        return list(results)
 
     @property
     def default_style(self) -> dict:
@@ -380,5 +477,12 @@ class RotationSeriesOverlay(Overlay):
             HexrdConfig().update_overlay_editor.emit()
 
 
+def omega_range_slice(omegas: np.ndarray, ome_min: float, ome_max: float) -> slice:
+    """Get the slice of sorted omegas that are within [ome_min, ome_max]"""
+    start = np.searchsorted(omegas, ome_min, side='left')
+    stop = np.searchsorted(omegas, ome_max, side='right')
+    return slice(int(start), int(stop))
+
+
 # Constants
 nans_row = np.nan * np.ones((1, 2))
@@ -376,6 +376,8 @@ class PinholeCorrectionEditor(QObject):
             # earlier
             det_config['buffer'] = det.panel_buffer
 
+        HexrdConfig().bump_instrument_generation()
+
         msg = 'Pinhole dimensions were applied to the panel buffers'
         QMessageBox.information(self.ui, 'HEXRD', msg)
 
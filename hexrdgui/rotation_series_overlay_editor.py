@@ -142,6 +142,9 @@ class RotationSeriesOverlayEditor:
         self.update_reflections_table()
         self.update_enable_states()
 
+        # The grains of multi-grain overlays come from their grains table
+        self.crystal_editor.ui.setVisible(not overlay.is_multi_grain)
+
     def update_config(self) -> None:
         if self.overlay is None:
             return
@@ -1,16 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
 from pathlib import Path
+import threading
+import time
 from typing import Any
 
-from PySide6.QtCore import QThreadPool
-from PySide6.QtWidgets import QFileDialog, QInputDialog, QWidget
+from PySide6.QtCore import QThreadPool, QTimer
+from PySide6.QtWidgets import QFileDialog, QInputDialog, QMessageBox, QWidget
+
+import numpy as np
 
 from hexrdgui.hexrd_config import HexrdConfig
-from hexrdgui.utils.imageseries import get_monolithic_ims
+from hexrdgui.utils.imageseries import (
+    get_monolithic_ims,
+    open_frame_callback_imageseries,
+)
 from hexrdgui.ui_loader import UiLoader
 from hexrdgui.progress_dialog import ProgressDialog
 from hexrdgui.async_worker import AsyncWorker
 
 
+class SaveImagesProgress:
+    """Thread-safe counters of the frames that have been saved"""
+
+    def __init__(self, total_frames: int) -> None:
+        self.total_frames = total_frames
+        self.frames = 0
+        self.num_bytes = 0
+        self.start_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def frame_read(self, frame: np.ndarray) -> None:
+        with self._lock:
+            self.frames += 1
+            self.num_bytes += frame.nbytes
+
+    def snapshot(self) -> tuple[int, int, float]:
+        with self._lock:
+            frames, num_bytes = self.frames, self.num_bytes
+
+        # The writers may read a frame more than once
+        frames = min(frames, self.total_frames)
+        return frames, num_bytes, time.monotonic() - self.start_time
+
+
 class SaveImagesDialog:
     def __init__(
         self,
@@ -116,6 +149,7 @@ class SaveImagesDialog:
                 # User canceled...
                 return
 
+        jobs = []
         for det in dets:
             filename = f'{self.ui.file_stem.text()}_{det}.{ext}'
             path = f'{self.parent_dir}/{filename}'
@@ -134,19 +168,65 @@ class SaveImagesDialog:
                     # to be the same as the file name...
                     kwargs['cache_file'] = path
 
-            worker = AsyncWorker(
-                HexrdConfig().save_imageseries,
-                self._get_ims(det, ims_dict),
-                det,
-                path,
-                selected_format,
-                **kwargs,
-            )
-            self.thread_pool.start(worker)
-            self.progress_dialog.setWindowTitle(f'Saving {filename}')
-            self.progress_dialog.setRange(0, 0)
-            worker.signals.finished.connect(self.progress_dialog.accept)
-            self.progress_dialog.exec()
+            ims = self._get_ims(det, ims_dict)
+            jobs.append((ims, det, path, selected_format, kwargs))
+
+        # All detectors are written at the same time, and the progress
+        # of all of them is shown in a single progress dialog.
+        progress = SaveImagesProgress(sum(len(job[0]) for job in jobs))
+        worker = AsyncWorker(self._save_all, jobs, progress)
+
+        timer = QTimer(self.ui)
+        timer.setInterval(250)
+        timer.timeout.connect(lambda: self._update_progress(progress))
+        timer.start()
+
+        self.progress_dialog.setWindowTitle(f'Saving {len(jobs)} image(s)')
+        self.progress_dialog.setRange(0, progress.total_frames)
+        self._update_progress(progress)
+        worker.signals.error.connect(self.on_save_error)
+        worker.signals.finished.connect(timer.stop)
+        worker.signals.finished.connect(self.progress_dialog.accept)
+        self.thread_pool.start(worker)
+        self.progress_dialog.exec()
+
+    def _save_all(self, jobs: list[tuple], progress: SaveImagesProgress) -> None:
+        max_workers = HexrdConfig().max_cpus or os.cpu_count() or 1
+        max_workers = max(min(max_workers, len(jobs)), 1)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for ims, det, path, selected_format, kwargs in jobs:
+                ims = open_frame_callback_imageseries(ims, progress.frame_read)
+                futures.append(
+                    executor.submit(
+                        HexrdConfig().save_imageseries,
+                        ims,
+                        det,
+                        path,
+                        selected_format,
+                        **kwargs,
+                    )
+                )
+
+            # Raise any errors that occurred
+            for future in futures:
+                future.result()
+
+    def _update_progress(self, progress: SaveImagesProgress) -> None:
+        frames, num_bytes, elapsed = progress.snapshot()
+        mb = num_bytes / 1024**2
+        rate = mb / elapsed if elapsed > 0 else 0
+        self.progress_dialog.setValue(frames)
+        self.progress_dialog.setLabelText(
+            f'Saved {frames}/{progress.total_frames} frames '
+            f'({mb:.1f} MB, {rate:.1f} MB/s)'
+        )
+
+    def on_save_error(self, t: tuple) -> None:
+        exctype, value, traceback = t
+        msg = f'An ERROR occurred while saving images: {exctype}: {value}.'
+        QMessageBox.critical(self.ui, 'HEXRD', msg)
 
     def exec(self) -> None:
         if self.ui.exec():
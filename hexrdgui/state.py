@@ -15,6 +15,7 @@ import hexrdgui
 from hexrdgui import state_compatibility
 from hexrdgui.hexrd_config import HexrdConfig
 from hexrdgui.image_load_manager import ImageLoadManager
+from hexrdgui.utils.imageseries import open_hdf5_imageseries
 
 CONFIG_PREFIX = 'config'
 CONFIG_YAML_PATH = f'{CONFIG_PREFIX}/yaml'
@@ -264,8 +265,8 @@ def load_imageseries_dict(h5_file: h5py.File) -> None:
 
     root = 'images'
     for det, ims in list(h5_file[root].items()):
-        imsd[det] = imageseries.open(
-            h5_file, 'hdf5', path=f'{root}/{det}', close_when_finished=False
+        imsd[det] = open_hdf5_imageseries(
+            h5_file, path=f'{root}/{det}', close_when_finished=False
         )
 
     HexrdConfig().reset_unagg_imgs(new_imgs=True)
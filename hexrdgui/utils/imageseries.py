@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from collections.abc import Callable, Iterator
+from typing import Any, TYPE_CHECKING
+
+import h5py
+import numpy as np
+
+from hexrd import imageseries
+from hexrd.imageseries import ImageSeries
+from hexrd.imageseries.load import ImageSeriesAdapter
 
 if TYPE_CHECKING:
     from hexrd.core.imageseries.imageseriesabc import ImageSeriesABC
@@ -50,3 +58,180 @@ def get_monolithic_ims(
         kwargs['frame_list'] = frame_list
 
     return ProcessedImageSeries(ims, non_rect_ops, **kwargs)
+
+
+def memmap_hdf5_dataset(dset: h5py.Dataset) -> np.ndarray | None:
+    """Memory-map an HDF5 dataset without reading it into memory
+
+    This is only possible if the dataset is stored contiguously and
+    uncompressed in a regular file. None is returned otherwise, and the
+    dataset must be read through h5py instead.
+    """
+    if dset.chunks is not None or dset.external:
+        # Chunked (possibly compressed) or stored in other files
+        return None
+
+    if dset.file.driver not in ('sec2', 'stdio'):
+        # The data may not be in a regular file on disk
+        return None
+
+    if dset.dtype.kind not in 'biuf':
+        return None
+
+    offset = dset.id.get_offset()
+    if offset is None:
+        # No storage has been allocated for this dataset
+        return None
+
+    try:
+        return np.memmap(
+            dset.file.filename,
+            mode='r',
+            dtype=dset.dtype,
+            shape=dset.shape,
+            offset=offset,
+        )
+    except (OSError, ValueError):
+        return None
+
+
+class ArrayViewImageSeriesAdapter(ImageSeriesAdapter):
+    """An array imageseries adapter that never copies the array
+
+    The "array" adapter from hexrd copies its data. Use this one for
+    memory-mapped arrays, so frames are only read when they are accessed.
+
+    Frames read from a memory-mapped array are returned as copies. Views
+    would keep the mapping, and therefore the file, open for as long as
+    anything (such as a canvas image) holds on to them.
+    """
+
+    format = 'array-view'
+
+    def __init__(self, fname: Any, **kwargs: Any) -> None:
+        data = kwargs['data']
+        if data.ndim == 2:
+            data = data[np.newaxis]
+        elif data.ndim != 3:
+            msg = f'Imageseries data must be 2D or 3D, but it is {data.ndim}D'
+            raise ValueError(msg)
+
+        self._data = data
+        self._meta = kwargs.get('meta', {})
+        self._copy_frames = isinstance(data, np.memmap)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getitem__(self, key: Any) -> np.ndarray:
+        frame = self._data[key]
+        if self._copy_frames:
+            frame = np.array(frame)
+        return frame
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def metadata(self) -> dict:
+        return self._meta
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self._data.shape[1:]
+
+
+def open_array_view_imageseries(
+    data: np.ndarray,
+    meta: dict | None = None,
+) -> ImageSeries:
+    """Create an imageseries that uses `data` directly, without a copy"""
+    adapter = ArrayViewImageSeriesAdapter(None, data=data, meta=meta or {})
+    return ImageSeries(adapter)
+
+
+def open_hdf5_imageseries(
+    f: str | h5py.File,
+    path: str,
+    dataname: str = 'images',
+    **kwargs: Any,
+) -> ImageSeries:
+    """Open an HDF5 imageseries, memory-mapping it if possible
+
+    Contiguous, uncompressed datasets are memory-mapped, so opening them
+    does not read any frames. Chunked and compressed datasets are read
+    frame-by-frame through h5py.
+    """
+    # Open the file only once, and share it with the hdf5 adapter
+    owns_file = not isinstance(f, h5py.File)
+    h5f = h5py.File(f, 'r') if owns_file else f
+    try:
+        data = memmap_hdf5_dataset(h5f[f'{path}/{dataname}'])
+        ims = imageseries.open(h5f, 'hdf5', path=path, dataname=dataname, **kwargs)
+        if data is None:
+            # The hdf5 adapter reads the frames from the open file
+            return ims
+
+        meta = dict(ims.metadata)
+    except Exception:
+        if owns_file:
+            h5f.close()
+        raise
+
+    if owns_file:
+        # The frames are read through the memory map instead
+        h5f.close()
+
+    return open_array_view_imageseries(data, meta)
+
+
+class FrameCallbackImageSeriesAdapter(ImageSeriesAdapter):
+    """Wraps an imageseries, and calls a callback for every frame read
+
+    This is used to track the progress of code that reads frames, such
+    as the imageseries writers.
+    """
+
+    format = 'frame-callback'
+
+    def __init__(self, fname: Any, **kwargs: Any) -> None:
+        self._ims = kwargs['ims']
+        self._callback = kwargs['callback']
+
+    def __len__(self) -> int:
+        return len(self._ims)
+
+    def __getitem__(self, key: Any) -> np.ndarray:
+        frame = self._ims[key]
+        self._callback(frame)
+        return frame
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def metadata(self) -> dict:
+        return self._ims.metadata
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._ims.dtype
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self._ims.shape
+
+
+def open_frame_callback_imageseries(
+    ims: ImageSeries,
+    callback: Callable[[np.ndarray], None],
+) -> ImageSeries:
+    """Wrap `ims` so that `callback(frame)` is called on every frame read"""
+    adapter = FrameCallbackImageSeriesAdapter(None, ims=ims, callback=callback)
+    return ImageSeries(adapter)
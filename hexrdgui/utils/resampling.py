@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+if TYPE_CHECKING:
+    from hexrd.instrument import Detector
+
+
+class BilinearResampler:
+    """Sparse operator equivalent to `Detector.interpolate_bilinear()`
+
+    The bilinear weights only depend on the geometry, so we compute them
+    once for a set of cartesian points and store them as a CSR matrix with
+    four entries per output point. Resampling an image is then a single
+    sparse matrix-vector product.
+
+    Points that are off of the panel are padded with nans, and nans in the
+    input image propagate to every output point that touches them, exactly
+    as with `interpolate_bilinear()`.
+    """
+
+    def __init__(self, panel: Detector, xys: np.ndarray) -> None:
+        self.num_points = len(xys)
+        self.panel_shape = (panel.rows, panel.cols)
+
+        # Clip away points too close to or off the edges of the detector
+        xy_clip, on_panel = panel.clip_to_panel(xys, buffer_edges=True)
+        self.on_panel = on_panel
+
+        # Fractional pixel indices of the clipped points
+        ij_frac = panel.cartToPixel(xy_clip)
+
+        i_floor = np.floor(ij_frac[:, 0]).astype(int)
+        j_floor = np.floor(ij_frac[:, 1]).astype(int)
+        i_ceil = i_floor + 1
+        j_ceil = j_floor + 1
+
+        # Weights of the floor/ceil neighbors along each axis
+        wi_floor = i_ceil - ij_frac[:, 0]
+        wi_ceil = ij_frac[:, 0] - i_floor
+        wj_floor = j_ceil - ij_frac[:, 1]
+        wj_ceil = ij_frac[:, 1] - j_floor
+
+        # Keep the indices on the image. Points on the edges may have
+        # duplicate columns, which the sparse product sums together.
+        rows, cols = self.panel_shape
+        i_floor = np.clip(i_floor, 0, rows - 1)
+        i_ceil = np.clip(i_ceil, 0, rows - 1)
+        j_floor = np.clip(j_floor, 0, cols - 1)
+        j_ceil = np.clip(j_ceil, 0, cols - 1)
+
+        indices = np.column_stack(
+            (
+                i_floor * cols + j_floor,
+                i_floor * cols + j_ceil,
+                i_ceil * cols + j_floor,
+                i_ceil * cols + j_ceil,
+            )
+        )
+        weights = np.column_stack(
+            (
+                wi_floor * wj_floor,
+                wi_floor * wj_ceil,
+                wi_ceil * wj_floor,
+                wi_ceil * wj_ceil,
+            )
+        )
+
+        # Zero weights are stored explicitly so that nans still propagate
+        num_valid = len(indices)
+        indptr = np.arange(0, 4 * num_valid + 1, 4)
+        self.matrix = csr_matrix(
+            (weights.ravel(), indices.ravel(), indptr),
+            shape=(num_valid, rows * cols),
+        )
+
+    def __call__(self, img: np.ndarray, pad_with_nans: bool = True) -> np.ndarray:
+        if img.shape != self.panel_shape:
+            msg = f'Input image must have shape {self.panel_shape}'
+            raise ValueError(msg)
+
+        fill = np.nan if pad_with_nans else 0
+        output = np.full(self.num_points, fill, dtype=float)
+        output[self.on_panel] = self.matrix @ img.ravel()
+        return output
@@ -0,0 +1,53 @@
+import numpy as np
+
+from hexrd.instrument import HEDMInstrument
+
+from hexrdgui.utils.resampling import BilinearResampler
+
+
+def make_panel_and_points() -> tuple:
+    # The default instrument has a single planar detector
+    instr = HEDMInstrument()
+    panel = next(iter(instr.detectors.values()))
+
+    rng = np.random.default_rng(0)
+    half_width = panel.col_dim / 2
+    half_height = panel.row_dim / 2
+
+    # Include points off of the panel and points that are nan
+    xys = np.column_stack(
+        (
+            rng.uniform(-1.2 * half_width, 1.2 * half_width, 5000),
+            rng.uniform(-1.2 * half_height, 1.2 * half_height, 5000),
+        )
+    )
+    xys[:10] = np.nan
+
+    return panel, xys
+
+
+def test_matches_interpolate_bilinear() -> None:
+    panel, xys = make_panel_and_points()
+
+    rng = np.random.default_rng(1)
+    img = rng.uniform(0, 1000, (panel.rows, panel.cols))
+
+    # Nans should propagate the same way
+    img[100:110, 200:210] = np.nan
+
+    expected = panel.interpolate_bilinear(xys, img, pad_with_nans=True)
+    result = BilinearResampler(panel, xys)(img)
+
+    assert np.allclose(result, expected, equal_nan=True)
+
+
+def test_reuse_for_multiple_images() -> None:
+    panel, xys = make_panel_and_points()
+    resampler = BilinearResampler(panel, xys)
+
+    rng = np.random.default_rng(2)
+    for _ in range(3):
+        img = rng.uniform(0, 1000, (panel.rows, panel.cols))
+        expected = panel.interpolate_bilinear(xys, img, pad_with_nans=False)
+        result = resampler(img, pad_with_nans=False)
+        assert np.allclose(result, expected)
@@ -0,0 +1,57 @@
+import numpy as np
+from skimage import transform as tf
+
+from hexrdgui.calibration.cartesian_plot import WarpMap, get_warp_map
+
+
+IMAGE_SHAPE = (60, 80)
+OUTPUT_SHAPE = (120, 100)
+
+
+def make_transform() -> tf.ProjectiveTransform:
+    # Maps display pixels (col, row) onto detector pixels
+    matrix = np.array(
+        [
+            [0.9, 0.1, -10.0],
+            [-0.05, 0.8, -20.0],
+            [1e-4, 2e-4, 1.0],
+        ]
+    )
+    return tf.ProjectiveTransform(matrix=matrix)
+
+
+def test_matches_skimage_warp() -> None:
+    tform = make_transform()
+
+    rng = np.random.default_rng(0)
+    img = rng.uniform(0, 1000, IMAGE_SHAPE)
+
+    expected = tf.warp(
+        img,
+        tform,
+        output_shape=OUTPUT_SHAPE,
+        preserve_range=True,
+        cval=np.nan,
+    )
+    warp_map = WarpMap(tform, OUTPUT_SHAPE, IMAGE_SHAPE)
+    result = warp_map(img)
+
+    # Only the footprint of the image is mapped
+    r0, r1, c0, c1 = warp_map.bbox
+    assert (r1 - r0) * (c1 - c0) < np.prod(OUTPUT_SHAPE)
+
+    # Pixels right on the edges of the image may differ
+    both = ~np.isnan(expected) & ~np.isnan(result)
+    assert np.count_nonzero(np.isnan(expected) != np.isnan(result)) < 0.02 * both.sum()
+    assert np.allclose(result[both], expected[both])
+
+
+def test_warp_maps_follow_the_geometry() -> None:
+    tform = make_transform()
+
+    first = get_warp_map('det', tform, OUTPUT_SHAPE, IMAGE_SHAPE)
+    assert get_warp_map('det', make_transform(), OUTPUT_SHAPE, IMAGE_SHAPE) is first
+
+    moved = tf.ProjectiveTransform(matrix=tform.params + np.diag([0, 0, 0.01]))
+    assert get_warp_map('det', moved, OUTPUT_SHAPE, IMAGE_SHAPE) is not first
+    assert get_warp_map('det', tform, (50, 50), IMAGE_SHAPE) is not first
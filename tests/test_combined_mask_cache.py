@@ -0,0 +1,65 @@
+"""Tests for the cache of combined masks."""
+
+import numpy as np
+
+from hexrdgui.masking.combined_mask_cache import CombinedMaskCache
+from hexrdgui.masking.sparse_mask import SparseMask
+
+
+SHAPE = (4, 5)
+
+
+def unmasked_except(*indices: tuple[int, int]) -> SparseMask:
+    # Dense mask arrays are False where the pixels are masked
+    arr = np.ones(SHAPE, dtype=bool)
+    for idx in indices:
+        arr[idx] = False
+    return SparseMask.from_dense(arr)
+
+
+def test_union_is_reused_until_masks_change() -> None:
+    cache = CombinedMaskCache()
+    a = unmasked_except((0, 0))
+    b = unmasked_except((1, 1))
+
+    total = cache.get('visible', 'grid', SHAPE, {'a': a, 'b': b})
+    assert total.sum() == 2
+    assert total[0, 0] and total[1, 1]
+    assert not total.flags.writeable
+
+    # Same arrays: the same union is returned
+    assert cache.get('visible', 'grid', SHAPE, {'a': a, 'b': b}) is total
+
+    # Adding a mask
+    c = unmasked_except((2, 2))
+    total = cache.get('visible', 'grid', SHAPE, {'a': a, 'b': b, 'c': c})
+    assert total.sum() == 3
+
+    # Hiding a mask
+    total = cache.get('visible', 'grid', SHAPE, {'a': a, 'c': c})
+    assert total.sum() == 2
+    assert not total[1, 1]
+
+    # Modifying a mask (it gets a new array)
+    a = unmasked_except((3, 3))
+    total = cache.get('visible', 'grid', SHAPE, {'a': a, 'c': c})
+    assert total.sum() == 2
+    assert total[3, 3] and not total[0, 0]
+
+
+def test_kinds_and_grids_are_separate() -> None:
+    cache = CombinedMaskCache()
+    a = unmasked_except((0, 0))
+
+    visible = cache.get('visible', 'grid', SHAPE, {'a': a})
+    boundary = cache.get('boundary', 'grid', SHAPE, {})
+    assert visible.sum() == 1
+    assert boundary.sum() == 0
+
+    # A new polar grid starts over
+    shape = (2, 2)
+    b = np.ones(shape, dtype=bool)
+    b[1, 0] = False
+    total = cache.get('visible', 'other_grid', shape, {'b': SparseMask.from_dense(b)})
+    assert total.shape == shape
+    assert total.sum() == 1
@@ -0,0 +1,64 @@
+import numpy as np
+
+from hexrd import imageseries
+
+from hexrdgui.frame_cache import FrameCache
+
+
+def make_ims(num_frames: int = 10) -> imageseries.ImageSeries:
+    data = np.arange(num_frames * 4 * 5, dtype=float).reshape(num_frames, 4, 5)
+    return imageseries.open(None, 'array', data=data)
+
+
+def test_frames_match_imageseries() -> None:
+    ims = make_ims()
+    cache = FrameCache()
+    cache.clear()
+
+    for idx in (0, 3, -1):
+        frame = cache.get(ims, idx)
+        assert np.array_equal(frame, ims[idx])
+        assert not frame.flags.writeable
+
+    # Repeated reads return the cached frame
+    assert cache.get(ims, 3) is cache.get(ims, 3)
+
+
+def test_memory_budget() -> None:
+    ims = make_ims()
+    cache = FrameCache()
+    cache.clear()
+
+    frame_bytes = ims[0].nbytes
+    max_bytes = cache.max_bytes
+    try:
+        cache.max_bytes = frame_bytes * 3
+        for i in range(len(ims)):
+            cache.get(ims, i)
+
+        assert cache.num_bytes <= cache.max_bytes
+        # The most recently read frames are kept
+        assert cache.contains(ims, len(ims) - 1)
+        assert not cache.contains(ims, 0)
+    finally:
+        cache.max_bytes = max_bytes
+        cache.clear()
+
+
+def test_prefetch() -> None:
+    ims = make_ims()
+    cache = FrameCache()
+    cache.clear()
+
+    cache.get(ims, 4)
+    cache.prefetch([ims], 4)
+    cache._executor.submit(lambda: None).result()
+
+    assert cache.contains(ims, 5)
+    assert cache.contains(ims, 3)
+
+    # Frames of imageseries that were replaced are evicted
+    other = make_ims()
+    cache.prefetch([other], 0)
+    assert not cache.contains(ims, 4)
+    cache.clear()
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from hexrd import imageseries
+from hexrd.imageseries import stats
+
+from hexrdgui import image_load_manager
+from hexrdgui.image_load_manager import aggregate_imageseries
+
+
+def make_imageseries(nframes: int, seed: int) -> imageseries.ImageSeries:
+    rng = np.random.default_rng(seed)
+    data = rng.integers(0, 5000, (nframes, 20, 30)).astype(np.uint16)
+    return imageseries.open(None, 'array', data=data)
+
+
+def last(iterator):
+    # The `*_iter()` functions yield partial results until the final one
+    result = None
+    for result in iterator:
+        pass
+    return result
+
+
+BASELINES = {
+    'max': stats.max_iter,
+    'average': stats.average_iter,
+    'median': stats.median_iter,
+}
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+@pytest.mark.parametrize('median_max_bytes', [1024**3, 4096])
+def test_matches_imageseries_stats(monkeypatch, max_workers, median_max_bytes):
+    # A small budget forces the medians to be read in several passes
+    monkeypatch.setattr(image_load_manager, 'MEDIAN_PASS_MAX_BYTES', median_max_bytes)
+
+    series = {
+        'max': make_imageseries(9, 0),
+        'average': make_imageseries(8, 1),
+        'median': make_imageseries(7, 2),
+        'median_even': make_imageseries(6, 3),
+    }
+    aggr_op_dict = {
+        key: (key.split('_')[0], 0, ims) for key, ims in series.items()
+    }
+    results = aggregate_imageseries(aggr_op_dict, max_workers)
+
+    for key, ims in series.items():
+        op = key.split('_')[0]
+        expected = last(BASELINES[op](ims, 3))
+        assert np.allclose(results[key], expected), key
+
+
+def test_frames_limit(monkeypatch):
+    ims = make_imageseries(10, 4)
+    results = aggregate_imageseries({'median': ('median', 4, ims)}, 2)
+
+    expected = np.median(np.array([ims[i] for i in range(4)]), axis=0)
+    assert np.array_equal(results['median'], expected)
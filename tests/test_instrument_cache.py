@@ -0,0 +1,47 @@
+"""
+Tests for the instrument cache in `create_hedm_instrument()`.
+
+The instrument is rebuilt only when the instrument generation changes, and
+every caller gets its own copy of it.
+"""
+
+import numpy as np
+
+from hexrdgui.create_hedm_instrument import create_hedm_instrument
+from hexrdgui.hexrd_config import HexrdConfig
+
+
+def test_copies_are_independent(main_window, default_config_path):
+    HexrdConfig().load_instrument_config(str(default_config_path))
+
+    instr1 = create_hedm_instrument()
+    instr2 = create_hedm_instrument()
+    assert instr1 is not instr2
+
+    det_key = next(iter(instr1.detectors))
+    instr1.detectors[det_key].tvec = [1.0, 2.0, 3.0]
+    assert not np.allclose(instr2.detectors[det_key].tvec, [1.0, 2.0, 3.0])
+    assert not np.allclose(
+        create_hedm_instrument().detectors[det_key].tvec, [1.0, 2.0, 3.0]
+    )
+
+
+def test_config_edits_rebuild_the_instrument(main_window, default_config_path):
+    HexrdConfig().load_instrument_config(str(default_config_path))
+
+    det_key = HexrdConfig().detector_names[0]
+    path = ['detectors', det_key, 'transform', 'translation']
+    translation = list(HexrdConfig().get_instrument_config_val(path))
+
+    # Edits through the config emit signals, which bump the generation
+    translation[0] += 1.0
+    HexrdConfig().set_instrument_config_val(path, translation)
+    tvec = create_hedm_instrument().detectors[det_key].tvec
+    assert np.isclose(tvec[0], translation[0])
+
+    # Direct edits must bump the generation explicitly
+    generation = HexrdConfig().instrument_generation
+    HexrdConfig().detector(det_key)['saturation_level'] = 1234
+    HexrdConfig().bump_instrument_generation()
+    assert HexrdConfig().instrument_generation == generation + 1
+    assert create_hedm_instrument().detectors[det_key].saturation_level == 1234
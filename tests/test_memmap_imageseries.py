@@ -0,0 +1,53 @@
+import h5py
+import numpy as np
+
+from hexrdgui.utils.imageseries import (
+    memmap_hdf5_dataset,
+    open_array_view_imageseries,
+    open_hdf5_imageseries,
+)
+
+
+def test_memmap_hdf5_dataset(tmp_path) -> None:
+    data = np.arange(3 * 4 * 5, dtype=np.uint16).reshape(3, 4, 5)
+    path = tmp_path / 'images.h5'
+    with h5py.File(path, 'w') as f:
+        f.create_dataset('contiguous/images', data=data)
+        f.create_dataset('compressed/images', data=data, compression='gzip')
+
+    with h5py.File(path, 'r') as f:
+        mapped = memmap_hdf5_dataset(f['contiguous/images'])
+        assert isinstance(mapped, np.memmap)
+        assert np.array_equal(mapped, data)
+
+        # Compressed data cannot be memory-mapped
+        assert memmap_hdf5_dataset(f['compressed/images']) is None
+
+    for group in ('contiguous', 'compressed'):
+        ims = open_hdf5_imageseries(str(path), path=group)
+        assert len(ims) == 3
+        for i in range(len(ims)):
+            assert np.array_equal(ims[i], data[i])
+
+
+def test_array_view_imageseries_does_not_copy() -> None:
+    data = np.zeros((2, 4, 5))
+    ims = open_array_view_imageseries(data)
+    assert len(ims) == 2
+    assert np.shares_memory(ims[1], data)
+
+
+def test_memmap_frames_do_not_keep_the_file_open(tmp_path) -> None:
+    data = np.arange(2 * 4 * 5, dtype=np.float32).reshape(2, 4, 5)
+    path = tmp_path / 'images.npy'
+    np.save(path, data)
+
+    ims = open_array_view_imageseries(np.load(path, mmap_mode='r'))
+    frames = list(ims)
+    assert not any(isinstance(x, np.memmap) for x in frames)
+    assert not isinstance(ims[0], np.memmap)
+
+    del ims
+    # The file may be replaced while the frames are still in use
+    np.save(path, np.zeros_like(data))
+    assert np.array_equal(frames[1], data[1])
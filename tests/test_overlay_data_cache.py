@@ -0,0 +1,101 @@
+"""Tests for the cache of generated overlay data."""
+
+from typing import Generator
+
+import numpy as np
+import pytest
+
+from PySide6.QtWidgets import QApplication
+
+from hexrd.material import Material
+
+from hexrdgui.constants import ViewType
+from hexrdgui.hexrd_config import HexrdConfig
+from hexrdgui.overlays.data_cache import OverlayDataCache, freeze
+from hexrdgui.overlays.powder_overlay import PowderOverlay
+
+
+MATERIAL_NAME = 'data_cache_test_material'
+
+
+@pytest.fixture
+def config(qapp: QApplication) -> Generator[HexrdConfig, None, None]:
+    # HexrdConfig is a singleton that requires a QApplication (qapp).
+    cfg = HexrdConfig()
+    cfg.add_material(MATERIAL_NAME, Material())
+    try:
+        yield cfg
+    finally:
+        cfg.remove_material(MATERIAL_NAME)
+
+
+def test_freeze_compares_by_contents() -> None:
+    a = {'tvec': np.zeros(3), 'kwargs': {'x': [1, 2]}}
+    b = {'kwargs': {'x': [1, 2]}, 'tvec': np.zeros(3)}
+    assert freeze(a) == freeze(b)
+    assert hash(freeze(a)) == hash(freeze(b))
+
+    b['tvec'][0] = 1
+    assert freeze(a) != freeze(b)
+
+
+def test_lru_eviction() -> None:
+    cache = OverlayDataCache()
+    cache.clear()
+
+    max_entries = cache.max_entries
+    try:
+        cache.max_entries = 2
+        cache.insert(('a',), 1)
+        cache.insert(('b',), 2)
+
+        # Using 'a' makes 'b' the least recently used
+        assert cache.get(('a',)) == 1
+        cache.insert(('c',), 3)
+
+        assert len(cache) == 2
+        assert cache.get(('b',)) is None
+        assert cache.get(('a',)) == 1
+        assert cache.get(('c',)) == 3
+    finally:
+        cache.max_entries = max_entries
+        cache.clear()
+
+
+def test_view_changes_keep_revision(config: HexrdConfig) -> None:
+    overlay = PowderOverlay(MATERIAL_NAME)
+    revision = overlay.revision
+
+    # Changing the view must not invalidate the data cached for other views
+    overlay.display_mode = ViewType.polar
+    overlay.instrument = None
+    assert overlay.update_needed
+    assert overlay.revision == revision
+
+    # Other changes must
+    overlay.update_needed = True
+    assert overlay.revision != revision
+
+
+def test_custom_distortion_is_keyed_by_parameters(config: HexrdConfig) -> None:
+    from hexrdgui.overlays.data_cache import view_state_key
+    from hexrdgui.polar_distortion_object import PolarDistortionObject
+
+    def make(radius: float) -> PolarDistortionObject:
+        kwargs = {'pinhole_radius': radius, 'pinhole_thickness': 0.1}
+        return PolarDistortionObject('JHEPinholeDistortion', kwargs)
+
+    saved = config.custom_polar_tth_distortion_object
+    try:
+        config.custom_polar_tth_distortion_object = make(0.2)
+        key = view_state_key()
+
+        # An equal, new object uses the same key
+        config.custom_polar_tth_distortion_object = make(0.2)
+        assert view_state_key() == key
+
+        # Different parameters use a different key
+        config.custom_polar_tth_distortion_object = make(0.3)
+        assert view_state_key() != key
+    finally:
+        config.custom_polar_tth_distortion_object = saved
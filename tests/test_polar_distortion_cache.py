@@ -6,6 +6,8 @@ the distortion name/params (injected by `args_project_on_detector`), or it
 returns a stale warp after a refine.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import threading
 from types import SimpleNamespace
 from typing import Any
 
@@ -99,3 +101,31 @@ def test_cache_invalidated_on_distortion_toggle() -> None:
     without_distortion = project(None)
 
     assert not np.array_equal(with_distortion, without_distortion)
+
+
+def test_projections_of_different_panels_run_concurrently() -> None:
+    # The lock should only guard the cache, not the projection itself.
+    # Each projection waits at the barrier, so if they were serialized the
+    # barrier would time out.
+    barrier = threading.Barrier(2, timeout=10)
+
+    def blocking_projection(
+        gvec_angs: np.ndarray, *args: Any, **kwargs: Any
+    ) -> tuple[np.ndarray, None, np.ndarray]:
+        barrier.wait()
+        return stub_projection(gvec_angs, *args, **kwargs)
+
+    def project_panel(tvec: np.ndarray) -> np.ndarray:
+        args, kwargs = make_args(None)
+        args = (args[0], args[1], args[2], tvec, *args[4:])
+        grid = (np.array([[0.25]]), np.array([[0.25]]))
+        return project_on_detector(grid, 1, 1, blocking_projection, *args, **kwargs)
+
+    with ThreadPoolExecutor(max_workers=2) as tp:
+        futures = [tp.submit(project_panel, np.full(3, float(i))) for i in range(2)]
+
+    for f in futures:
+        f.result()
+
+    # A second call is a cache hit and returns the same array
+    assert project_panel(np.zeros(3)) is futures[0].result()
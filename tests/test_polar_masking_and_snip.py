@@ -334,3 +334,53 @@ def test_polar_view_masks(qtbot, main_window, ge_wppf_state):
         polar_config['apply_snip1d'] = False
 
     _clear_masks()
+
+
+def test_polar_mask_boundaries_and_highlights(qtbot, main_window, ge_wppf_state):
+    _clear_masks()
+    HexrdConfig().config['image']['polar']['apply_snip1d'] = False
+
+    _load_dataset(main_window, ge_wppf_state)
+    _switch_to_polar(main_window)
+
+    # Draw with a polar viewer generated here, just as the canvas does once
+    # its background worker finishes.
+    _pin_polar_config()
+    canvas = main_window.ui.image_tab_widget.image_canvases[0]
+    canvas.iviewer = polar_viewer()
+    canvas.mode = ViewType.polar
+    pv = canvas.iviewer.pv
+
+    mask = MaskManager().add_mask(
+        data=[(DET, _rect_polygon(700, 700, 400, 400))],
+        mtype=MaskType.polygon,
+        name='polygon_highlighted',
+        visible=True,
+    )
+    mask.show_border = True
+    mask.highlight = True
+
+    # The boundaries are traced from the rasterized polar mask
+    verts = canvas.get_mask_verts('boundaries')
+    assert verts
+    tth_min, tth_max, eta_max, eta_min = np.degrees(pv.extent)
+    for vert in verts:
+        assert vert.shape[1] == 2
+        assert np.all((vert[:, 0] > tth_min) & (vert[:, 0] < tth_max))
+        assert np.all((vert[:, 1] > eta_min) & (vert[:, 1] < eta_max))
+
+    # The highlights are drawn as one RGBA image of the masked pixels
+    axis = canvas.figure.add_subplot()
+    try:
+        assert canvas._highlight_masks_polar(axis)
+        (image,) = axis.get_images()
+        alpha = np.asarray(image.get_array())[..., 3]
+        polar_mask = pv.create_polar_mask_from_raw_data(mask.data)
+        expected = ~polar_mask.dense()
+        np.testing.assert_array_equal(alpha > 0, expected)
+        assert 0 < expected.sum() < expected.size
+    finally:
+        canvas.remove_all_mask_highlight_artists()
+        axis.remove()
+
+    _clear_masks()
@@ -0,0 +1,113 @@
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+
+from hexrd.instrument import HEDMInstrument
+from hexrd.rotations import mapAngle
+
+from hexrdgui.calibration.stereo_project import (
+    polar_to_stereo_resampler,
+    stereo_pixel_angles,
+    stereo_project,
+    stereo_projection_of_polar_view,
+)
+
+
+STEREO_SIZE = 101
+
+
+def make_polar_view() -> tuple:
+    tth_grid = np.linspace(2.0, 80.0, 200)
+    # The padded eta grids are not evenly spaced
+    eta_grid = np.concatenate(([-0.5], np.linspace(0.5, 359.5, 180), [360.5]))
+
+    rng = np.random.default_rng(0)
+    pvarray = rng.uniform(0, 1000, (len(eta_grid), len(tth_grid)))
+    pvarray[50:55, 100:110] = np.nan
+
+    return pvarray, tth_grid, eta_grid
+
+
+def test_matches_regular_grid_interpolator() -> None:
+    pvarray, tth_grid, eta_grid = make_polar_view()
+
+    interp = RegularGridInterpolator(
+        (eta_grid, tth_grid),
+        pvarray,
+        method='linear',
+        bounds_error=False,
+        fill_value=np.nan,
+    )
+    tth, eta = np.degrees(stereo_pixel_angles(STEREO_SIZE))
+    expected = interp((eta, tth))
+
+    resampler = polar_to_stereo_resampler(tth_grid, eta_grid, STEREO_SIZE)
+    result = resampler(pvarray)
+
+    assert np.allclose(result, expected, equal_nan=True)
+
+    # Pixels beyond the max tth and outside of the circle are nans
+    assert np.isnan(result[0, 0])
+    assert not np.isnan(result[STEREO_SIZE // 2, STEREO_SIZE // 2 + 10])
+
+
+def test_resampler_is_reused() -> None:
+    pvarray, tth_grid, eta_grid = make_polar_view()
+
+    resampler = polar_to_stereo_resampler(tth_grid, eta_grid, STEREO_SIZE)
+    assert polar_to_stereo_resampler(tth_grid.copy(), eta_grid, STEREO_SIZE) is (
+        resampler
+    )
+    assert polar_to_stereo_resampler(tth_grid, eta_grid, 51) is not resampler
+
+    # The beam vector changes the frame of the polar view
+    resampler = polar_to_stereo_resampler(tth_grid, eta_grid, STEREO_SIZE)
+    beam_vector = tilted_beam_vector()
+    assert (
+        polar_to_stereo_resampler(tth_grid, eta_grid, STEREO_SIZE, beam_vector)
+        is not resampler
+    )
+
+
+def tilted_beam_vector() -> np.ndarray:
+    tilt = np.radians(3.0)
+    return np.array([np.sin(tilt), 0.0, -np.cos(tilt)])
+
+
+def test_matches_projecting_through_the_detectors() -> None:
+    # A polar view that is smooth in every direction, even around the beam
+    tth_grid = np.linspace(0.0, 25.0, 501)
+    eta_grid = np.concatenate(([-0.25], np.linspace(0.25, 359.75, 720), [360.25]))
+    eta, tth = np.meshgrid(np.radians(eta_grid), tth_grid, indexing='ij')
+    pvarray = 100 + 5 * tth + 0.5 * tth * np.cos(eta)
+
+    instr = HEDMInstrument()
+    instr.beam_vector = tilted_beam_vector()
+
+    # Interpolate the polar view onto every detector pixel and project the
+    # detectors into the stereo grid, as was done before
+    interp = RegularGridInterpolator(
+        (eta_grid, tth_grid),
+        pvarray,
+        method='linear',
+        bounds_error=False,
+        fill_value=np.nan,
+    )
+    raw = {}
+    for name, panel in instr.detectors.items():
+        pixel_tth, pixel_eta = np.degrees(panel.pixel_angles())
+        pixel_eta = mapAngle(pixel_eta, (0, 360.0), units='degrees')
+        raw[name] = interp((pixel_eta, pixel_tth))
+
+    expected = stereo_project(instr, raw, STEREO_SIZE).filled(np.nan)
+    result = stereo_projection_of_polar_view(
+        pvarray, tth_grid, eta_grid, instr, STEREO_SIZE
+    ).filled(np.nan)
+
+    both = np.isfinite(expected) & np.isfinite(result)
+    assert both.sum() > 0.5 * np.isfinite(expected).sum()
+    assert np.allclose(result[both], expected[both], atol=0.1)
+
+    # Ignoring the beam vector would shift the pattern
+    ignored = polar_to_stereo_resampler(tth_grid, eta_grid, STEREO_SIZE)(pvarray)
+    both &= np.isfinite(ignored)
+    assert not np.allclose(ignored[both], expected[both], atol=0.1)
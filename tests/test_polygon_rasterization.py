@@ -0,0 +1,56 @@
+"""Tests for the scanline polygon rasterizer used for raw masks."""
+
+import numpy as np
+
+from hexrdgui.utils.polygon import polygon_to_mask, polygons_bbox, polygons_to_mask
+
+
+SHAPE = (40, 50)
+
+RECTANGLE = np.array([[2, 1], [7, 1], [7, 5], [2, 5]], dtype=float)
+TRIANGLE = np.array([[10.3, 8.7], [45.2, 20.1], [18.6, 37.9]])
+
+
+def test_rectangle_matches_pil() -> None:
+    mask = polygons_to_mask([RECTANGLE], SHAPE)
+    assert np.array_equal(mask, polygon_to_mask(RECTANGLE, SHAPE))
+
+    # Outlines are included
+    assert not mask[1:6, 2:8].any()
+    assert mask.sum() == mask.size - 5 * 6
+
+
+def test_triangle_only_differs_along_the_edges() -> None:
+    mask = polygons_to_mask([TRIANGLE], SHAPE)
+    expected = polygon_to_mask(TRIANGLE, SHAPE)
+
+    # Any differences must be next to a pixel where both agree that it
+    # is masked and a pixel where both agree that it is not.
+    rows, cols = np.nonzero(mask != expected)
+    for r, c in zip(rows, cols):
+        neighbors = expected[max(r - 1, 0) : r + 2, max(c - 1, 0) : c + 2]
+        assert neighbors.any() and not neighbors.all()
+
+    assert np.count_nonzero(mask != expected) < 0.1 * np.count_nonzero(~expected)
+
+
+def test_polygons_are_combined() -> None:
+    polygons = [RECTANGLE, TRIANGLE]
+    combined = polygons_to_mask(polygons, SHAPE)
+    separate = np.logical_and(*[polygons_to_mask([x], SHAPE) for x in polygons])
+    assert np.array_equal(combined, separate)
+
+
+def test_bounding_box() -> None:
+    assert polygons_bbox([RECTANGLE], SHAPE) == (1, 6, 2, 8)
+    assert polygons_bbox([RECTANGLE - 100], SHAPE) == (0, 0, 0, 0)
+
+    # Only the pixels inside of the bounding box are touched
+    bbox = (0, 3, 0, 50)
+    mask = polygons_to_mask([RECTANGLE], SHAPE, bbox=bbox)
+    assert not mask[1:3, 2:8].any()
+    assert mask[3:].all()
+
+    # A polygon that surrounds the whole mask masks everything
+    surrounding = np.array([[-10, -10], [100, -10], [100, 100], [-10, 100]])
+    assert not polygons_to_mask([surrounding], SHAPE).any()
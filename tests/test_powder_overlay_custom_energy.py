@@ -58,6 +58,26 @@ def test_custom_energy_override_changes_and_restores(
     assert np.array_equal(plane_data.getTTh(), original_tth)
 
 
+def test_custom_energy_uses_a_private_plane_data(
+    powder_overlay: PowderOverlay,
+) -> None:
+    shared = powder_overlay.material.planeData
+    original_wavelength = shared.wavelength
+    powder_overlay.custom_energy = 2 * WAVELENGTH_TO_KEV / original_wavelength
+
+    # Overlays may be generated in the background, so the override is
+    # applied to a copy that only the generating thread sees.
+    with powder_overlay.private_state():
+        plane_data = powder_overlay.plane_data
+        assert plane_data is not shared
+
+        with powder_overlay.custom_energy_override():
+            assert not np.isclose(plane_data.wavelength, original_wavelength)
+            assert np.isclose(shared.wavelength, original_wavelength)
+
+    assert powder_overlay.plane_data is shared
+
+
 def test_custom_energy_persists_through_state_file(
     powder_overlay: PowderOverlay,
     tmp_path: Path,
@@ -0,0 +1,182 @@
+"""Regression tests for the vectorized powder ring generation.
+
+`PowderOverlay.generate_ring_points()` evaluates all of the rings of a
+panel at once. These tests compare it against the per-ring implementation
+that it replaced.
+"""
+
+from typing import Any, Generator
+
+import numpy as np
+import pytest
+
+from PySide6.QtWidgets import QApplication
+
+from hexrd.instrument import HEDMInstrument
+from hexrd.material import Material
+from hexrd.rotations import mapAngle
+
+from hexrdgui.constants import ViewType
+from hexrdgui.hexrd_config import HexrdConfig
+from hexrdgui.overlays.powder_overlay import PowderOverlay, _nearest_indices
+from hexrdgui.utils.conversions import angles_to_stereo
+
+
+MATERIAL_NAME = 'ring_points_test_material'
+
+# The default panel reaches about 16 degrees in its corners, so these
+# include full rings, rings that are cut off by the edges, and a ring that
+# is not on the panel at all.
+TTHS = np.radians([3.0, 5.0, 8.0, 12.0, 15.0, 20.0])
+ETAS = np.radians(np.linspace(-180.0, 180.0, 361))
+
+nans_row = np.nan * np.ones((1, 2))
+
+
+@pytest.fixture
+def powder_overlay(qapp: QApplication) -> Generator[PowderOverlay, None, None]:
+    # HexrdConfig is a singleton that requires a QApplication (qapp).
+    config = HexrdConfig()
+    config.add_material(MATERIAL_NAME, Material())
+    try:
+        overlay = PowderOverlay(MATERIAL_NAME)
+        overlay.instrument = HEDMInstrument()
+        yield overlay
+    finally:
+        config.remove_material(MATERIAL_NAME)
+
+
+def per_ring_points(
+    overlay: PowderOverlay,
+    instr: HEDMInstrument,
+    tths: np.ndarray,
+    etas: np.ndarray,
+    panel: Any,
+    display_mode: str,
+) -> tuple[list, list]:
+    # The previous implementation, one ring at a time, without the tth
+    # distortion corrections (which are not used here)
+    ring_pts = []
+    skipped_tth = []
+    for i, tth in enumerate(tths):
+        ang_crds_full = np.vstack([np.tile(tth, len(etas)), etas]).T
+        xys_full = panel.angles_to_cart(
+            ang_crds_full, tvec_s=instr.tvec, tvec_c=overlay.tvec
+        )
+        if panel.distortion is not None:
+            xys_full = panel.distortion.apply_inverse(xys_full)
+
+        if len(xys_full) == 0:
+            skipped_tth.append(i)
+            continue
+
+        xys, on_panel = panel.clip_to_panel(
+            xys_full, buffer_edges=overlay.clip_with_panel_buffer
+        )
+
+        if display_mode in [ViewType.polar, ViewType.stereo]:
+            ang_crds, _ = panel.cart_to_angles(xys, tvec_s=instr.tvec)
+            if len(ang_crds) == 0:
+                skipped_tth.append(i)
+                continue
+
+            ang_crds = np.degrees(ang_crds)
+            ang_crds[:, 1] = mapAngle(
+                ang_crds[:, 1], overlay.eta_period, units='degrees'
+            )
+            eidx = np.argsort(ang_crds[:, 1])
+            ang_crds = ang_crds[eidx, :]
+
+            diff = np.diff(ang_crds[:, 1])
+            if len(diff) == 0:
+                skipped_tth.append(i)
+                continue
+
+            delta_eta_est = np.nanmedian(np.abs(diff))
+            tolerance = delta_eta_est * 2
+            (gaps,) = np.nonzero(np.abs(diff) > tolerance)
+            ang_crds = np.insert(ang_crds, gaps + 1, np.nan, axis=0)
+
+            if display_mode == ViewType.polar:
+                ring_pts.append(np.vstack([ang_crds, nans_row]))
+            else:
+                stereo_ang_crds, _ = panel.cart_to_angles(xys, tvec_s=instr.tvec)
+                stereo_ij = angles_to_stereo(
+                    stereo_ang_crds, instr, HexrdConfig().stereo_size
+                )
+                stereo_eta = np.degrees(stereo_ang_crds[:, 1])
+                stereo_eta = mapAngle(stereo_eta, overlay.eta_period, units='degrees')
+                stereo_eidx = np.argsort(stereo_eta)
+                stereo_ij = stereo_ij[stereo_eidx]
+                stereo_eta = stereo_eta[stereo_eidx]
+
+                stereo_diff = np.diff(stereo_eta)
+                stereo_tol = np.nanmedian(np.abs(stereo_diff)) * 2
+                (stereo_gaps,) = np.nonzero(np.abs(stereo_diff) > stereo_tol)
+                stereo_ij = np.insert(stereo_ij, stereo_gaps + 1, np.nan, axis=0)
+                ring_pts.append(np.vstack([stereo_ij, nans_row]))
+        else:
+            if display_mode == ViewType.raw:
+                xys = panel.cartToPixel(xys)[:, [1, 0]]
+
+            diff_tol = np.radians(overlay.delta_eta) + 1e-4
+            ring_breaks = np.where(np.abs(np.diff(etas[on_panel])) > diff_tol)[0] + 1
+            n_segments = len(ring_breaks) + 1
+
+            if n_segments == 1:
+                ring_pts.append(np.vstack([xys, nans_row]))
+            else:
+                src_len = sum(on_panel)
+                dst_len = src_len + len(ring_breaks)
+                nxys = np.nan * np.ones((dst_len, 2))
+                ii = 0
+                for i in range(n_segments - 1):
+                    jj = int(ring_breaks[i])
+                    nxys[ii + i : jj + i, :] = xys[ii:jj, :]
+                    ii = jj
+                i = n_segments - 1
+                nxys[ii + i :, :] = xys[ii:, :]
+                ring_pts.append(np.vstack([nxys, nans_row]))
+
+    return ring_pts, skipped_tth
+
+
+@pytest.mark.parametrize(
+    'display_mode',
+    [ViewType.raw, ViewType.cartesian, ViewType.polar, ViewType.stereo],
+)
+def test_matches_per_ring_points(
+    powder_overlay: PowderOverlay,
+    display_mode: str,
+) -> None:
+    instr = powder_overlay.instrument
+    panel = next(iter(instr.detectors.values()))
+
+    result, skipped = powder_overlay.generate_ring_points(
+        instr, TTHS, ETAS, panel, display_mode
+    )
+    expected, expected_skipped = per_ring_points(
+        powder_overlay, instr, TTHS, ETAS, panel, display_mode
+    )
+
+    assert skipped == expected_skipped
+    assert len(result) == len(expected)
+    for points, expected_points in zip(result, expected):
+        # Same points, with the nans of the gaps in the same places
+        assert points.shape == expected_points.shape
+        np.testing.assert_array_equal(np.isnan(points), np.isnan(expected_points))
+        np.testing.assert_allclose(points, expected_points, equal_nan=True)
+
+    # Some rings are cut into segments by the edges of the panel
+    assert any(np.isnan(x[:-1]).any() for x in result)
+
+
+def test_nearest_indices_matches_argmin() -> None:
+    rng = np.random.default_rng(0)
+    for grid in (np.linspace(0, 10, 11), np.linspace(10, 0, 21)):
+        values = rng.uniform(-2, 12, 200)
+        values[:5] = np.nan
+        values[5:10] = grid[:5]
+
+        expected = [np.argmin(np.abs(x - grid)) for x in values]
+        assert np.array_equal(_nearest_indices(grid, values), expected)
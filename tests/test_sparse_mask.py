@@ -0,0 +1,78 @@
+"""Tests for the bounding box + bitmap mask representation."""
+
+import numpy as np
+
+from hexrdgui.masking.sparse_mask import SparseMask
+from hexrdgui.utils.polygon import polygons_to_mask
+
+
+SHAPE = (30, 40)
+
+
+def dense_mask(*regions: tuple[slice, slice]) -> np.ndarray:
+    # Dense masks are False where pixels are masked
+    arr = np.ones(SHAPE, dtype=bool)
+    for region in regions:
+        arr[region] = False
+    return arr
+
+
+def test_dense_round_trip() -> None:
+    arr = dense_mask(np.s_[3:6, 10:12], np.s_[8, 20])
+    mask = SparseMask.from_dense(arr)
+
+    assert mask.bbox == (3, 9, 10, 21)
+    assert mask.nbytes == 6 * 11
+    assert np.array_equal(mask.dense(), arr)
+
+    # Indexing matches the dense array
+    assert not mask[4, 11]
+    assert mask[0, 0]
+    rows, cols = np.nonzero(np.ones(SHAPE, dtype=bool))
+    assert np.array_equal(mask[rows, cols], arr[rows, cols])
+
+    empty = SparseMask.from_dense(np.ones(SHAPE, dtype=bool))
+    assert empty.all()
+    assert empty.nbytes == 0
+    assert empty.dense().all()
+
+
+def test_apply_to_only_touches_the_bounding_box() -> None:
+    arr = dense_mask(np.s_[3:6, 10:12])
+    mask = SparseMask.from_dense(arr)
+
+    target = dense_mask(np.s_[20:25, 0:5])
+    result = mask.apply_to(target)
+    assert result is target
+    assert np.array_equal(target, arr & dense_mask(np.s_[20:25, 0:5]))
+
+    burned = mask.burn_into(np.zeros(SHAPE, dtype=bool))
+    assert np.array_equal(burned, ~arr)
+
+
+def test_union_and_intersection() -> None:
+    a = dense_mask(np.s_[2:10, 2:10])
+    b = dense_mask(np.s_[5:20, 8:30])
+    c = dense_mask(np.s_[25:28, 35:38])
+    sa, sb, sc = (SparseMask.from_dense(x) for x in (a, b, c))
+
+    assert np.array_equal(sa.union(sb).dense(), a & b)
+    assert np.array_equal(sa.intersection(sb).dense(), a | b)
+    assert np.array_equal(sa.union(sc).dense(), a & c)
+
+    # Disjoint masks do not intersect
+    assert sa.intersection(sc).all()
+
+    empty = SparseMask(SHAPE)
+    assert np.array_equal(sa.union(empty).dense(), a)
+    assert empty.intersection(sa).all()
+
+
+def test_from_polygons() -> None:
+    polygons = [
+        np.array([[2.0, 1.0], [7.0, 1.0], [7.0, 5.0], [2.0, 5.0]]),
+        np.array([[20.3, 10.7], [35.2, 12.1], [25.6, 28.9]]),
+    ]
+    mask = SparseMask.from_polygons(polygons, SHAPE)
+    assert np.array_equal(mask.dense(), polygons_to_mask(polygons, SHAPE))
+    assert mask.nbytes < np.prod(SHAPE)
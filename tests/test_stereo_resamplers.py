@@ -0,0 +1,60 @@
+import numpy as np
+
+from hexrd import constants
+from hexrd.instrument import HEDMInstrument
+
+from hexrdgui.calibration.stereo_project import (
+    invalidate_stereo_resamplers,
+    stereo_pixel_angles,
+    stereo_project,
+    stereo_resamplers,
+)
+
+
+STEREO_SIZE = 51
+
+
+def make_instrument() -> HEDMInstrument:
+    instr = HEDMInstrument()
+    instr.beam_vector = constants.beam_vec
+    return instr
+
+
+def test_matches_interpolate_bilinear() -> None:
+    instr = make_instrument()
+    name, panel = next(iter(instr.detectors.items()))
+
+    rng = np.random.default_rng(0)
+    img = rng.uniform(0, 1000, (panel.rows, panel.cols))
+    stereo = stereo_project(instr, {name: img}, STEREO_SIZE)
+
+    # Compare against projecting the stereo pixels directly
+    tth, eta = stereo_pixel_angles(STEREO_SIZE)
+    angs = np.column_stack((tth.ravel(), eta.ravel()))
+    valid = ~np.isnan(angs).any(axis=1)
+    expected = np.full(len(angs), np.nan)
+    xys = panel.angles_to_cart(angs[valid])
+    expected[valid] = panel.interpolate_bilinear(xys, img, pad_with_nans=True)
+    expected = expected.reshape(stereo.shape)
+
+    assert np.array_equal(stereo.mask, np.isnan(expected))
+    assert np.allclose(stereo.filled(np.nan), expected, equal_nan=True)
+
+
+def test_resamplers_follow_the_geometry() -> None:
+    invalidate_stereo_resamplers()
+    instr = make_instrument()
+    name, panel = next(iter(instr.detectors.items()))
+
+    first = stereo_resamplers(instr, STEREO_SIZE)[name]
+    assert stereo_resamplers(instr, STEREO_SIZE)[name] is first
+
+    # Moving the detector or changing the size recomputes the maps
+    panel.tvec = panel.tvec + np.array([1.0, 0.0, 0.0])
+    moved = stereo_resamplers(instr, STEREO_SIZE)[name]
+    assert moved is not first
+    resized = stereo_resamplers(instr, STEREO_SIZE + 2)[name]
+    assert resized is not moved
+
+    invalidate_stereo_resamplers([name])
+    assert stereo_resamplers(instr, STEREO_SIZE + 2)[name] is not resized